@@ -0,0 +1,212 @@
+import os
+import time
+import asyncio
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, Awaitable, AsyncIterator
+
+import circuit_breaker
+
+# 요청 처리 기한 (초): 요청 본문 timeout 또는 X-Request-Timeout 헤더, 없으면 쿼리 타입별 기본값
+REQUEST_DEADLINE_DEFAULT = float(os.environ.get("REQUEST_DEADLINE_DEFAULT", "30"))
+REQUEST_DEADLINE_MAX = float(os.environ.get("REQUEST_DEADLINE_MAX", "120"))  # 클라이언트가 요청할 수 있는 최대 기한
+DART_HTTP_TIMEOUT = float(os.environ.get("DART_HTTP_TIMEOUT", "20"))  # DART HTTP 요청 1회의 연결·읽기 제한 시간 (초)
+
+# 쿼리 타입별 기본 기한 (원문·XBRL·여러 기간 조회는 길게)
+DEFAULT_DEADLINES = {
+    "document": 60,
+    "retrieve": 60,
+    "full_financial": 45,
+    "multi_financial": 60,
+    "financial_timeseries": 60,
+    "section_financial": 45,
+    "batch": 60,
+}
+
+# 과부하 차단 설정 (워커 단위)
+ADMISSION_ENABLED = os.environ.get("ADMISSION_ENABLED", "true").lower() == "true"
+ADMISSION_MAX_INFLIGHT = int(os.environ.get("ADMISSION_MAX_INFLIGHT", "256"))  # 동시에 처리 중인 요청 수 상한
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", "64"))  # 쿼리 타입별 DART 호출 대기열 길이 상한
+ADMISSION_MAX_WAIT = float(os.environ.get("ADMISSION_MAX_WAIT", "10"))  # 예상 대기 시간 상한 (초, 남은 기한이 더 짧으면 남은 기한)
+
+
+def _parse_deadlines(value: str) -> Dict[str, float]:
+    # "document=90,disclosure=10" 형식의 환경변수 파싱
+    deadlines = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        key, seconds = item.split("=", 1)
+        deadlines[key.strip()] = float(seconds)
+    return deadlines
+
+
+DEADLINES = {**DEFAULT_DEADLINES, **_parse_deadlines(os.environ.get("REQUEST_DEADLINES", ""))}
+
+
+class DeadlineExceeded(circuit_breaker.UpstreamUnavailable):
+    # 요청 처리 기한 안에 DART 조회를 끝내지 못함
+    status_code = 504
+
+
+class Overloaded(circuit_breaker.UpstreamUnavailable):
+    # 처리 대기 중인 작업이 많아 새 요청을 받지 않음
+    status_code = 503
+
+
+class ClientDisconnected(Exception):
+    # 응답을 받을 클라이언트의 연결이 끊김 (처리 중인 작업 취소)
+    pass
+
+
+# 현재 요청의 처리 기한 (time.monotonic() 기준, 스레드 풀 실행 시에도 함께 전달)
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+# 현재 요청의 대기열 확인 상태 (하위 작업에도 같은 객체가 전달되므로 요청당 한 번만 확인), 백그라운드 작업은 None
+_admission: ContextVar[Optional[Dict[str, bool]]] = ContextVar("request_admission", default=None)
+_inflight = 0
+_stats = {"admitted": 0, "rejected_inflight": 0, "rejected_queue": 0, "rejected_wait": 0, "deadline_exceeded": 0, "disconnected": 0}
+
+
+def deadline_for(query_type: str, requested: Optional[float] = None) -> float:
+    seconds = requested if requested else DEADLINES.get(query_type, REQUEST_DEADLINE_DEFAULT)
+    return max(0.1, min(seconds, REQUEST_DEADLINE_MAX))
+
+
+def begin(query_type: str, requested: Optional[float] = None, shed: bool = True) -> float:
+    # 현재 요청(작업)의 처리 기한 설정, 설정한 기한(초) 반환
+    # shed=False이면 과부하 차단 없이 기한만 적용 (백그라운드 갱신 등)
+    seconds = deadline_for(query_type, requested)
+    _deadline.set(time.monotonic() + seconds)
+    _admission.set({"checked": False} if shed else None)
+    return seconds
+
+
+def remaining() -> Optional[float]:
+    # 남은 처리 기한 (초), 기한이 없는 작업(백그라운드 등)이면 None
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def within_deadline(seconds: float) -> float:
+    left = remaining()
+    return seconds if left is None else max(0.0, min(seconds, left))
+
+
+def http_timeout() -> float:
+    # DART HTTP 요청 1회의 제한 시간 (남은 기한이 더 짧으면 남은 기한)
+    return max(0.1, within_deadline(DART_HTTP_TIMEOUT))
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def exceeded() -> DeadlineExceeded:
+    _stats["deadline_exceeded"] += 1
+    return DeadlineExceeded("요청 처리 기한을 초과했습니다. 기한(timeout)을 늘리거나 잠시 후 다시 시도해주세요.", 1)
+
+
+def check_queue(query_type: str, waiting: int, estimated_wait: float) -> None:
+    # DART 호출 대기열이 길거나 예상 대기 시간이 남은 기한(최대 ADMISSION_MAX_WAIT)을 넘으면 바로 거절
+    if not ADMISSION_ENABLED:
+        return
+    if waiting >= ADMISSION_MAX_QUEUE:
+        _stats["rejected_queue"] += 1
+        raise Overloaded(f"처리 대기 중인 요청이 많습니다 ({query_type} 대기 {waiting}건). 잠시 후 다시 시도해주세요.",
+                         max(1.0, estimated_wait))
+    if estimated_wait > within_deadline(ADMISSION_MAX_WAIT):
+        _stats["rejected_wait"] += 1
+        raise Overloaded(f"처리 대기 시간이 깁니다 ({query_type} 예상 대기 {estimated_wait:.1f}초). 잠시 후 다시 시도해주세요.",
+                         estimated_wait)
+
+
+def admit(query_type: str, waiting: int, estimated_wait: float) -> None:
+    # 요청의 첫 DART 호출에서만 대기열 확인 (캐시 적중은 거절하지 않음)
+    # 허용된 요청의 나머지 호출(여러 기업·기간 분할 조회 등)과 백그라운드 작업은 처리 기한만 적용
+    state = _admission.get()
+    if state is None or state["checked"]:
+        return
+    state["checked"] = True
+    check_queue(query_type, waiting, estimated_wait)
+
+
+def _enter() -> None:
+    # 동시 처리 요청 수 상한 확인 후 슬롯 차지
+    global _inflight
+    if ADMISSION_ENABLED and _inflight >= ADMISSION_MAX_INFLIGHT:
+        _stats["rejected_inflight"] += 1
+        raise Overloaded(f"동시에 처리 중인 요청이 많습니다 ({_inflight}건). 잠시 후 다시 시도해주세요.", 1)
+    _inflight += 1
+    _stats["admitted"] += 1
+
+
+def _leave(*_) -> None:
+    global _inflight
+    _inflight -= 1
+
+
+async def run(receive, awaitable: Awaitable) -> Any:
+    # 동시 처리 요청 수 상한 확인 후 실행, 실행 중 클라이언트 연결이 끊기면 작업을 취소하고 ClientDisconnected 발생
+    # receive: ASGI receive (요청 본문을 다 읽은 뒤에는 연결이 끊길 때 http.disconnect를 받음)
+    work = asyncio.ensure_future(awaitable)
+    try:
+        _enter()
+    except Overloaded:
+        work.cancel()
+        raise
+
+    async def wait_disconnect():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    watcher = asyncio.ensure_future(wait_disconnect())
+    try:
+        await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if work.done():
+            return work.result()
+        work.cancel()
+        _stats["disconnected"] += 1
+        raise ClientDisconnected()
+    finally:
+        _leave()
+        watcher.cancel()
+        if not work.done():
+            work.cancel()
+
+
+def stream(tasks: List[asyncio.Future]) -> AsyncIterator[Any]:
+    # 스트리밍 응답용 run: 응답을 시작하기 전에 동시 처리 요청 수 상한을 확인하고, 완료되는 순서대로 결과를 내보낸다
+    # 응답 중 연결이 끊기면 StreamingResponse가 생성기를 닫으므로 남은 작업을 취소 (슬롯은 작업이 모두 끝날 때 반환)
+    try:
+        _enter()
+    except Overloaded:
+        for task in tasks:
+            task.cancel()
+        raise
+    asyncio.gather(*tasks, return_exceptions=True).add_done_callback(_leave)
+
+    async def results():
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            if not all(task.done() for task in tasks):
+                _stats["disconnected"] += 1
+                for task in tasks:
+                    task.cancel()
+
+    return results()
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "pid": os.getpid(),
+        "enabled": ADMISSION_ENABLED,
+        "inflight": _inflight,
+        "max_inflight": ADMISSION_MAX_INFLIGHT,
+        "max_queue": ADMISSION_MAX_QUEUE,
+        "max_wait": ADMISSION_MAX_WAIT,
+        "deadline_default": REQUEST_DEADLINE_DEFAULT,
+        "deadline_max": REQUEST_DEADLINE_MAX,
+        **_stats,
+    }
@@ -0,0 +1,111 @@
+import os
+import pickle
+import time
+import zlib
+import sqlite3
+import threading
+from typing import Optional, Dict, Any
+
+# 워커 간 공유하는 디스크 저장소 (불변 공시 문서 및 확정 재무제표)
+ARTIFACT_STORE_PATH = os.environ.get("ARTIFACT_STORE_PATH", os.path.join("data", "artifacts.sqlite"))
+ARTIFACT_STORE_MAX_MB = float(os.environ.get("ARTIFACT_STORE_MAX_MB", "2048"))
+ARTIFACT_STORE_ENABLED = os.environ.get("ARTIFACT_STORE_ENABLED", "true").lower() != "false"
+
+# 한 번 공개되면 바뀌지 않는 쿼리 타입
+# - 접수번호(rcept_no) 기준 문서
+# - 기업·사업연도·보고서 코드 기준 재무제표 (finstate, finstate_all, xbrl)
+STORABLE_QUERY_TYPES = {
+    "document", "retrieve", "sub_docs", "attach_docs", "attach_files",
+    "report_content", "section_financial", "full_financial",
+}
+
+_local = threading.local()
+_evict_lock = threading.Lock()
+
+
+def is_storable(query_type: str) -> bool:
+    return ARTIFACT_STORE_ENABLED and query_type in STORABLE_QUERY_TYPES
+
+
+def _connection() -> sqlite3.Connection:
+    # sqlite 연결은 스레드별로 유지 (WAL 모드로 여러 워커가 동시에 읽기 가능)
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        directory = os.path.dirname(ARTIFACT_STORE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(ARTIFACT_STORE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            " key TEXT PRIMARY KEY, query_type TEXT NOT NULL, created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL, size INTEGER NOT NULL, body BLOB NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_accessed_at ON artifacts (accessed_at)")
+        conn.commit()
+        _local.conn = conn
+    return conn
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    conn = _connection()
+    row = conn.execute("SELECT body FROM artifacts WHERE key = ?", (key,)).fetchone()
+    if row is None:
+        return None
+    conn.execute("UPDATE artifacts SET accessed_at = ? WHERE key = ?", (time.time(), key))
+    conn.commit()
+    return pickle.loads(zlib.decompress(row[0]))
+
+
+def put(key: str, query_type: str, payload: Dict[str, Any]) -> None:
+    # payload: 응답 원본 (DataFrame을 그대로 보존하도록 pickle 후 압축하여 저장)
+    compressed = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 6)
+    now = time.time()
+    conn = _connection()
+    conn.execute(
+        "INSERT OR REPLACE INTO artifacts (key, query_type, created_at, accessed_at, size, body) VALUES (?, ?, ?, ?, ?, ?)",
+        (key, query_type, now, now, len(compressed), compressed),
+    )
+    conn.commit()
+    evict()
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    # 전체 크기가 한도를 넘으면 가장 오래 사용되지 않은 항목부터 한도의 90%까지 삭제
+    max_bytes = max_bytes if max_bytes is not None else int(ARTIFACT_STORE_MAX_MB * 1024 * 1024)
+    with _evict_lock:
+        conn = _connection()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+        if total <= max_bytes:
+            return 0
+        target = total - int(max_bytes * 0.9)
+        removed = 0
+        freed = 0
+        for key, size in conn.execute("SELECT key, size FROM artifacts ORDER BY accessed_at").fetchall():
+            if freed >= target:
+                break
+            conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            freed += size
+            removed += 1
+        conn.commit()
+        return removed
+
+
+def stats() -> Dict[str, Any]:
+    conn = _connection()
+    count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts").fetchone()
+    by_type = {
+        query_type: {"entries": entries, "size_bytes": size}
+        for query_type, entries, size in conn.execute(
+            "SELECT query_type, COUNT(*), SUM(size) FROM artifacts GROUP BY query_type"
+        ).fetchall()
+    }
+    return {
+        "path": ARTIFACT_STORE_PATH,
+        "enabled": ARTIFACT_STORE_ENABLED,
+        "entries": count,
+        "size_bytes": total,
+        "max_bytes": int(ARTIFACT_STORE_MAX_MB * 1024 * 1024),
+        "query_types": by_type,
+    }
@@ -0,0 +1,289 @@
+import os
+import re
+import time
+import asyncio
+import hashlib
+import sqlite3
+import tempfile
+import threading
+import mimetypes
+from typing import Optional, Dict, Any, AsyncIterator, Tuple
+from urllib.parse import urlparse, quote
+import requests
+from starlette.responses import Response
+
+import dart_client
+
+# 첨부파일 로컬 캐시 (내용 해시(sha256) 기준으로 파일 하나만 저장, 모든 워커 공유)
+ATTACHMENT_CACHE_DIR = os.environ.get("ATTACHMENT_CACHE_DIR", os.path.join("data", "attachments"))
+ATTACHMENT_CACHE_MAX_MB = float(os.environ.get("ATTACHMENT_CACHE_MAX_MB", "4096"))
+ATTACHMENT_CHUNK_SIZE = int(os.environ.get("ATTACHMENT_CHUNK_SIZE", str(64 * 1024)))
+ATTACHMENT_TIMEOUT = float(os.environ.get("ATTACHMENT_TIMEOUT", "60"))
+
+# 프록시 대상 호스트 (임의 URL 요청 방지)
+ALLOWED_HOSTS = {"dart.fss.or.kr", "opendart.fss.or.kr"}
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/78.0.3904.108 Safari/537.36"
+
+_local = threading.local()
+_evict_lock = threading.Lock()
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _connection() -> sqlite3.Connection:
+    # URL → 내용 해시 색인 (파일 본문은 해시 경로에 저장)
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(ATTACHMENT_CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(ATTACHMENT_CACHE_DIR, "index.sqlite"), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " url TEXT PRIMARY KEY, sha256 TEXT NOT NULL, size INTEGER NOT NULL, content_type TEXT NOT NULL,"
+            " file_name TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_files_sha256 ON files (sha256)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_files_accessed_at ON files (accessed_at)")
+        conn.commit()
+        _local.conn = conn
+    return conn
+
+
+def is_allowed(url: str) -> bool:
+    parsed = urlparse(url)
+    return parsed.scheme in ("http", "https") and parsed.hostname in ALLOWED_HOSTS
+
+
+def path_for(sha256: str) -> str:
+    return os.path.join(ATTACHMENT_CACHE_DIR, sha256[:2], sha256)
+
+
+def lookup(url: str) -> Optional[Dict[str, Any]]:
+    # 캐시된 파일 정보 (색인은 있으나 파일이 지워졌으면 None)
+    conn = _connection()
+    row = conn.execute("SELECT sha256, size, content_type, file_name FROM files WHERE url = ?", (url,)).fetchone()
+    if row is None:
+        return None
+    sha256, size, content_type, file_name = row
+    path = path_for(sha256)
+    if not os.path.exists(path):
+        conn.execute("DELETE FROM files WHERE url = ?", (url,))
+        conn.commit()
+        return None
+    conn.execute("UPDATE files SET accessed_at = ? WHERE url = ?", (time.time(), url))
+    conn.commit()
+    return {"path": path, "sha256": sha256, "size": size, "content_type": content_type, "file_name": file_name}
+
+
+def open_upstream(url: str) -> requests.Response:
+    # 본문은 읽지 않고 응답만 연다 (upstream.call로 실행하여 호출 한도·재시도·차단기 적용)
+    response = dart_client.session.get(url, headers={"User-Agent": USER_AGENT}, stream=True, timeout=ATTACHMENT_TIMEOUT)
+    response.raise_for_status()
+    return response
+
+
+def content_type_for(response: requests.Response, file_name: str) -> str:
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+    if not content_type or content_type in ("application/octet-stream", "application/x-msdownload", "text/html"):
+        content_type = mimetypes.guess_type(file_name)[0] or content_type or "application/octet-stream"
+    return content_type
+
+
+class _Download:
+    # 업스트림 응답을 청크 단위로 읽으면서 임시 파일에 쓰고 해시를 계산 (스레드에서 실행)
+    def __init__(self, response: requests.Response):
+        self.response = response
+        self.chunks = response.iter_content(ATTACHMENT_CHUNK_SIZE)
+        os.makedirs(ATTACHMENT_CACHE_DIR, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=ATTACHMENT_CACHE_DIR, suffix=".part")
+        self.file = os.fdopen(fd, "wb")
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def read(self) -> Optional[bytes]:
+        for chunk in self.chunks:
+            if chunk:
+                self.file.write(chunk)
+                self.hasher.update(chunk)
+                self.size += len(chunk)
+                return chunk
+        return None
+
+    def commit(self, url: str, content_type: str, file_name: str) -> None:
+        # 같은 내용의 파일이 이미 있으면 임시 파일은 버리고 색인만 추가
+        self.file.close()
+        sha256 = self.hasher.hexdigest()
+        path = path_for(sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            os.remove(self.tmp_path)
+        else:
+            os.replace(self.tmp_path, path)
+        now = time.time()
+        conn = _connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO files (url, sha256, size, content_type, file_name, created_at, accessed_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, sha256, self.size, content_type, file_name, now, now),
+        )
+        conn.commit()
+        evict()
+
+    def abort(self) -> None:
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+async def iter_download(url: str, response: requests.Response, file_name: str) -> AsyncIterator[bytes]:
+    # 업스트림에서 받는 청크를 그대로 전달하면서 캐시에 저장 (파일 전체를 메모리에 올리지 않음)
+    # 전송이 중간에 끊기면 임시 파일을 삭제하고 캐시에 남기지 않는다
+    download = await asyncio.to_thread(_Download, response)
+    committed = False
+    try:
+        while True:
+            chunk = await asyncio.to_thread(download.read)
+            if chunk is None:
+                break
+            yield chunk
+        await asyncio.to_thread(download.commit, url, content_type_for(response, file_name), file_name)
+        committed = True
+    finally:
+        response.close()
+        if not committed:
+            await asyncio.to_thread(download.abort)
+
+
+async def download(url: str, response: requests.Response, file_name: str) -> Dict[str, Any]:
+    # 끝까지 받아 캐시에 저장한 뒤 파일 정보 반환 (Range 요청의 첫 조회 등)
+    async for _ in iter_download(url, response, file_name):
+        pass
+    return await asyncio.to_thread(lookup, url)
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    # 전체 크기가 한도를 넘으면 가장 오래 사용되지 않은 파일부터 한도의 90%까지 삭제
+    max_bytes = max_bytes if max_bytes is not None else int(ATTACHMENT_CACHE_MAX_MB * 1024 * 1024)
+    with _evict_lock:
+        conn = _connection()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT sha256, size FROM files)").fetchone()[0]
+        if total <= max_bytes:
+            return 0
+        target = total - int(max_bytes * 0.9)
+        removed = 0
+        freed = 0
+        for sha256, size in conn.execute(
+                "SELECT sha256, size FROM files GROUP BY sha256 ORDER BY MAX(accessed_at)").fetchall():
+            if freed >= target:
+                break
+            conn.execute("DELETE FROM files WHERE sha256 = ?", (sha256,))
+            try:
+                os.remove(path_for(sha256))
+            except FileNotFoundError:
+                pass
+            freed += size
+            removed += 1
+        conn.commit()
+        return removed
+
+
+def stats() -> Dict[str, Any]:
+    conn = _connection()
+    urls = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    files, total = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM (SELECT DISTINCT sha256, size FROM files)").fetchone()
+    return {
+        "path": ATTACHMENT_CACHE_DIR,
+        "urls": urls,
+        "files": files,
+        "size_bytes": total,
+        "max_bytes": int(ATTACHMENT_CACHE_MAX_MB * 1024 * 1024),
+    }
+
+
+def content_disposition(file_name: str) -> str:
+    # 한글 파일명은 RFC 5987 형식으로 전달
+    fallback = file_name.encode("ascii", "ignore").decode().replace('"', "") or "attachment"
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(file_name)}"
+
+
+def parse_range(value: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    # "bytes=시작-끝" 단일 범위만 처리 (여러 범위는 전체 응답)
+    # 반환값: (시작, 끝(포함)), 범위가 없으면 None, 만족할 수 없으면 ValueError
+    if not value or "," in value:
+        return None
+    match = _RANGE.match(value.strip())
+    if not match or (not match.group(1) and not match.group(2)):
+        return None
+    if not match.group(1):
+        length = int(match.group(2))
+        if length == 0:
+            raise ValueError(value)
+        return max(0, size - length), size - 1
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) else size - 1
+    if start >= size or end < start:
+        raise ValueError(value)
+    return start, min(end, size - 1)
+
+
+class CachedFileResponse(Response):
+    # 캐시된 파일의 전체 또는 일부(Range)를 전송
+    # 서버가 ASGI zerocopysend 확장을 지원하면 파일 디스크립터를 넘겨 복사 없이 전송(sendfile)하고,
+    # 지원하지 않으면 청크 단위로 읽어 전송
+    def __init__(self, info: Dict[str, Any], start: int, end: int, status_code: int, headers: Dict[str, str]):
+        super().__init__(status_code=status_code, headers=headers, media_type=info["content_type"])
+        self.path = info["path"]
+        self.start = start
+        self.length = end - start + 1
+        self.raw_headers = [(k, v) for k, v in self.raw_headers if k != b"content-length"]
+        self.raw_headers.append((b"content-length", str(self.length).encode("latin-1")))
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        fd = await asyncio.to_thread(os.open, self.path, os.O_RDONLY)
+        try:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({"type": "http.response.zerocopysend", "file": fd,
+                            "offset": self.start, "count": self.length, "more_body": False})
+                return
+            position = self.start
+            remaining = self.length
+            while remaining > 0:
+                chunk = await asyncio.to_thread(os.pread, fd, min(ATTACHMENT_CHUNK_SIZE, remaining), position)
+                if not chunk:
+                    break
+                position += len(chunk)
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if self.length == 0 or remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            os.close(fd)
+
+
+def file_response(info: Dict[str, Any], range_header: Optional[str], if_none_match: Optional[str],
+                  if_range: Optional[str], cache_status: str) -> Response:
+    # ETag(내용 해시)·Range를 반영한 캐시 파일 응답
+    etag = f'"{info["sha256"]}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=86400",
+        "Content-Disposition": content_disposition(info["file_name"]),
+        "X-Cache": cache_status,
+    }
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    size = info["size"]
+    if if_range and if_range.strip() != etag:
+        range_header = None
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    if byte_range is None or size == 0:
+        return CachedFileResponse(info, 0, size - 1, 200, headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return CachedFileResponse(info, start, end, 206, headers)
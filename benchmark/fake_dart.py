@@ -0,0 +1,386 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import zipfile
+import zlib
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import Optional, List, Dict, Any, Tuple
+
+# 벤치마크용 OpenDART 대체 서버 (DART 호출 한도를 쓰지 않고 /api/dart 성능 측정)
+# 사용법:
+#   python benchmark/fake_dart.py serve --port 8900 [--latency 0.05] [--error-rate 0.01] [--fixtures benchmark/fixtures]
+#   python benchmark/fake_dart.py record --api-key 실제키 --out benchmark/fixtures  (실제 응답을 한 번씩 받아 저장)
+# 앱은 DART_BASE_URL=http://127.0.0.1:8900 으로 실행하면 이 서버를 사용한다
+# fixtures 디렉터리에 엔드포인트 이름의 파일(list.json, document.xml 등)이 있으면 그 응답을 그대로 재생하고,
+# 없으면 고정 시드로 만든 합성 데이터로 응답한다
+
+COMPANY_COUNT = 3000  # 합성 기업 수 (앞의 2/3는 상장사)
+SEED = 20240101
+
+# 다중회사·단일회사 주요계정 (계정명, 기준 금액)
+ACCOUNTS = [
+    ("유동자산", 5000), ("비유동자산", 9000), ("자산총계", 14000), ("유동부채", 3000), ("비유동부채", 2000),
+    ("부채총계", 5000), ("자본금", 500), ("이익잉여금", 7000), ("자본총계", 9000), ("매출액", 12000),
+    ("영업이익", 1500), ("법인세차감전순이익", 1400), ("당기순이익", 1100),
+]
+STATEMENTS = ["BS", "IS", "CIS", "CF", "SCE"]
+REPORT_NAMES = ["사업보고서", "반기보고서", "분기보고서", "주요사항보고서(자기주식취득결정)", "임원ㆍ주요주주특정증권등소유상황보고서",
+                "주식등의대량보유상황보고서", "기업설명회(IR)개최", "단일판매ㆍ공급계약체결"]
+
+# 엔드포인트별 fixtures 파일 이름 (재생 모드)
+FIXTURE_FILES = {
+    "corpCode.xml": "corpCode.zip",
+    "document.xml": "document.zip",
+    "fnlttXbrl.xml": "fnlttXbrl.zip",
+}
+
+
+def companies() -> List[Dict[str, str]]:
+    # 합성 기업 목록 (벤치마크 요청 생성에도 같은 목록 사용)
+    rows = [{"corp_code": "00126380", "corp_name": "삼성전자", "stock_code": "005930", "corp_cls": "Y"}]
+    for i in range(1, COMPANY_COUNT):
+        listed = i < COMPANY_COUNT * 2 // 3
+        rows.append({
+            "corp_code": f"{10000000 + i:08d}",
+            "corp_name": f"벤치기업{i:04d}",
+            "stock_code": f"{100000 + i:06d}" if listed else " ",
+            "corp_cls": ("Y" if i % 2 else "K") if listed else "E",
+        })
+    return rows
+
+
+def rcept_nos(count: int = 500) -> List[str]:
+    # 원문 조회 요청에 사용하는 접수번호 목록
+    start = datetime(2023, 1, 2)
+    return [f"{(start + timedelta(days=i % 365)).strftime('%Y%m%d')}{800000 + i:06d}" for i in range(count)]
+
+
+class SyntheticData:
+    def __init__(self, fixtures: Optional[str] = None):
+        self.companies = companies()
+        self.by_code = {row["corp_code"]: row for row in self.companies}
+        self.fixtures = fixtures
+        self._zip_cache: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def fixture(self, endpoint: str) -> Optional[bytes]:
+        if not self.fixtures:
+            return None
+        path = os.path.join(self.fixtures, FIXTURE_FILES.get(endpoint, endpoint))
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _rng(self, *keys: Any) -> random.Random:
+        # 프로세스마다 같은 값을 만들도록 hash() 대신 crc32 사용
+        return random.Random(zlib.crc32(repr((SEED,) + keys).encode("utf-8")))
+
+    def _company(self, corp_code: str) -> Dict[str, str]:
+        return self.by_code.get(corp_code) or {"corp_code": corp_code, "corp_name": f"기업{corp_code}", "stock_code": " ", "corp_cls": "E"}
+
+    def corp_code_zip(self) -> bytes:
+        with self._lock:
+            if "corpCode" not in self._zip_cache:
+                items = "".join(
+                    f"<list><corp_code>{row['corp_code']}</corp_code><corp_name>{row['corp_name']}</corp_name>"
+                    f"<stock_code>{row['stock_code']}</stock_code><modify_date>20240101</modify_date></list>"
+                    for row in self.companies)
+                self._zip_cache["corpCode"] = _zip("CORPCODE.xml", f"<result>{items}</result>".encode("utf-8"))
+            return self._zip_cache["corpCode"]
+
+    def disclosures(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        # 기간 안의 공시 (회사 지정 시 회사당 월 3건, 미지정 시 영업일당 40건)
+        start = datetime.strptime(params.get("bgn_de") or "20230101", "%Y%m%d")
+        end = datetime.strptime(params.get("end_de") or datetime.now().strftime("%Y%m%d"), "%Y%m%d")
+        corp_code = params.get("corp_code") or ""
+        rows = []
+        day = end
+        while day >= start and len(rows) < 2000:
+            if day.weekday() < 5:
+                rng = self._rng("list", corp_code, day.strftime("%Y%m%d"))
+                count = (1 if rng.random() < 0.15 else 0) if corp_code else 40
+                for seq in range(count):
+                    company = self._company(corp_code) if corp_code else self.companies[rng.randrange(len(self.companies))]
+                    rows.append({
+                        "corp_code": company["corp_code"], "corp_name": company["corp_name"],
+                        "stock_code": company["stock_code"].strip(), "corp_cls": company["corp_cls"],
+                        "report_nm": rng.choice(REPORT_NAMES),
+                        "rcept_no": f"{day.strftime('%Y%m%d')}{rng.randrange(900000):06d}",
+                        "flr_nm": company["corp_name"], "rcept_dt": day.strftime("%Y%m%d"), "rm": "",
+                    })
+            day -= timedelta(days=1)
+        return rows
+
+    def account_rows(self, corp_code: str, bsns_year: str, reprt_code: str) -> List[Dict[str, Any]]:
+        company = self._company(corp_code)
+        rng = self._rng("acnt", corp_code, bsns_year, reprt_code)
+        scale = rng.uniform(0.5, 50) * 1_000_000_000
+        rows = []
+        for fs_div, fs_nm in (("CFS", "연결재무제표"), ("OFS", "재무제표")):
+            for order, (name, base) in enumerate(ACCOUNTS):
+                amount = int(base * scale / 1000 * rng.uniform(0.8, 1.2))
+                rows.append({
+                    "rcept_no": f"{bsns_year}0315{rng.randrange(900000):06d}", "bsns_year": bsns_year,
+                    "corp_code": corp_code, "stock_code": company["stock_code"].strip(), "reprt_code": reprt_code,
+                    "account_nm": name, "fs_div": fs_div, "fs_nm": fs_nm, "sj_div": "BS" if order < 9 else "IS",
+                    "sj_nm": "재무상태표" if order < 9 else "손익계산서",
+                    "thstrm_nm": f"제 {int(bsns_year) - 1970} 기", "thstrm_dt": f"{bsns_year}.12.31",
+                    "thstrm_amount": f"{amount:,}", "thstrm_add_amount": "",
+                    "frmtrm_amount": f"{int(amount * rng.uniform(0.85, 1.1)):,}",
+                    "bfefrmtrm_amount": f"{int(amount * rng.uniform(0.7, 1.05)):,}",
+                    "ord": str(order + 1), "currency": "KRW",
+                })
+        return rows
+
+    def all_account_rows(self, corp_code: str, bsns_year: str, reprt_code: str, fs_div: str) -> List[Dict[str, Any]]:
+        # 전체 재무제표 (재무제표 구분별 약 40개 계정)
+        rng = self._rng("all", corp_code, bsns_year, reprt_code, fs_div)
+        rows = []
+        for sj_div in STATEMENTS:
+            for order in range(40):
+                amount = int(rng.lognormvariate(22, 2))
+                rows.append({
+                    "rcept_no": f"{bsns_year}0315{rng.randrange(900000):06d}", "reprt_code": reprt_code,
+                    "bsns_year": bsns_year, "corp_code": corp_code, "sj_div": sj_div, "sj_nm": sj_div,
+                    "account_id": f"ifrs-full_{sj_div}_{order:03d}", "account_nm": f"{sj_div}계정{order:03d}",
+                    "account_detail": "-", "thstrm_nm": f"제 {int(bsns_year) - 1970} 기", "thstrm_amount": str(amount),
+                    "frmtrm_nm": f"제 {int(bsns_year) - 1971} 기", "frmtrm_amount": str(int(amount * rng.uniform(0.8, 1.2))),
+                    "ord": str(order + 1), "currency": "KRW",
+                })
+        return rows
+
+    def document_zip(self, rcept_no: str) -> bytes:
+        # 공시 원문 XML (약 200KB, 목차 10개), OpenDartReader가 euc-kr로 먼저 해석하므로 euc-kr로 인코딩
+        with self._lock:
+            if rcept_no in self._zip_cache:
+                return self._zip_cache[rcept_no]
+        rng = self._rng("document", rcept_no)
+        sections = []
+        for number in range(1, 11):
+            paragraphs = "".join(f"<P>{'공시 본문 내용 ' * rng.randint(20, 60)}{number}-{i}</P>" for i in range(30))
+            sections.append(f"<SECTION-1><TITLE>{number}. 목차 {number}</TITLE>{paragraphs}</SECTION-1>")
+        document = f"<DOCUMENT><DOCUMENT-NAME>사업보고서</DOCUMENT-NAME><BODY>{''.join(sections)}</BODY></DOCUMENT>"
+        data = _zip(f"{rcept_no}.xml", document.encode("euc-kr"))
+        with self._lock:
+            if len(self._zip_cache) < 200:
+                self._zip_cache[rcept_no] = data
+        return data
+
+    def company(self, corp_code: str) -> Dict[str, Any]:
+        company = self._company(corp_code)
+        return {
+            "status": "000", "message": "정상", "corp_code": corp_code, "corp_name": company["corp_name"],
+            "corp_name_eng": f"BENCH {corp_code}", "stock_name": company["corp_name"], "stock_code": company["stock_code"].strip(),
+            "ceo_nm": "홍길동", "corp_cls": company["corp_cls"], "jurir_no": "1301110006246", "bizr_no": "1248100998",
+            "adres": "서울특별시", "hm_url": "", "ir_url": "", "phn_no": "02-0000-0000", "fax_no": "",
+            "induty_cd": "264", "est_dt": "19690113", "acc_mt": "12",
+        }
+
+    def generic_rows(self, endpoint: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        # 그 밖의 정기보고서 주요정보·지분공시·주요사항보고서 (5~20행)
+        corp_code = params.get("corp_code", "")
+        company = self._company(corp_code)
+        rng = self._rng(endpoint, corp_code, params.get("bsns_year", ""))
+        return [{
+            "rcept_no": f"2023{rng.randrange(10**10):010d}", "corp_cls": company["corp_cls"], "corp_code": corp_code,
+            "corp_name": company["corp_name"], "se": f"항목{i}", "nm": f"이름{i}",
+            "stock_knd": "보통주", "thstrm": f"{rng.randrange(10**9):,}", "frmtrm": f"{rng.randrange(10**9):,}",
+            "rcept_dt": "20230315",
+        } for i in range(rng.randint(5, 20))]
+
+
+def _zip(name: str, data: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _page(rows: List[Dict[str, Any]], params: Dict[str, str]) -> Dict[str, Any]:
+    page_no = int(params.get("page_no") or 1)
+    page_count = int(params.get("page_count") or 100)
+    total_page = max(1, -(-len(rows) // page_count))
+    if not rows:
+        return {"status": "013", "message": "조회된 데이타가 없습니다."}
+    return {"status": "000", "message": "정상", "page_no": page_no, "page_count": page_count,
+            "total_count": len(rows), "total_page": total_page,
+            "list": rows[(page_no - 1) * page_count:page_no * page_count]}
+
+
+class Settings:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.5, endpoint_latency: Optional[Dict[str, float]] = None,
+                 error_rate: float = 0.0, error_kinds: Tuple[str, ...] = ("500",)):
+        self.latency = latency
+        self.jitter = jitter
+        self.endpoint_latency = endpoint_latency or {}
+        self.error_rate = error_rate
+        self.error_kinds = error_kinds
+        self.requests: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def delay(self, endpoint: str) -> float:
+        base = self.endpoint_latency.get(endpoint, self.latency)
+        if base <= 0:
+            return 0.0
+        return base * random.uniform(max(0.0, 1 - self.jitter), 1 + self.jitter)
+
+
+def make_handler(data: SyntheticData, settings: Settings):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, value: Any, status: int = 200) -> None:
+            self._send(status, json.dumps(value, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            endpoint = url.path.rsplit("/", 1)[-1]
+            with settings.lock:
+                settings.requests[endpoint] = settings.requests.get(endpoint, 0) + 1
+                settings.requests["_total"] = settings.requests.get("_total", 0) + 1
+
+            if endpoint == "_stats":
+                with settings.lock:
+                    return self._json(dict(settings.requests))
+
+            delay = settings.delay(endpoint)
+            if delay:
+                time.sleep(delay)
+            if settings.error_rate and random.random() < settings.error_rate:
+                kind = random.choice(settings.error_kinds)
+                if kind == "020":
+                    return self._json({"status": "020", "message": "요청 제한을 초과하였습니다."})
+                return self._send(int(kind), b"<html><body>Internal Server Error</body></html>", "text/html")
+
+            fixture = data.fixture(endpoint)
+            if fixture is not None:
+                content_type = "application/json; charset=utf-8" if endpoint.endswith(".json") else "application/zip"
+                return self._send(200, fixture, content_type)
+
+            if not url.path.startswith("/api/"):
+                # dart.fss.or.kr 웹 페이지(원문 뷰어·첨부 목록)는 재현하지 않음
+                return self._send(404, b"not found", "text/plain")
+            if endpoint == "corpCode.xml":
+                return self._send(200, data.corp_code_zip(), "application/zip")
+            if endpoint == "document.xml":
+                return self._send(200, data.document_zip(params.get("rcept_no", "")), "application/zip")
+            if endpoint == "fnlttXbrl.xml":
+                return self._send(200, _zip("xbrl.xml", b"<xbrl/>" * 20000), "application/zip")
+            if endpoint == "company.json":
+                return self._json(data.company(params.get("corp_code", "")))
+            if endpoint == "list.json":
+                return self._json(_page(data.disclosures(params), params))
+            if endpoint in ("fnlttSinglAcnt.json", "fnlttMultiAcnt.json"):
+                rows = []
+                for corp_code in (params.get("corp_code") or "").split(","):
+                    rows += data.account_rows(corp_code, params.get("bsns_year", "2023"), params.get("reprt_code", "11011"))
+                return self._json({"status": "000", "message": "정상", "list": rows})
+            if endpoint == "fnlttSinglAcntAll.json":
+                rows = data.all_account_rows(params.get("corp_code", ""), params.get("bsns_year", "2023"),
+                                             params.get("reprt_code", "11011"), params.get("fs_div", "CFS"))
+                return self._json({"status": "000", "message": "정상", "list": rows})
+            if endpoint.endswith(".json"):
+                return self._json({"status": "000", "message": "정상", "list": data.generic_rows(endpoint, params)})
+            return self._send(404, b"not found", "text/plain")
+
+    return Handler
+
+
+def serve(port: int, settings: Settings, fixtures: Optional[str] = None, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(SyntheticData(fixtures), settings))
+    server.daemon_threads = True
+    return server
+
+
+def _parse_latencies(value: str) -> Dict[str, float]:
+    # "document=0.8,fnlttSinglAcntAll=0.3" (엔드포인트 이름은 확장자 생략 가능)
+    latencies = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        key, latency = item.split("=", 1)
+        key = key.strip()
+        for endpoint in (key, f"{key}.json", f"{key}.xml"):
+            latencies[endpoint] = float(latency)
+    return latencies
+
+
+def record(api_key: str, out: str, corp_code: str, bsns_year: str, rcept_no: Optional[str]) -> None:
+    # 실제 OpenDART 응답을 엔드포인트별로 한 번씩 받아 fixtures로 저장 (DART 호출 약 8건)
+    import requests
+    os.makedirs(out, exist_ok=True)
+    base = "https://opendart.fss.or.kr/api/"
+    today = datetime.now()
+    calls = {
+        "corpCode.xml": {},
+        "list.json": {"corp_code": corp_code, "bgn_de": (today - timedelta(days=365)).strftime("%Y%m%d"),
+                      "end_de": today.strftime("%Y%m%d"), "page_count": 100},
+        "company.json": {"corp_code": corp_code},
+        "fnlttSinglAcnt.json": {"corp_code": corp_code, "bsns_year": bsns_year, "reprt_code": "11011"},
+        "fnlttSinglAcntAll.json": {"corp_code": corp_code, "bsns_year": bsns_year, "reprt_code": "11011", "fs_div": "CFS"},
+        "alotMatter.json": {"corp_code": corp_code, "bsns_year": bsns_year, "reprt_code": "11011"},
+    }
+    if rcept_no:
+        calls["document.xml"] = {"rcept_no": rcept_no}
+        calls["fnlttXbrl.xml"] = {"rcept_no": rcept_no, "reprt_code": "11011"}
+    for endpoint, params in calls.items():
+        response = requests.get(base + endpoint, params={"crtfc_key": api_key, **params}, timeout=60)
+        response.raise_for_status()
+        path = os.path.join(out, FIXTURE_FILES.get(endpoint, endpoint))
+        with open(path, "wb") as f:
+            f.write(response.content)
+        print(f"저장: {path} ({len(response.content):,} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 OpenDART 대체 서버")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="대체 서버 실행")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8900)
+    serve_parser.add_argument("--latency", type=float, default=0.05, help="기본 응답 지연 (초)")
+    serve_parser.add_argument("--jitter", type=float, default=0.5, help="지연 변동 비율 (0.5: ±50%%)")
+    serve_parser.add_argument("--endpoint-latency", default="", help="엔드포인트별 지연 (예: document=0.8,fnlttSinglAcntAll=0.3)")
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    serve_parser.add_argument("--error-kinds", default="500", help="오류 종류 (HTTP 상태 코드 또는 020, 콤마 구분)")
+    serve_parser.add_argument("--fixtures", default=None, help="재생할 fixtures 디렉터리")
+    record_parser = commands.add_parser("record", help="실제 OpenDART 응답을 fixtures로 저장")
+    record_parser.add_argument("--api-key", default=os.environ.get("DART_API_KEY", ""))
+    record_parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"))
+    record_parser.add_argument("--corp-code", default="00126380")
+    record_parser.add_argument("--bsns-year", default=str(datetime.now().year - 1))
+    record_parser.add_argument("--rcept-no", default=None, help="원문·XBRL fixtures용 접수번호")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        if not args.api_key:
+            sys.exit("DART API 키가 필요합니다 (--api-key 또는 DART_API_KEY).")
+        record(args.api_key, args.out, args.corp_code, args.bsns_year, args.rcept_no)
+    else:
+        settings = Settings(args.latency, args.jitter, _parse_latencies(args.endpoint_latency), args.error_rate,
+                            tuple(kind.strip() for kind in args.error_kinds.split(",") if kind.strip()))
+        server = serve(args.port, settings, args.fixtures, args.host)
+        print(f"OpenDART 대체 서버: http://{args.host}:{args.port}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
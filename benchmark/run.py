@@ -0,0 +1,376 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import signal
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import http.client
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+import fake_dart
+
+# /api/dart 부하 측정 도구 (OpenDART 대체 서버 + uvicorn 워커 여러 개, DART 호출 한도 사용 없음)
+# 사용법:
+#   python benchmark/run.py [--workers 2] [--concurrency 16] [--duration 30] [--latency 0.05]
+#   python benchmark/run.py --save-baseline main     (결과를 benchmark/baselines/main.json으로 저장)
+#   python benchmark/run.py --compare main           (기준 결과보다 p95·처리량이 허용 범위 이상 나빠지면 종료 코드 1)
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, "baselines")
+AUTH_KEY = "benchmark"
+
+
+def _wait_http(port: int, path: str, timeout: float) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", path)
+            if conn.getresponse().status < 500:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"127.0.0.1:{port} 서버가 {timeout:.0f}초 안에 응답하지 않았습니다.")
+
+
+def start_fake_dart(args, port: int) -> subprocess.Popen:
+    command = [sys.executable, os.path.join(BENCHMARK_DIR, "fake_dart.py"), "serve", "--port", str(port),
+               "--latency", str(args.latency), "--jitter", str(args.jitter), "--error-rate", str(args.error_rate),
+               "--error-kinds", args.error_kinds, "--endpoint-latency", args.endpoint_latency]
+    if args.fixtures:
+        command += ["--fixtures", os.path.abspath(args.fixtures)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    _wait_http(port, "/api/_stats", 15)
+    return process
+
+
+def start_app(args, port: int, dart_port: int, work_dir: str) -> subprocess.Popen:
+    # 벤치마크 전용 데이터 디렉터리에서 실행 (실제 캐시·저장소 파일을 건드리지 않음)
+    data_dir = os.path.join(work_dir, "data")
+    env = {
+        **os.environ,
+        "DART_BASE_URL": f"http://127.0.0.1:{dart_port}",
+        "DART_API_KEY": "benchmark",
+        "REQUIRED_AUTH_KEY": AUTH_KEY,
+        "CORP_CODE_SNAPSHOT_PATH": os.path.join(data_dir, "corp_codes.table"),
+        "ARTIFACT_STORE_PATH": os.path.join(data_dir, "artifacts.sqlite"),
+        "ATTACHMENT_CACHE_DIR": os.path.join(data_dir, "attachments"),
+        "SINGLEFLIGHT_LOCK_DIR": os.path.join(data_dir, "locks"),
+        "RATE_LIMIT_PATH": os.path.join(data_dir, "rate_limit.sqlite"),
+        "DISCLOSURE_STORE_PATH": os.path.join(data_dir, "disclosures.sqlite"),
+        "DISCLOSURE_FEED_PATH": os.path.join(data_dir, "feed.sqlite"),
+        "FINANCIAL_WAREHOUSE_DIR": os.path.join(data_dir, "warehouse"),
+        "METRICS_DIR": os.path.join(data_dir, "metrics"),
+        "DISCLOSURE_STORE_ENABLED": "false",
+        "DISCLOSURE_FEED_ENABLED": "false",
+        # 대체 서버는 호출 한도가 없으므로 앱의 호출 한도 대기가 측정을 왜곡하지 않도록 끔 (--keep-rate-limit로 유지)
+        "RATE_LIMIT_ENABLED": "true" if args.keep_rate_limit else "false",
+    }
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", REPO_DIR, "--host", "127.0.0.1",
+               "--port", str(port), "--workers", str(args.workers), "--log-level", "warning"]
+    # OpenDartReader가 출력하는 조회 결과 메시지는 버림 (오류 로그는 표준 오류로 그대로 출력)
+    process = subprocess.Popen(command, cwd=work_dir, env=env, stdout=subprocess.DEVNULL, start_new_session=True)
+    _wait_http(port, "/readyz", 120)
+    return process
+
+
+def worker_pids(master_pid: int) -> List[int]:
+    # uvicorn 워커 프로세스 (Linux /proc 기준, 그 외 환경에서는 빈 목록)
+    children = []
+    try:
+        for name in os.listdir("/proc"):
+            if not name.isdigit():
+                continue
+            try:
+                with open(f"/proc/{name}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            if int(fields[1]) != master_pid:
+                continue
+            try:
+                with open(f"/proc/{name}/cmdline", "rb") as f:
+                    if b"resource_tracker" in f.read():  # multiprocessing 보조 프로세스 제외
+                        continue
+            except OSError:
+                continue
+            children.append(int(name))
+    except OSError:
+        return []
+    return children
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+class RequestFactory:
+    # mix.json의 가중치에 따라 요청 본문 생성 (자리표시자는 합성 기업·연도·접수번호로 채움)
+    def __init__(self, mix_path: str):
+        with open(mix_path, encoding="utf-8") as f:
+            self.mix = json.load(f)["mix"]
+        self.weights = [item["weight"] for item in self.mix]
+        companies = fake_dart.companies()
+        self.listed = [row for row in companies if row["stock_code"].strip()]
+        self.rcept_nos = fake_dart.rcept_nos()
+
+    def _fill(self, value: Any, rng: random.Random, company: Dict[str, str]) -> Any:
+        if isinstance(value, dict):
+            return {key: self._fill(item, rng, company) for key, item in value.items()}
+        if not isinstance(value, str) or "{" not in value:
+            return value
+        year = str(rng.choice([2020, 2021, 2022, 2023]))
+        replacements = {
+            "{company}": company["corp_name"],
+            "{corp_code}": company["corp_code"],
+            "{year}": year,
+            "{start_date}": f"{year}-01-01",
+            "{end_date}": f"{year}-12-31",
+            "{rcept_no}": rng.choice(self.rcept_nos),
+            "{corp_codes}": ",".join(row["corp_code"] for row in rng.sample(self.listed, 20)),
+        }
+        return replacements.get(value, value)
+
+    def make(self, rng: random.Random) -> Dict[str, Any]:
+        item = rng.choices(self.mix, weights=self.weights)[0]
+        # 인기 기업에 요청이 몰리는 분포 (앞쪽 기업일수록 자주 조회 → 캐시 적중도 발생)
+        company = self.listed[min(int(rng.paretovariate(1.2)) - 1, len(self.listed) - 1)]
+        return {"auth_key": AUTH_KEY, **self._fill(item["request"], rng, company)}
+
+
+def drive(port: int, factory: RequestFactory, concurrency: int, duration: float, warmup: float,
+          seed: int, results: List[Dict[str, Any]]) -> None:
+    # 연결을 유지하는 클라이언트 스레드 concurrency개가 duration초 동안 요청 (warmup초 동안의 결과는 제외)
+    started = time.perf_counter()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+    lock = threading.Lock()
+
+    def client(index: int):
+        rng = random.Random(seed * 1000 + index)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        local = []
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            body = factory.make(rng)
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            try:
+                conn.request("POST", "/api/dart", body=payload,
+                             headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"})
+                response = conn.getresponse()
+                content = response.read()
+                status = response.status
+                cache = response.getheader("X-Cache", "-")
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+                content, status, cache = b"", 599, "-"
+            finished = time.perf_counter()
+            if now >= measure_from:
+                local.append({"query_type": body["query_type"], "status": status, "cache": cache,
+                              "latency": finished - now, "bytes": len(content), "finished": finished})
+        conn.close()
+        with lock:
+            results.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(results: List[Dict[str, Any]], duration: float) -> Dict[str, Any]:
+    def stats(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        latencies = [item["latency"] * 1000 for item in items]
+        return {
+            "requests": len(items),
+            "errors": sum(1 for item in items if item["status"] >= 500),
+            "rps": round(len(items) / duration, 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "avg_bytes": int(sum(item["bytes"] for item in items) / len(items)) if items else 0,
+        }
+
+    by_type: Dict[str, List[Dict[str, Any]]] = {}
+    for item in results:
+        by_type.setdefault(item["query_type"], []).append(item)
+    statuses: Dict[str, int] = {}
+    caches: Dict[str, int] = {}
+    for item in results:
+        statuses[str(item["status"])] = statuses.get(str(item["status"]), 0) + 1
+        caches[item["cache"]] = caches.get(item["cache"], 0) + 1
+    return {
+        "overall": stats(results),
+        "query_types": {name: stats(items) for name, items in sorted(by_type.items())},
+        "statuses": statuses,
+        "cache": caches,
+    }
+
+
+def print_report(summary: Dict[str, Any]) -> None:
+    header = f"{'query_type':<24}{'요청':>8}{'오류':>6}{'rps':>9}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'평균 크기':>12}"
+    print(header)
+    print("-" * len(header))
+    rows = list(summary["query_types"].items()) + [("전체", summary["overall"])]
+    for name, stats in rows:
+        print(f"{name:<24}{stats['requests']:>8}{stats['errors']:>6}{stats['rps']:>9.1f}{stats['p50_ms']:>10.1f}"
+              f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['avg_bytes']:>12,}")
+    print(f"상태 코드: {summary['statuses']}  캐시: {summary['cache']}")
+    memory = summary.get("memory_mb")
+    if memory:
+        print(f"워커 메모리(RSS, MB): 최대 {memory['max']:.1f}, 종료 시 {memory['final']}")
+    if summary.get("dart_requests") is not None:
+        print(f"대체 DART 서버 요청 수: {summary['dart_requests']}")
+
+
+def compare(summary: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_requests: int) -> List[str]:
+    # p95 지연이 (1 + tolerance)배를 넘거나 처리량이 (1 - tolerance)배 아래로 떨어진 항목
+    regressions = []
+    pairs = [("전체", summary["overall"], baseline["overall"])]
+    pairs += [(name, stats, baseline["query_types"][name]) for name, stats in summary["query_types"].items()
+              if name in baseline.get("query_types", {})]
+    for name, current, base in pairs:
+        if current["requests"] < min_requests or base["requests"] < min_requests:
+            continue
+        if base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.1f}ms → {current['p95_ms']:.1f}ms")
+        if name == "전체" and current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {base['rps']:.1f} → {current['rps']:.1f}")
+    return regressions
+
+
+def _fetch_json(port: int, path: str) -> Optional[Dict[str, Any]]:
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", path)
+        return json.loads(conn.getresponse().read())
+    except (OSError, ValueError, http.client.HTTPException):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="/api/dart 오프라인 부하 측정")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn 워커 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=5, help="측정 전 예열 시간 (초, 결과 제외)")
+    parser.add_argument("--mix", default=os.path.join(BENCHMARK_DIR, "mix.json"), help="요청 구성 파일")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.05, help="대체 DART 서버 기본 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.5)
+    parser.add_argument("--endpoint-latency", default="document=0.3,fnlttSinglAcntAll=0.15", help="엔드포인트별 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="대체 DART 서버 오류 응답 비율")
+    parser.add_argument("--error-kinds", default="500")
+    parser.add_argument("--fixtures", default=None, help="재생할 fixtures 디렉터리 (없으면 합성 데이터)")
+    parser.add_argument("--keep-rate-limit", action="store_true", help="앱의 DART 호출 한도 유지")
+    parser.add_argument("--app-port", type=int, default=8800)
+    parser.add_argument("--dart-port", type=int, default=8900)
+    parser.add_argument("--save-baseline", default=None, help="결과를 저장할 기준 이름")
+    parser.add_argument("--compare", default=None, help="비교할 기준 이름")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 성능 저하 비율")
+    parser.add_argument("--min-requests", type=int, default=30, help="비교에 필요한 최소 요청 수")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="dart-bench-")
+    dart_process = app_process = None
+    try:
+        dart_process = start_fake_dart(args, args.dart_port)
+        app_process = start_app(args, args.app_port, args.dart_port, work_dir)
+        factory = RequestFactory(args.mix)
+        print(f"측정: 워커 {args.workers}개, 동시 요청 {args.concurrency}개, {args.duration:.0f}초 (예열 {args.warmup:.0f}초)")
+
+        results: List[Dict[str, Any]] = []
+        peak: Dict[int, float] = {}
+        done = threading.Event()
+
+        def sample_memory():
+            while not done.wait(0.5):
+                for pid in worker_pids(app_process.pid):
+                    value = rss_mb(pid)
+                    if value is not None:
+                        peak[pid] = max(peak.get(pid, 0.0), value)
+
+        sampler = threading.Thread(target=sample_memory, daemon=True)
+        sampler.start()
+        drive(args.app_port, factory, args.concurrency, args.duration, args.warmup, args.seed, results)
+        done.set()
+        sampler.join()
+
+        summary = summarize(results, args.duration)
+        final = [round(value, 1) for value in (rss_mb(pid) for pid in worker_pids(app_process.pid)) if value is not None]
+        if peak:
+            summary["memory_mb"] = {"max": round(max(peak.values()), 1), "final": final}
+        dart_stats = _fetch_json(args.dart_port, "/api/_stats")
+        summary["dart_requests"] = dart_stats.get("_total") if dart_stats else None
+        summary["config"] = {key: value for key, value in vars(args).items()
+                             if key not in ("save_baseline", "compare", "output")}
+        summary["config"]["mix"] = os.path.relpath(args.mix, os.path.dirname(BENCHMARK_DIR))
+        # 기준 결과는 측정 환경에 따라 달라지므로 비교할 때 확인할 수 있도록 함께 저장
+        summary["environment"] = {"cpus": os.cpu_count(), "python": platform.python_version(), "platform": platform.platform()}
+        summary["created_at"] = datetime.now().isoformat(timespec="seconds")
+        print_report(summary)
+    finally:
+        if app_process is not None:
+            os.killpg(app_process.pid, signal.SIGTERM)
+            app_process.wait(timeout=30)
+        if dart_process is not None:
+            dart_process.terminate()
+            dart_process.wait(timeout=10)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save_baseline}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"기준 결과 저장: {path}")
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), encoding="utf-8") as f:
+            baseline = json.load(f)
+        cpus = baseline.get("environment", {}).get("cpus")
+        if cpus is not None and cpus != os.cpu_count():
+            print(f"주의: 기준 결과는 CPU {cpus}개 환경에서 측정했습니다 (현재 {os.cpu_count()}개)")
+        regressions = compare(summary, baseline, args.tolerance, args.min_requests)
+        if regressions:
+            print("성능 저하:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"기준 결과({args.compare}) 대비 허용 범위 안 (±{args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
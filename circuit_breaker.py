@@ -0,0 +1,131 @@
+import os
+import json
+import time
+from typing import Dict, Any
+import requests
+
+# 엔드포인트 계열별 차단기 설정 (워커 단위)
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5"))  # 연속 실패 횟수
+CIRCUIT_RESET_TIMEOUT = float(os.environ.get("CIRCUIT_RESET_TIMEOUT", "30"))  # 차단 후 시험 호출까지 대기 (초)
+
+# 쿼리 타입별 OpenDART 엔드포인트 계열 (같은 계열은 같은 서버 기능을 사용하므로 함께 차단)
+# - list: 공시검색, company: 기업개황·고유번호, finstate: 재무정보·XBRL, document: 원문·첨부 (dart.fss.or.kr)
+# - 그 외 정기보고서 주요정보·주요사항보고서·증권신고서는 report 계열
+ENDPOINT_FAMILIES = {
+    "disclosure": "list",
+    "report": "list",
+    "disclosure_date": "list",
+    "disclosure_date_ex": "list",
+    "disclosure_ticker": "list",
+    "disclosure_sync": "list",
+    "disclosure_feed": "list",
+    "company": "company",
+    "company_info": "company",
+    "corp_codes": "company",
+    "warehouse_ingest": "company",
+    "section_financial": "finstate",
+    "full_financial": "finstate",
+    "multi_financial": "finstate",
+    "report_content": "finstate",
+    "financial_timeseries": "finstate",
+    "report_key": "report",
+    "document": "document",
+    "retrieve": "document",
+    "sub_docs": "document",
+    "attach_docs": "document",
+    "attach_files": "document",
+    "attachment": "document",
+}
+
+# 재시도할 OpenDART 상태 코드 (020: 요청 제한 초과, 800: 시스템 점검, 900: 정의되지 않은 오류)
+TRANSIENT_DART_STATUSES = {"020", "800", "900"}
+
+
+class UpstreamUnavailable(Exception):
+    # OpenDART를 지금 사용할 수 없어 요청을 처리하지 못함 (재시도 시간과 함께 응답)
+    status_code = 503
+
+    def __init__(self, detail: str, retry_after: float):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class CircuitOpen(UpstreamUnavailable):
+    pass
+
+
+def family_for(query_type: str) -> str:
+    return ENDPOINT_FAMILIES.get(query_type, "report")
+
+
+def is_transient(exc: BaseException) -> bool:
+    # 다시 시도하면 성공할 수 있는 오류인지 판단 (연결 실패, 시간 초과, 5xx, 오류 페이지, DART 점검·제한 응답)
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)):
+        return True
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and (exc.response.status_code >= 500 or exc.response.status_code == 429)
+    if isinstance(exc, json.JSONDecodeError):
+        return True
+    if isinstance(exc, ValueError) and exc.args and isinstance(exc.args[0], dict):
+        status = exc.args[0].get("status")
+        if isinstance(status, tuple):
+            status = status[0] if status else None
+        return status in TRANSIENT_DART_STATUSES
+    return False
+
+
+class CircuitBreaker:
+    # closed: 정상 호출, open: 호출하지 않고 바로 실패, half_open: 시험 호출 1건만 허용
+    def __init__(self, family: str):
+        self.family = family
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self) -> None:
+        if self.state == "closed":
+            return
+        now = time.monotonic()
+        if self.state == "open" and now - self.opened_at >= CIRCUIT_RESET_TIMEOUT:
+            self.state = "half_open"
+            self.probe_started = 0.0
+        # 시험 호출이 끝나지 않고 남아 있으면(취소 등) 대기 시간 이후 다시 허용
+        if self.state == "half_open" and now - self.probe_started >= CIRCUIT_RESET_TIMEOUT:
+            self.probe_started = now
+            return
+        self.rejected += 1
+        retry_after = max(1.0, CIRCUIT_RESET_TIMEOUT - (now - self.opened_at))
+        raise CircuitOpen(f"DART 서버 응답 오류가 계속되어 잠시 요청을 중단했습니다 ({self.family}).", retry_after)
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= CIRCUIT_FAILURE_THRESHOLD:
+            if self.state != "open":
+                self.opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "opened": self.opened, "rejected": self.rejected}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def for_query_type(query_type: str) -> CircuitBreaker:
+    family = family_for(query_type)
+    if family not in _breakers:
+        _breakers[family] = CircuitBreaker(family)
+    return _breakers[family]
+
+
+def stats() -> Dict[str, Any]:
+    return {family: breaker.stats() for family, breaker in _breakers.items()}
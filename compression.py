@@ -0,0 +1,101 @@
+import os
+import gzip
+from typing import Optional, Dict, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 br 인코딩은 사용하지 않음
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard가 없으면 zstd 인코딩은 사용하지 않음
+    zstandard = None
+
+# 응답 압축 설정
+RESPONSE_COMPRESSION_ENABLED = os.environ.get("RESPONSE_COMPRESSION_ENABLED", "true").lower() == "true"
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))  # 이보다 작은 본문은 압축하지 않음
+
+# 인코딩별 기본 압축 수준
+DEFAULT_LEVELS = {"br": 5, "zstd": 3, "gzip": 6}
+
+# 쿼리 타입별 압축 수준 (한 번 압축해 오래 캐시하는 원문은 높은 수준 사용)
+# 환경변수 예시: RESPONSE_COMPRESSION_LEVELS="document:br=11,disclosure_date:gzip=9,*:zstd=6"
+DEFAULT_QUERY_LEVELS = {
+    ("document", "br"): 9,
+    ("document", "zstd"): 12,
+    ("document", "gzip"): 9,
+    ("retrieve", "br"): 9,
+    ("retrieve", "zstd"): 12,
+    ("retrieve", "gzip"): 9,
+}
+
+# 같은 q 값이면 압축률이 좋은 순서로 선택
+PREFERENCE = ("br", "zstd", "gzip")
+
+
+def _parse_levels(value: str) -> Dict[Tuple[str, str], int]:
+    # "document:br=11,*:gzip=6" 형식의 환경변수 파싱 (쿼리 타입 * 은 모든 쿼리 타입)
+    levels = {}
+    for item in value.split(","):
+        if "=" not in item or ":" not in item.split("=", 1)[0]:
+            continue
+        key, level = item.split("=", 1)
+        query_type, encoding = key.split(":", 1)
+        levels[(query_type.strip(), encoding.strip())] = int(level)
+    return levels
+
+
+LEVELS = {**DEFAULT_QUERY_LEVELS, **_parse_levels(os.environ.get("RESPONSE_COMPRESSION_LEVELS", ""))}
+
+
+def available() -> Tuple[str, ...]:
+    installed = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+    return tuple(encoding for encoding in PREFERENCE if installed[encoding])
+
+
+def negotiate(accept_encoding: Optional[str], size: int) -> Optional[str]:
+    # Accept-Encoding 헤더(q 값 포함)에서 사용할 인코딩 선택, 압축하지 않으면 None
+    if not RESPONSE_COMPRESSION_ENABLED or not accept_encoding or size < RESPONSE_COMPRESSION_MIN_BYTES:
+        return None
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        name = name.strip()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in available():
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def level_for(query_type: str, encoding: str) -> int:
+    return LEVELS.get((query_type, encoding), LEVELS.get(("*", encoding), DEFAULT_LEVELS[encoding]))
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def stats() -> Dict[str, object]:
+    return {
+        "enabled": RESPONSE_COMPRESSION_ENABLED,
+        "min_bytes": RESPONSE_COMPRESSION_MIN_BYTES,
+        "encodings": list(available()),
+    }
@@ -0,0 +1,188 @@
+import re
+import unicodedata
+from typing import Optional, List, Dict, Any
+import numpy as np
+import pandas as pd
+
+# 기업명 정규화 시 제거할 법인 형태 표기
+CORP_FORM_PATTERNS = [
+    r"\(주\)", r"㈜", r"주식회사", r"\(유\)", r"유한회사", r"\(합\)", r"합자회사", r"\(사\)", r"사단법인", r"\(재\)", r"재단법인",
+    r"co\.?,?\s*ltd\.?", r"inc\.?", r"corp\.?", r"corporation",
+]
+_FORM_RE = re.compile("|".join(CORP_FORM_PATTERNS), re.IGNORECASE)
+_NON_WORD_RE = re.compile(r"[\s\W_]+")
+
+# 후보 목록 최대 개수
+MAX_CANDIDATES = 10
+
+
+class CompanyNotFoundError(LookupError):
+    pass
+
+
+class AmbiguousCompanyError(LookupError):
+    def __init__(self, query: str, candidates: List[Dict[str, Any]]):
+        super().__init__(query)
+        self.query = query
+        self.candidates = candidates
+
+
+def normalize_name(name: str) -> str:
+    # 전각/반각 통일(NFKC), 법인 형태 표기·공백·특수문자 제거, 소문자화
+    name = unicodedata.normalize("NFKC", name or "")
+    name = _FORM_RE.sub("", name)
+    return _NON_WORD_RE.sub("", name).lower()
+
+
+def _bigrams(name: str) -> set:
+    if len(name) < 2:
+        return {name} if name else set()
+    return {name[i:i + 2] for i in range(len(name) - 1)}
+
+
+def _clean_code(value: Any) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+class CorpIndex:
+    # 메모리 매핑한 기업 고유번호 테이블(corp_table.CorpTable) 위의 검색 인덱스
+    # - corp_code / stock_code: 고정 폭 정렬 배열 이진 검색
+    # - 기업명 완전일치·정규화 일치·접두어: 정렬 순서 배열 이진 검색, 유사 검색: 2-gram 역색인
+    # 워커마다 별도의 해시맵을 만들지 않으므로 생성 비용이 없고 테이블 메모리는 모든 워커가 공유
+
+    def __init__(self, table):
+        self.table = table
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def record(self, i: int, match: str = "exact", score: float = 1.0) -> Dict[str, Any]:
+        return {
+            "corp_code": self.table.corp_code_at(i),
+            "corp_name": self.table.corp_name(i),
+            "stock_code": self.table.stock_code_at(i),
+            "modify_date": self.table.modify_date_at(i),
+            "match": match,
+            "score": round(score, 3),
+        }
+
+    def _rank(self, hits: Dict[int, tuple]) -> List[Dict[str, Any]]:
+        # 점수 > 상장 여부 > 최근 변경일 순으로 정렬
+        stock_code, modify_date = self.table.stock_code, self.table.modify_date
+
+        def sort_key(item):
+            i, (match, score) = item
+            return (-score, not stock_code[i], -int(modify_date[i]))
+
+        ordered = sorted(hits.items(), key=sort_key)
+        return [self.record(i, match, score) for i, (match, score) in ordered[:MAX_CANDIDATES]]
+
+    def _pick(self, indices: List[int]) -> Optional[int]:
+        # 동일 이름 기업이 여러 개면 상장사가 하나일 때만 확정
+        if len(indices) == 1:
+            return indices[0]
+        listed = [i for i in indices if self.table.stock_code[i]]
+        return listed[0] if len(listed) == 1 else None
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        # 후보 기업 목록을 순위대로 반환 (완전일치 → 정규화 일치 → 접두어 → 유사도)
+        query = (query or "").strip()
+        if not query:
+            return []
+
+        hits: Dict[int, tuple] = {}
+        i = self.table.find_corp_code(query)
+        if i is not None:
+            hits[i] = ("corp_code", 1.0)
+        i = self.table.find_stock_code(query)
+        if i is not None:
+            hits[i] = ("stock_code", 1.0)
+        for i in self.table.find_name(query):
+            hits.setdefault(i, ("name", 1.0))
+
+        key = normalize_name(query)
+        if not key:
+            return self._rank(hits)
+        for i in self.table.find_normalized(key):
+            hits.setdefault(i, ("normalized", 0.95))
+
+        for name, indices in self.table.prefix_normalized(key):
+            for i in indices:
+                hits.setdefault(i, ("prefix", 0.6 + 0.3 * len(key) / len(name)))
+            if len(hits) > MAX_CANDIDATES * 20:
+                break
+
+        if len(hits) < MAX_CANDIDATES:
+            grams = _bigrams(key)
+            postings = [self.table.gram_rows_for(gram) for gram in grams]
+            if postings:
+                rows, common = np.unique(np.concatenate(postings), return_counts=True)
+                # 2-gram 자카드 유사도
+                scores = common / (len(grams) + self.table.gram_counts[rows].astype(np.int64) - common)
+                for i, score in zip(rows[scores >= 0.3].tolist(), scores[scores >= 0.3].tolist()):
+                    hits.setdefault(i, ("fuzzy", 0.6 * score))
+
+        return self._rank(hits)
+
+    def resolve(self, query: str) -> Dict[str, Any]:
+        # 기업명/종목코드/고유번호를 단일 기업으로 확정
+        # 확정할 수 없으면 후보 목록과 함께 AmbiguousCompanyError 발생
+        query = (query or "").strip()
+        i = self.table.find_corp_code(query)
+        if i is not None:
+            return self.record(i, "corp_code")
+        i = self.table.find_stock_code(query)
+        if i is not None:
+            return self.record(i, "stock_code")
+
+        for indices, match in ((self.table.find_name(query), "name"),
+                               (self.table.find_normalized(normalize_name(query)), "normalized")):
+            if indices:
+                picked = self._pick(indices)
+                if picked is not None:
+                    return self.record(picked, match)
+                raise AmbiguousCompanyError(query, self._rank({i: (match, 1.0) for i in indices}))
+
+        candidates = self.search(query)
+        if not candidates:
+            raise CompanyNotFoundError(query)
+        raise AmbiguousCompanyError(query, candidates)
+
+    def find_name(self, name: str) -> Optional[Dict[str, Any]]:
+        # 기업명 완전일치(또는 정규화 일치)로 단일 기업을 확정할 수 있을 때만 반환 (후보 검색 없음)
+        name = (name or "").strip()
+        for indices in (self.table.find_name(name), self.table.find_normalized(normalize_name(name))):
+            if indices:
+                picked = self._pick(indices)
+                return self.record(picked, "name") if picked is not None else None
+        return None
+
+    def resolve_corp_code(self, query: str) -> str:
+        return self.resolve(query)["corp_code"]
+
+    def find_corp_code(self, corp: str) -> Optional[str]:
+        # OpenDartReader.find_corp_code와 같은 규칙 (숫자가 아니면 기업명, 6자리 숫자는 종목코드, 그 외 고유번호)
+        corp = str(corp)
+        if not corp.isdigit():
+            indices = self.table.find_name(corp)
+            i = indices[0] if indices else None
+        elif len(corp) == 6:
+            i = self.table.find_stock_code(corp)
+        else:
+            i = self.table.find_corp_code(corp)
+        return self.table.corp_code_at(i) if i is not None else None
+
+    def corp_codes_containing(self, name: str) -> List[str]:
+        # 기업명에 name이 포함된 기업의 고유번호 목록 (OpenDartReader.company_by_name 대체)
+        return [self.table.corp_code_at(i) for i in self.table.contains(name)]
+
+    def listed(self) -> pd.DataFrame:
+        # 상장사(종목코드 보유) 목록
+        rows = self.table.stock_order
+        return pd.DataFrame({
+            "corp_code": [self.table.corp_code_at(i) for i in rows],
+            "corp_name": [self.table.corp_name(i) for i in rows],
+            "stock_code": [self.table.stock_code_at(i) for i in rows],
+        })
@@ -0,0 +1,252 @@
+import os
+import json
+import mmap
+import bisect
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+import numpy as np
+import pandas as pd
+
+from corp_index import normalize_name, _bigrams, _clean_code
+
+# 기업 고유번호 테이블 파일 (워커마다 읽기 전용으로 메모리 매핑하여 같은 물리 메모리를 공유)
+# - 고유번호 순으로 정렬한 행, 고정 폭 코드 배열(이진 검색), 기업명은 UTF-8 바이트 묶음 + 위치 배열
+# - 기업명·정규화 기업명 정렬 순서와 2-gram 역색인(CSR 형식)을 함께 저장하여 조회 시 별도 인덱스를 만들지 않음
+MAGIC = b"CORPTBL1"
+ALIGN = 64
+
+
+def gram_key(gram: str) -> int:
+    # 2-gram(또는 한 글자 이름)을 정수 키로 변환
+    return (ord(gram[0]) << 32) | (ord(gram[1]) if len(gram) > 1 else 0xFFFFFFFF)
+
+
+def _strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    # 문자열 목록 → (UTF-8 바이트 묶음, 시작 위치 배열(n+1))
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _order(encoded: List[bytes]) -> np.ndarray:
+    # UTF-8 바이트 순서 (= 유니코드 코드 포인트 순서)로 정렬한 행 번호
+    return np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype=np.int32)
+
+
+def build(corp_codes: pd.DataFrame) -> Dict[str, np.ndarray]:
+    frame = pd.DataFrame({
+        "corp_code": corp_codes["corp_code"].map(_clean_code),
+        "corp_name": corp_codes["corp_name"].fillna("").astype(str),
+        "stock_code": corp_codes["stock_code"].map(_clean_code) if "stock_code" in corp_codes.columns else "",
+        "modify_date": corp_codes["modify_date"].map(_clean_code) if "modify_date" in corp_codes.columns else "",
+    })
+    frame = frame[frame["corp_code"] != ""].drop_duplicates("corp_code", keep="last")
+    frame = frame.sort_values("corp_code", kind="stable").reset_index(drop=True)
+
+    names = frame["corp_name"].tolist()
+    normalized = [normalize_name(name) for name in names]
+    stock_codes = frame["stock_code"].tolist()
+    code_width = max(1, frame["corp_code"].str.len().max() if len(frame) else 1)
+    stock_width = max(1, frame["stock_code"].str.len().max() if len(frame) else 1)
+
+    arrays = {
+        "corp_code": frame["corp_code"].to_numpy(dtype=f"S{code_width}"),
+        "stock_code": frame["stock_code"].to_numpy(dtype=f"S{stock_width}"),
+        "modify_date": pd.to_numeric(frame["modify_date"], errors="coerce").fillna(0).to_numpy(dtype=np.int32),
+    }
+    arrays["name_blob"], arrays["name_offsets"] = _strings(names)
+    arrays["norm_blob"], arrays["norm_offsets"] = _strings(normalized)
+    arrays["name_order"] = _order([name.encode("utf-8") for name in names])
+    arrays["norm_order"] = _order([name.encode("utf-8") for name in normalized])
+
+    listed = np.array([i for i, code in enumerate(stock_codes) if code], dtype=np.int32)
+    listed = listed[np.argsort(arrays["stock_code"][listed], kind="stable")] if len(listed) else listed
+    arrays["stock_order"] = listed
+    arrays["stock_keys"] = arrays["stock_code"][listed]
+
+    # 2-gram 역색인: 키 정렬 배열 + 키별 행 목록 (CSR)
+    keys, rows, counts = [], [], np.zeros(len(normalized), dtype=np.uint16)
+    for i, name in enumerate(normalized):
+        grams = _bigrams(name)
+        counts[i] = min(len(grams), 0xFFFF)
+        for gram in grams:
+            keys.append(gram_key(gram))
+            rows.append(i)
+    keys = np.array(keys, dtype=np.uint64)
+    rows = np.array(rows, dtype=np.int32)
+    order = np.argsort(keys, kind="stable")
+    keys, rows = keys[order], rows[order]
+    unique, starts = np.unique(keys, return_index=True)
+    arrays["gram_keys"] = unique
+    arrays["gram_offsets"] = np.append(starts, len(keys)).astype(np.int64)
+    arrays["gram_rows"] = rows
+    arrays["gram_counts"] = counts
+    return arrays
+
+
+def write(corp_codes: pd.DataFrame, path: str) -> None:
+    # 다른 워커가 매핑 중인 파일을 바꾸지 않도록 임시 파일에 쓴 뒤 교체 (기존 매핑은 이전 파일을 계속 사용)
+    arrays = build(corp_codes)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    header = json.dumps({"count": len(arrays["corp_code"]), "arrays": layout}).encode("utf-8")
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGN) * ALIGN
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + len(header).to_bytes(8, "little") + header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+
+
+class _SortedStrings:
+    # 정렬 순서 배열을 통해 바이트 문자열을 정렬된 시퀀스처럼 보여줌 (bisect용)
+    def __init__(self, table: "CorpTable", blob: str, order: np.ndarray):
+        self.table = table
+        self.blob = blob
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, k: int) -> bytes:
+        return self.table._bytes(self.blob, int(self.order[k]))
+
+
+class CorpTable:
+    # 메모리 매핑한 기업 고유번호 테이블 (읽기 전용)
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"기업 고유번호 테이블 형식이 아닙니다: {path}")
+        header_size = int.from_bytes(self._mm[len(MAGIC):len(MAGIC) + 8], "little")
+        header = json.loads(self._mm[len(MAGIC) + 8:len(MAGIC) + 8 + header_size])
+        data_start = -(-(len(MAGIC) + 8 + header_size) // ALIGN) * ALIGN
+        self.path = path
+        self.count = header["count"]
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            size = int(np.prod(spec["shape"])) if spec["shape"] else 1
+            array = np.frombuffer(self._mm, dtype=dtype, count=size, offset=data_start + spec["offset"])
+            setattr(self, name, array.reshape(spec["shape"]))
+        self._names = _SortedStrings(self, "name", self.name_order)
+        self._normalized = _SortedStrings(self, "norm", self.norm_order)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _bytes(self, blob: str, i: int) -> bytes:
+        offsets = getattr(self, f"{blob}_offsets")
+        return getattr(self, f"{blob}_blob")[offsets[i]:offsets[i + 1]].tobytes()
+
+    def corp_name(self, i: int) -> str:
+        return self._bytes("name", i).decode("utf-8")
+
+    def normalized(self, i: int) -> str:
+        return self._bytes("norm", i).decode("utf-8")
+
+    def corp_code_at(self, i: int) -> str:
+        return self.corp_code[i].decode("ascii")
+
+    def stock_code_at(self, i: int) -> str:
+        return self.stock_code[i].decode("ascii")
+
+    def modify_date_at(self, i: int) -> str:
+        value = int(self.modify_date[i])
+        return str(value) if value else ""
+
+    @staticmethod
+    def _search(keys: np.ndarray, value: str) -> Optional[int]:
+        try:
+            key = value.encode("ascii")
+        except UnicodeEncodeError:
+            return None
+        if not key or len(key) > keys.dtype.itemsize:
+            return None
+        pos = int(np.searchsorted(keys, key))
+        return pos if pos < len(keys) and keys[pos] == key else None
+
+    def find_corp_code(self, corp_code: str) -> Optional[int]:
+        return self._search(self.corp_code, corp_code)
+
+    def find_stock_code(self, stock_code: str) -> Optional[int]:
+        pos = self._search(self.stock_keys, stock_code)
+        return int(self.stock_order[pos]) if pos is not None else None
+
+    def _equal(self, view: _SortedStrings, value: str) -> List[int]:
+        key = value.encode("utf-8")
+        start = bisect.bisect_left(view, key)
+        end = bisect.bisect_right(view, key, lo=start)
+        return sorted(int(i) for i in view.order[start:end])
+
+    def find_name(self, corp_name: str) -> List[int]:
+        return self._equal(self._names, corp_name)
+
+    def find_normalized(self, normalized: str) -> List[int]:
+        return self._equal(self._normalized, normalized)
+
+    def prefix_normalized(self, prefix: str) -> Iterator[Tuple[str, List[int]]]:
+        # 정규화 기업명이 prefix로 시작하는 (이름, 행 목록)을 이름 순으로
+        key = prefix.encode("utf-8")
+        pos = bisect.bisect_left(self._normalized, key)
+        while pos < len(self._normalized):
+            name = self._normalized[pos]
+            if not name.startswith(key):
+                break
+            end = bisect.bisect_right(self._normalized, name, lo=pos)
+            yield name.decode("utf-8"), sorted(int(i) for i in self.norm_order[pos:end])
+            pos = end
+
+    def gram_rows_for(self, gram: str) -> np.ndarray:
+        key = gram_key(gram)
+        pos = int(np.searchsorted(self.gram_keys, key))
+        if pos >= len(self.gram_keys) or int(self.gram_keys[pos]) != key:
+            return self.gram_rows[:0]
+        return self.gram_rows[self.gram_offsets[pos]:self.gram_offsets[pos + 1]]
+
+    def contains(self, text: str) -> List[int]:
+        # 기업명에 text가 포함된 행 (UTF-8 바이트 묶음에서 직접 검색)
+        key = text.encode("utf-8")
+        if not key:
+            return list(range(self.count))
+        blob = self._mm
+        base = self.name_blob.ctypes.data - np.frombuffer(self._mm, dtype=np.uint8).ctypes.data
+        end = base + int(self.name_offsets[-1])
+        rows, pos = [], blob.find(key, base, end)
+        while pos != -1:
+            row = int(np.searchsorted(self.name_offsets, pos - base, side="right")) - 1
+            row_end = base + int(self.name_offsets[row + 1])
+            if pos + len(key) > row_end:
+                # 이웃한 두 이름에 걸친 일치는 제외하고 바로 다음 위치부터 다시 검색
+                pos = blob.find(key, pos + 1, end)
+                continue
+            rows.append(row)
+            # 같은 이름 안의 다음 일치는 건너뜀
+            pos = blob.find(key, row_end, end)
+        return rows
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "corp_code": np.char.decode(self.corp_code, "ascii"),
+            "corp_name": [self.corp_name(i) for i in range(self.count)],
+            "stock_code": np.char.decode(self.stock_code, "ascii"),
+            "modify_date": [self.modify_date_at(i) for i in range(self.count)],
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "count": self.count, "bytes": len(self._mm)}
+
+
+def open_table(path: str) -> CorpTable:
+    return CorpTable(path)
@@ -0,0 +1,228 @@
+import os
+import re
+import sys
+import threading
+import time
+from typing import Optional, Dict, Any
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+import admission
+import circuit_breaker
+import corp_table
+import rate_limiter
+import upstream
+from corp_index import CorpIndex
+
+# DART API 키 및 기업 고유번호 스냅샷 설정
+DART_API_KEY = os.environ.get("DART_API_KEY", "")
+CORP_CODE_SNAPSHOT_PATH = os.environ.get("CORP_CODE_SNAPSHOT_PATH", os.path.join("data", "corp_codes.table"))
+CORP_CODE_REFRESH_HOURS = float(os.environ.get("CORP_CODE_REFRESH_HOURS", "24"))
+
+# DART 서버 주소 변경 (벤치마크·테스트용 대체 서버, 설정하지 않으면 실제 DART 사용)
+DART_BASE_URL = os.environ.get("DART_BASE_URL", "").rstrip("/")
+DART_API_HOSTS = ("https://opendart.fss.or.kr", "http://opendart.fss.or.kr")  # 호출 한도 차감 대상 (OpenDART API)
+DART_HOSTS = ("https://opendart.fss.or.kr", "http://opendart.fss.or.kr", "https://dart.fss.or.kr", "http://dart.fss.or.kr")
+
+# 워커(프로세스) 단위로 공유하는 클라이언트 상태
+_lock = threading.Lock()
+_client = None
+_index: Optional[CorpIndex] = None  # 기업명/코드 해석용 메모리 인덱스
+_loaded_at: Optional[float] = None  # 기업 고유번호 데이터 기준 시각 (epoch)
+_source: Optional[str] = None  # "snapshot" 또는 "network"
+
+
+class _DartAdapter(HTTPAdapter):
+    # OpenDartReader 전용 세션의 어댑터 (프로세스 전역 requests 동작은 바꾸지 않음)
+    # - DART_BASE_URL이 있으면 OpenDART 주소를 대체 서버로 바꾼다 (OpenDartReader는 주소가 코드에 고정됨)
+    # - OpenDART API 요청마다 호출 한도를 차감하고 요청 제한·점검 응답을 오류로 바꾼다
+    #   (공시 뷰어·첨부파일 등 dart.fss.or.kr 웹 요청은 제외)
+    # - OpenDartReader는 timeout을 지정하지 않아 DART가 응답하지 않으면 스레드가 무한정 묶이므로
+    #   요청 처리 기한까지 남은 시간(최대 DART_HTTP_TIMEOUT)을 제한 시간으로 지정한다
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        api = request.url.startswith(DART_API_HOSTS)
+        if api:
+            rate_limiter.charge_request()
+        if DART_BASE_URL:
+            for host in DART_HOSTS:
+                if request.url.startswith(host):
+                    request.url = DART_BASE_URL + request.url[len(host):]
+                    break
+        if timeout is None:
+            timeout = admission.http_timeout()
+        response = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        if api and not stream:
+            _check_status(response)
+        return response
+
+
+# JSON 응답 앞부분의 OpenDART 상태 코드 (본문 전체를 파싱하지 않고 확인)
+_STATUS = re.compile(rb'^\s*\{\s*"status"\s*:\s*"(\d{3})"')
+
+
+def _check_status(response: requests.Response) -> None:
+    # OpenDartReader는 JSON API의 요청 제한(020)·점검(800) 응답을 출력만 하고 빈 결과로 돌려주므로
+    # (예: 목록 조회), 빈 결과로 저장·캐시하지 않도록 OpenDartReader의 XML 응답과 같은 ValueError로 실패시킨다
+    # (circuit_breaker가 일시적 오류로 보고 재시도)
+    match = _STATUS.match(response.content[:64])
+    if match is None or match.group(1).decode() not in circuit_breaker.TRANSIENT_DART_STATUSES:
+        return
+    try:
+        message = response.json().get("message", "")
+    except ValueError:
+        message = ""
+    raise ValueError({"status": match.group(1).decode(), "message": message})
+
+
+class _Requests:
+    # OpenDartReader 하위 모듈의 requests 대신 사용: get은 전용 세션으로 보내고 나머지 속성(예외 등)은 requests 그대로
+    def __init__(self, session: requests.Session):
+        self.session = session
+
+    def get(self, url, params=None, **kwargs):
+        return self.session.get(url, params=params, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+# DART 요청 전용 세션 (OpenDartReader 호출과 첨부파일 다운로드에서 사용, 스레드 풀 크기만큼 연결 유지)
+session = requests.Session()
+for _prefix in ("https://", "http://"):
+    session.mount(_prefix, _DartAdapter(pool_maxsize=upstream.UPSTREAM_MAX_WORKERS))
+_requests = _Requests(session)
+
+
+def _use_session() -> None:
+    # OpenDartReader 하위 모듈이 import한 requests 모듈을 전용 세션으로 교체 (여러 번 호출해도 같음)
+    import OpenDartReader  # noqa: F401 (하위 모듈 import)
+    for name, module in list(sys.modules.items()):
+        if name.startswith("OpenDartReader.") and getattr(module, "requests", None) is requests:
+            module.requests = _requests
+
+
+def _download_corp_codes(api_key: str) -> pd.DataFrame:
+    # OpenDART corpCode.xml(zip) 전체 다운로드 및 파싱
+    _use_session()
+    from OpenDartReader import dart_list
+    return dart_list.corp_codes(api_key)
+
+
+def _load_snapshot(max_age: Optional[float]) -> Optional[corp_table.CorpTable]:
+    # 유효기간 내의 로컬 스냅샷이 있으면 읽기 전용으로 메모리 매핑해 반환 (모든 워커가 같은 페이지를 공유)
+    if not os.path.exists(CORP_CODE_SNAPSHOT_PATH):
+        return None
+    if max_age is not None and time.time() - os.path.getmtime(CORP_CODE_SNAPSHOT_PATH) > max_age:
+        return None
+    try:
+        return corp_table.open_table(CORP_CODE_SNAPSHOT_PATH)
+    except Exception as e:
+        print(f"경고: 기업 고유번호 스냅샷을 읽을 수 없습니다: {e}")
+        return None
+
+
+def _save_snapshot(corp_codes: pd.DataFrame) -> corp_table.CorpTable:
+    # 내려받은 표를 압축 테이블 파일로 기록하고 매핑해 반환 (원본 DataFrame은 더 이상 들고 있지 않음)
+    corp_table.write(corp_codes, CORP_CODE_SNAPSHOT_PATH)
+    return corp_table.open_table(CORP_CODE_SNAPSHOT_PATH)
+
+
+def _build_client(api_key: str, index: CorpIndex):
+    # OpenDartReader.__init__은 매번 기업 고유번호를 다시 읽으므로 네트워크 호출 없이 인스턴스를 만들고,
+    # 기업 고유번호 DataFrame(corp_codes)을 쓰는 두 메서드는 공유 테이블 기반 인덱스로 대체한다
+    _use_session()
+    import OpenDartReader
+    from OpenDartReader import dart_list
+    client = OpenDartReader.__new__(OpenDartReader)
+    client.api_key = api_key
+    client.corp_codes = None
+    client.find_corp_code = index.find_corp_code
+    client.company_by_name = lambda name: dart_list.company_by_name(api_key, index.corp_codes_containing(name))
+    return client
+
+
+def _install(table: corp_table.CorpTable, loaded_at: float, source: str) -> None:
+    global _client, _index, _loaded_at, _source
+    # 인덱스를 먼저 만든 뒤 클라이언트와 함께 교체 (요청 중에는 항상 같은 세대의 쌍을 본다)
+    # 이전 테이블의 매핑은 참조가 모두 사라지면 해제됨
+    index = CorpIndex(table)
+    _client = _build_client(DART_API_KEY, index)
+    _index = index
+    _loaded_at = loaded_at
+    _source = source
+
+
+def init_client() -> None:
+    # 워커 시작 시 1회 호출: 스냅샷 우선, 없거나 오래됐으면 네트워크에서 받아 저장
+    if not DART_API_KEY:
+        raise RuntimeError("DART API 키가 설정되지 않았습니다. 환경 변수 DART_API_KEY를 설정해주세요.")
+
+    with _lock:
+        if _client is not None:
+            return
+        table = _load_snapshot(CORP_CODE_REFRESH_HOURS * 3600)
+        if table is not None:
+            _install(table, os.path.getmtime(CORP_CODE_SNAPSHOT_PATH), "snapshot")
+            return
+        table = _save_snapshot(_download_corp_codes(DART_API_KEY))
+        _install(table, os.path.getmtime(CORP_CODE_SNAPSHOT_PATH), "network")
+
+
+def get_client():
+    # 공유 클라이언트 반환 (시작 시 초기화에 실패했다면 여기서 재시도)
+    if _client is None:
+        init_client()
+    return _client
+
+
+async def ensure_client():
+    # 준비된 공유 클라이언트는 바로 반환하고, 초기화가 필요할 때만(기업 고유번호를 내려받을 수 있음) DART 호출로 실행
+    if _client is not None:
+        return _client
+    return await upstream.call("corp_codes", get_client)
+
+
+def is_ready() -> bool:
+    return _client is not None and _index is not None
+
+
+def get_index() -> CorpIndex:
+    if _index is None:
+        init_client()
+    return _index
+
+
+def refresh_corp_codes(force: bool = True) -> Dict[str, Any]:
+    # 기업 고유번호 테이블 갱신
+    # force=False이면 다른 워커가 이미 갱신한 스냅샷을 우선 사용한다
+    if not DART_API_KEY:
+        raise RuntimeError("DART API 키가 설정되지 않았습니다. 환경 변수 DART_API_KEY를 설정해주세요.")
+
+    with _lock:
+        if not force:
+            max_age = CORP_CODE_REFRESH_HOURS * 3600
+            if os.path.exists(CORP_CODE_SNAPSHOT_PATH):
+                snapshot_mtime = os.path.getmtime(CORP_CODE_SNAPSHOT_PATH)
+                if _loaded_at is None or snapshot_mtime > _loaded_at:
+                    table = _load_snapshot(max_age)
+                    if table is not None:
+                        _install(table, snapshot_mtime, "snapshot")
+                        return client_status()
+            if _loaded_at is not None and time.time() - _loaded_at < max_age:
+                return client_status()
+        table = _save_snapshot(_download_corp_codes(DART_API_KEY))
+        _install(table, os.path.getmtime(CORP_CODE_SNAPSHOT_PATH), "network")
+        return client_status()
+
+
+def client_status() -> Dict[str, Any]:
+    return {
+        "initialized": _client is not None,
+        "source": _source,
+        "corp_count": len(_index) if _index is not None else 0,
+        "table_bytes": _index.table.stats()["bytes"] if _index is not None else 0,
+        "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(_loaded_at)) if _loaded_at else None,
+        "snapshot_path": CORP_CODE_SNAPSHOT_PATH,
+        "refresh_hours": CORP_CODE_REFRESH_HOURS,
+    }
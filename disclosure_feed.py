@@ -0,0 +1,351 @@
+import os
+import re
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, Iterable, AsyncIterator
+import pandas as pd
+
+import dart_client
+import disclosure_store
+import serializer
+import singleflight
+import upstream
+
+# 신규 공시 실시간 피드 (배포 전체에서 한 워커만 DART를 확인하고, 각 워커가 구독자에게 전달)
+DISCLOSURE_FEED_ENABLED = os.environ.get("DISCLOSURE_FEED_ENABLED", "true").lower() != "false"
+DISCLOSURE_FEED_PATH = os.environ.get("DISCLOSURE_FEED_PATH", os.path.join("data", "disclosure_feed.sqlite"))
+DISCLOSURE_FEED_POLL_INTERVAL = float(os.environ.get("DISCLOSURE_FEED_POLL_INTERVAL", "10"))  # DART 확인 주기 (초)
+DISCLOSURE_FEED_RETENTION = float(os.environ.get("DISCLOSURE_FEED_RETENTION", "172800"))  # 이어받기용 이벤트 보관 기간 (초)
+DISCLOSURE_FEED_QUEUE_SIZE = int(os.environ.get("DISCLOSURE_FEED_QUEUE_SIZE", "1000"))  # 구독자별 미전송 이벤트 상한
+DISCLOSURE_FEED_HEARTBEAT = float(os.environ.get("DISCLOSURE_FEED_HEARTBEAT", "15"))  # SSE 연결 유지 주석 간격 (초)
+DISCLOSURE_FEED_MAX_WAIT = float(os.environ.get("DISCLOSURE_FEED_MAX_WAIT", "60"))  # long-poll 최대 대기 (초)
+DISCLOSURE_FEED_TAIL_INTERVAL = 1.0  # 워커가 새 이벤트를 확인하는 간격 (초)
+DISCLOSURE_FEED_BACKLOG_LIMIT = 1000  # 이어받기 시 저장소에서 한 번에 읽는 이벤트 수
+
+# 이 시간 이상 확인하지 않았다가 다시 확인하면 그 사이의 공시는 신규로 전달하지 않음 (구독자가 없던 기간)
+_RESUME_GAP = max(DISCLOSURE_FEED_POLL_INTERVAL * 6, 60)
+
+# 공시 유형 추정 (list_date_ex 결과에는 유형이 없음, 로컬 공시 저장소에 없을 때만 사용)
+KIND_PATTERNS = [
+    ("A", re.compile(r"^(사업|반기|분기)보고서")),
+    ("B", re.compile(r"^주요사항보고서")),
+    ("C", re.compile(r"증권신고서|투자설명서|증권발행실적보고서|일괄신고")),
+    ("D", re.compile(r"대량보유상황보고서|소유상황보고서|공개매수|의결권대리행사")),
+    ("F", re.compile(r"감사보고서|감사인")),
+    ("G", re.compile(r"집합투자|투자회사")),
+    ("H", re.compile(r"자산유동화|유동화")),
+    ("J", re.compile(r"대규모기업집단|기업집단현황|비상장회사중요사항")),
+]
+_AMENDMENT_PREFIX = re.compile(r"^\s*(?:\[[^\]]*\]\s*)+")
+_SPACES = re.compile(r"\s+")
+
+_local = threading.local()
+_subscribers = set()
+_cursor: Optional[int] = None
+_stats = {"polls": 0, "new_events": 0, "delivered": 0, "dropped": 0}
+
+
+def _connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        directory = os.path.dirname(DISCLOSURE_FEED_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(DISCLOSURE_FEED_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # live = 0: 확인을 다시 시작할 때 이미 올라와 있던 공시 (중복 확인용으로만 기록)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT, rcept_no TEXT NOT NULL UNIQUE, data TEXT NOT NULL,"
+            " live INTEGER NOT NULL, created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_created_at ON events (created_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.commit()
+        _local.conn = conn
+    return conn
+
+
+def guess_kind(report_nm: str, rm: str = "") -> str:
+    # 보고서명으로 공시 유형 추정, 거래소 소관(유·코·넥) 공시는 I, 공정위 공시는 J, 그 외는 E(기타공시)
+    name = _AMENDMENT_PREFIX.sub("", report_nm or "").strip()
+    for kind, pattern in KIND_PATTERNS:
+        if pattern.search(name):
+            return kind
+    if any(flag in (rm or "") for flag in ("유", "코", "넥")):
+        return "I"
+    if "공" in (rm or ""):
+        return "J"
+    return "E"
+
+
+def _events(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    # list_date_ex 결과를 이벤트로 변환 (고유번호·종목코드·유형은 로컬 공시 저장소 → 기업명 인덱스 → 추정 순으로 보완)
+    if frame is None or frame.empty:
+        return []
+    frame = frame.reindex(columns=["rcept_dt", "corp_cls", "corp_name", "rcept_no", "report_nm", "flr_nm", "rm"]).fillna("")
+    rcept_nos = [str(value) for value in frame["rcept_no"]]
+    stored = disclosure_store.lookup(rcept_nos) if disclosure_store.DISCLOSURE_STORE_ENABLED else {}
+    index = dart_client.get_index() if dart_client.is_ready() else None
+
+    events = []
+    for record in frame.itertuples(index=False):
+        rcept_dt = record.rcept_dt
+        event = {
+            "rcept_no": str(record.rcept_no),
+            "rcept_dt": rcept_dt.strftime("%Y-%m-%d %H:%M") if isinstance(rcept_dt, pd.Timestamp) else str(rcept_dt),
+            "corp_cls": str(record.corp_cls),
+            "corp_name": str(record.corp_name),
+            "corp_code": "",
+            "stock_code": "",
+            "report_nm": str(record.report_nm),
+            "flr_nm": str(record.flr_nm),
+            "rm": str(record.rm),
+            "kind": "",
+        }
+        known = stored.get(event["rcept_no"])
+        if known:
+            event.update(known)
+        else:
+            corp = index.find_name(event["corp_name"]) if index is not None else None
+            if corp:
+                event["corp_code"], event["stock_code"] = corp["corp_code"], corp["stock_code"]
+            event["kind"] = guess_kind(event["report_nm"], event["rm"])
+        events.append(event)
+    return events
+
+
+def poll_state() -> Dict[str, Any]:
+    rows = dict(_connection().execute("SELECT key, value FROM meta WHERE key IN ('last_poll', 'last_day')").fetchall())
+    return {"last_poll": float(rows["last_poll"]) if "last_poll" in rows else None, "last_day": rows.get("last_day")}
+
+
+def record(frames: List[pd.DataFrame], day: str, polled_at: float) -> int:
+    # 처음 보는 접수번호만 이벤트로 추가 (확인이 오래 끊겼다가 재개된 경우에는 전달하지 않고 기록만)
+    conn = _connection()
+    state = poll_state()
+    live = state["last_poll"] is not None and polled_at - state["last_poll"] <= _RESUME_GAP
+    rows = [row for frame in frames if frame is not None and not frame.empty
+            for row in frame.to_dict("records")]
+    seen = set()
+    fresh = []
+    for row in rows:
+        rcept_no = str(row.get("rcept_no", ""))
+        if rcept_no and rcept_no not in seen:
+            seen.add(rcept_no)
+            fresh.append(row)
+    if fresh:
+        known = set()
+        candidates = [str(row["rcept_no"]) for row in fresh]
+        for i in range(0, len(candidates), 500):
+            chunk = candidates[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            known.update(value for (value,) in conn.execute(
+                f"SELECT rcept_no FROM events WHERE rcept_no IN ({placeholders})", chunk).fetchall())
+        fresh = [row for row in fresh if str(row["rcept_no"]) not in known]
+
+    # 접수번호 순(접수 순)으로 번호를 매긴다
+    events = sorted(_events(pd.DataFrame(fresh)), key=lambda event: event["rcept_no"])
+    conn.executemany("INSERT OR IGNORE INTO events (rcept_no, data, live, created_at) VALUES (?, ?, ?, ?)",
+                     [(event["rcept_no"], json.dumps(event, ensure_ascii=False), int(live), polled_at) for event in events])
+    conn.execute("DELETE FROM events WHERE created_at < ?", (polled_at - DISCLOSURE_FEED_RETENTION,))
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_poll', ?)", (str(polled_at),))
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_day', ?)", (day,))
+    conn.commit()
+    return len(events) if live else 0
+
+
+def latest_seq() -> int:
+    return _connection().execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+
+
+def events_after(after: int, until: Optional[int] = None, limit: int = DISCLOSURE_FEED_BACKLOG_LIMIT) -> List[Dict[str, Any]]:
+    sql = "SELECT seq, data FROM events WHERE seq > ? AND live = 1"
+    params: List[Any] = [after]
+    if until is not None:
+        sql += " AND seq <= ?"
+        params.append(until)
+    sql += " ORDER BY seq LIMIT ?"
+    params.append(limit)
+    return [{"seq": seq, **json.loads(data)} for seq, data in _connection().execute(sql, params).fetchall()]
+
+
+async def poll_once() -> Dict[str, Any]:
+    # 한 워커만 DART 확인 (다른 워커가 실행 중이거나 주기 안에 확인했으면 건너뜀)
+    with singleflight.exclusive("disclosure_feed") as leader:
+        if not leader:
+            return {"status": "skipped"}
+        state = await upstream.call("disclosure_store", poll_state)
+        now = time.time()
+        if state["last_poll"] is not None and now - state["last_poll"] < DISCLOSURE_FEED_POLL_INTERVAL * 0.9:
+            return {"status": "skipped"}
+
+        dart = await dart_client.ensure_client()
+        day = disclosure_store.today()
+        # 날짜가 바뀐 직후에는 전날 마지막 확인 이후의 공시도 확인
+        days = [day] if state["last_day"] in (None, day) else [state["last_day"], day]
+        frames = []
+        for target in days:
+            # 당일 목록은 계속 바뀌므로 OpenDartReader의 파일 캐시를 사용하지 않음
+            frames.append(await upstream.call("disclosure_feed", dart.list_date_ex, target, cache=False))
+        new = await upstream.call("disclosure_store", record, frames, day, now)
+        _stats["polls"] += 1
+        _stats["new_events"] += new
+        return {"status": "success", "new": new}
+
+
+class Subscriber:
+    # 구독 조건(고유번호·공시유형·보고서명)과 전송 대기열
+    def __init__(self, corp_codes: Optional[Iterable[str]] = None, kinds: Optional[Iterable[str]] = None,
+                 report_nm: Optional[str] = None):
+        self.corp_codes = set(corp_codes) if corp_codes else None
+        self.kinds = set(kinds) if kinds else None
+        self.report_nm = _SPACES.sub("", report_nm) if report_nm else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=DISCLOSURE_FEED_QUEUE_SIZE)
+        self.cursor = 0
+        self.overflowed = False
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if self.corp_codes is not None and event.get("corp_code") not in self.corp_codes:
+            return False
+        if self.kinds is not None and event.get("kind") not in self.kinds:
+            return False
+        if self.report_nm is not None and self.report_nm not in _SPACES.sub("", event.get("report_nm", "")):
+            return False
+        return True
+
+    def push(self, event: Dict[str, Any]) -> None:
+        # 대기열이 가득 차면(느린 구독자) 연결을 끊고 클라이언트가 Last-Event-ID로 이어받도록 한다
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+            _stats["delivered"] += 1
+        except asyncio.QueueFull:
+            self.overflowed = True
+            _stats["dropped"] += 1
+
+    def filter(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [event for event in events if event["seq"] > self.cursor and self.matches(event)]
+
+
+@asynccontextmanager
+async def subscribe(corp_codes: Optional[Iterable[str]] = None, kinds: Optional[Iterable[str]] = None,
+                    report_nm: Optional[str] = None, since: Optional[int] = None):
+    # 구독 등록 → (구독자, since 이후 놓친 이벤트) 반환, 종료 시 등록 해제
+    global _cursor
+    subscriber = Subscriber(corp_codes, kinds, report_nm)
+    current = await upstream.call("disclosure_store", latest_seq)
+    if _cursor is None:
+        _cursor = current
+    subscriber.cursor = _cursor if since is None else since
+    # 등록 시점까지의 이벤트는 저장소에서, 이후 이벤트는 대기열로 받는다
+    until = _cursor
+    _subscribers.add(subscriber)
+    try:
+        backlog = []
+        after = subscriber.cursor
+        while after < until:
+            events = await upstream.call("disclosure_store", events_after, after, until)
+            if not events:
+                break
+            backlog.extend(subscriber.filter(events))
+            after = events[-1]["seq"]
+        yield subscriber, backlog
+    finally:
+        _subscribers.discard(subscriber)
+
+
+async def _dispatch() -> None:
+    global _cursor
+    if _cursor is None:
+        _cursor = await upstream.call("disclosure_store", latest_seq)
+    events = await upstream.call("disclosure_store", events_after, _cursor)
+    for event in events:
+        _cursor = event["seq"]
+        for subscriber in list(_subscribers):
+            if subscriber.matches(event):
+                subscriber.push(event)
+
+
+async def feed_loop():
+    # 구독자가 있는 워커만 DART 확인을 시도하고(실제 확인은 한 워커), 새 이벤트를 구독자에게 전달
+    global _cursor
+    poll = None
+    while True:
+        try:
+            if _subscribers:
+                if poll is not None and poll.done() and not poll.cancelled() and poll.exception() is not None:
+                    print(f"경고: 신규 공시 확인 실패: {str(poll.exception())}")
+                if poll is None or poll.done():
+                    poll = asyncio.ensure_future(poll_once())
+                await _dispatch()
+            else:
+                _cursor = None
+        except Exception as e:
+            print(f"경고: 신규 공시 전달 실패: {str(e)}")
+        await asyncio.sleep(DISCLOSURE_FEED_TAIL_INTERVAL)
+
+
+def _sse(event: Dict[str, Any]) -> bytes:
+    return b"id: " + str(event["seq"]).encode() + b"\nevent: disclosure\ndata: " + serializer.dumps(event) + b"\n\n"
+
+
+async def iter_sse(subscriber: Subscriber, backlog: List[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    # SSE 전송: 놓친 이벤트 → 실시간 이벤트, 이벤트가 없으면 주기적으로 연결 유지 주석
+    yield b"retry: 3000\n\n"
+    for event in backlog:
+        subscriber.cursor = event["seq"]
+        yield _sse(event)
+    while True:
+        try:
+            event = await asyncio.wait_for(subscriber.queue.get(), timeout=DISCLOSURE_FEED_HEARTBEAT)
+        except asyncio.TimeoutError:
+            if subscriber.overflowed:
+                return
+            yield b": keepalive\n\n"
+            continue
+        if event["seq"] > subscriber.cursor:
+            subscriber.cursor = event["seq"]
+            yield _sse(event)
+        if subscriber.overflowed and subscriber.queue.empty():
+            return
+
+
+async def wait(subscriber: Subscriber, backlog: List[Dict[str, Any]], timeout: float) -> Dict[str, Any]:
+    # long-poll: 이벤트가 있으면 바로, 없으면 timeout까지 기다렸다가 응답 (다음 요청은 cursor부터)
+    events = list(backlog)
+    if not events:
+        try:
+            events.append(await asyncio.wait_for(subscriber.queue.get(), timeout=min(timeout, DISCLOSURE_FEED_MAX_WAIT)))
+        except asyncio.TimeoutError:
+            pass
+    while not subscriber.queue.empty():
+        events.append(subscriber.queue.get_nowait())
+    events = [event for event in events if event["seq"] > subscriber.cursor]
+    cursor = max([subscriber.cursor, _cursor or 0] + [event["seq"] for event in events])
+    return {"status": "success", "cursor": cursor, "data": events}
+
+
+def stats() -> Dict[str, Any]:
+    conn = _connection()
+    count, live = conn.execute("SELECT COUNT(*), COALESCE(SUM(live), 0) FROM events").fetchone()
+    state = poll_state()
+    return {
+        "path": DISCLOSURE_FEED_PATH,
+        "enabled": DISCLOSURE_FEED_ENABLED,
+        "poll_interval": DISCLOSURE_FEED_POLL_INTERVAL,
+        "events": count,
+        "live_events": live,
+        "latest_seq": latest_seq(),
+        "last_poll": state["last_poll"],
+        "pid": os.getpid(),
+        "subscribers": len(_subscribers),
+        "cursor": _cursor,
+        **_stats,
+    }
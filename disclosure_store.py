@@ -0,0 +1,287 @@
+import os
+import re
+import time
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple, Callable, Awaitable
+import pandas as pd
+
+import dart_client
+import singleflight
+import upstream
+
+# 워커 간 공유하는 로컬 공시 목록 저장소 (최근 기간을 날짜별로 동기화)
+DISCLOSURE_STORE_PATH = os.environ.get("DISCLOSURE_STORE_PATH", os.path.join("data", "disclosures.sqlite"))
+DISCLOSURE_STORE_ENABLED = os.environ.get("DISCLOSURE_STORE_ENABLED", "true").lower() != "false"
+DISCLOSURE_SYNC_INTERVAL = int(os.environ.get("DISCLOSURE_SYNC_INTERVAL", "600"))  # 동기화 주기 (초)
+DISCLOSURE_SYNC_DAYS = int(os.environ.get("DISCLOSURE_SYNC_DAYS", "90"))  # 저장소에 유지하는 기간 (일)
+DISCLOSURE_SYNC_BACKFILL = int(os.environ.get("DISCLOSURE_SYNC_BACKFILL", "5"))  # 1회 동기화에서 채우는 과거 날짜 수
+
+KST = timezone(timedelta(hours=9))
+
+# 공시 유형 (목록 API 결과에는 유형이 없으므로 유형별로 나누어 받아 기록)
+KINDS = "ABCDEFGHIJ"
+COLUMNS = ["corp_code", "corp_name", "stock_code", "corp_cls", "report_nm", "rcept_no", "flr_nm", "rcept_dt", "rm"]
+
+# 정정 보고서 제목 접두어 (예: "[기재정정]사업보고서 (2023.12)")
+_AMENDMENT_PREFIX = re.compile(r"^\s*(?:\[[^\]]*\]\s*)+")
+
+_local = threading.local()
+
+
+def _connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        directory = os.path.dirname(DISCLOSURE_STORE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(DISCLOSURE_STORE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS disclosures ("
+            " rcept_no TEXT PRIMARY KEY, rcept_dt TEXT NOT NULL, corp_code TEXT, corp_name TEXT, stock_code TEXT,"
+            " corp_cls TEXT, report_nm TEXT, base_nm TEXT, flr_nm TEXT, rm TEXT, kind TEXT, final INTEGER NOT NULL DEFAULT 1)"
+        )
+        # 접수일자 순 정렬 + 고유번호·종목코드·공시유형 보조 색인
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_disclosures_rcept_dt ON disclosures (rcept_dt, rcept_no)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_disclosures_corp_code ON disclosures (corp_code, rcept_dt)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_disclosures_stock_code ON disclosures (stock_code, rcept_dt)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_disclosures_kind ON disclosures (kind, rcept_dt)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS synced_days ("
+            " day TEXT PRIMARY KEY, synced_at REAL NOT NULL, complete INTEGER NOT NULL, rows INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.commit()
+        _local.conn = conn
+    return conn
+
+
+def today() -> str:
+    return datetime.now(KST).strftime("%Y%m%d")
+
+
+def normalize_date(value: Optional[str]) -> Optional[str]:
+    # "2024-01-02", "20240102" 등을 YYYYMMDD로 변환
+    if not value:
+        return None
+    return pd.to_datetime(value).strftime("%Y%m%d")
+
+
+def _shift(day: str, days: int) -> str:
+    return (datetime.strptime(day, "%Y%m%d") + timedelta(days=days)).strftime("%Y%m%d")
+
+
+def ingest(day: str, frames: Dict[str, pd.DataFrame], synced_at: float) -> int:
+    # 하루치 공시 목록 저장 (유형별 결과), 정정 보고서가 있으면 같은 회사의 이전 보고서를 최종본에서 제외
+    rows = []
+    for kind, frame in frames.items():
+        if frame is None or frame.empty:
+            continue
+        frame = frame.reindex(columns=COLUMNS).fillna("")
+        for record in frame.itertuples(index=False):
+            report_nm = str(record.report_nm)
+            rows.append((
+                str(record.rcept_no), str(record.rcept_dt).replace("-", ""), str(record.corp_code),
+                str(record.corp_name), str(record.stock_code).strip(), str(record.corp_cls), report_nm,
+                _AMENDMENT_PREFIX.sub("", report_nm).strip(), str(record.flr_nm), str(record.rm), kind,
+            ))
+
+    conn = _connection()
+    conn.executemany(
+        "INSERT INTO disclosures (rcept_no, rcept_dt, corp_code, corp_name, stock_code, corp_cls, report_nm, base_nm,"
+        " flr_nm, rm, kind) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT (rcept_no) DO UPDATE SET rcept_dt = excluded.rcept_dt, corp_name = excluded.corp_name,"
+        " stock_code = excluded.stock_code, corp_cls = excluded.corp_cls, report_nm = excluded.report_nm,"
+        " base_nm = excluded.base_nm, flr_nm = excluded.flr_nm, rm = excluded.rm, kind = excluded.kind",
+        rows,
+    )
+    # 최종본 여부는 들어온 순서와 관계없이 다시 계산 (과거 날짜를 최근 순으로 채우므로 정정 보고서가 원본보다 먼저 저장될 수 있음)
+    # 같은 회사·같은 제목의 더 나중 정정 보고서가 있으면 최종본이 아님
+    conn.executemany(
+        "UPDATE disclosures SET final = NOT EXISTS (SELECT 1 FROM disclosures AS later"
+        " WHERE later.corp_code = disclosures.corp_code AND later.base_nm = disclosures.base_nm"
+        " AND later.report_nm != later.base_nm AND later.rcept_no > disclosures.rcept_no)"
+        " WHERE corp_code = ? AND base_nm = ?",
+        {(row[2], row[7]) for row in rows},
+    )
+    # 날짜가 지난 뒤 동기화한 날은 더 이상 공시가 추가되지 않으므로 완료로 기록
+    complete = day < datetime.fromtimestamp(synced_at, KST).strftime("%Y%m%d")
+    conn.execute("INSERT OR REPLACE INTO synced_days (day, synced_at, complete, rows) VALUES (?, ?, ?, ?)",
+                 (day, synced_at, int(complete), len(rows)))
+    conn.commit()
+    return len(rows)
+
+
+def days_to_sync() -> List[str]:
+    # 오늘, 아직 완료되지 않은 최근 날짜, 보관 기간 중 비어 있는 과거 날짜(최근 순으로 일부)
+    current = today()
+    window_start = _shift(current, -DISCLOSURE_SYNC_DAYS + 1)
+    complete = {day for (day,) in _connection().execute(
+        "SELECT day FROM synced_days WHERE complete = 1 AND day >= ?", (window_start,)).fetchall()}
+    days = [current]
+    backfill = 0
+    day = _shift(current, -1)
+    while day >= window_start:
+        if day not in complete:
+            if backfill >= DISCLOSURE_SYNC_BACKFILL:
+                break
+            days.append(day)
+            backfill += 1
+        day = _shift(day, -1)
+    return days
+
+
+def prune() -> int:
+    # 보관 기간이 지난 공시 삭제
+    window_start = _shift(today(), -DISCLOSURE_SYNC_DAYS + 1)
+    conn = _connection()
+    removed = conn.execute("DELETE FROM disclosures WHERE rcept_dt < ?", (window_start,)).rowcount
+    conn.execute("DELETE FROM synced_days WHERE day < ?", (window_start,))
+    conn.commit()
+    return removed
+
+
+def coverage(start: str, end: str) -> Optional[Tuple[Tuple[str, str], List[Tuple[str, str]]]]:
+    # 요청 기간 중 저장소로 응답할 수 있는 연속 구간과 DART에서 받아야 할 나머지 구간
+    # 완료된 날짜가 없거나 중간에 빈 날짜가 있으면 None (전체를 DART에서 조회)
+    days = [day for (day,) in _connection().execute(
+        "SELECT day FROM synced_days WHERE complete = 1 AND day BETWEEN ? AND ? ORDER BY day", (start, end)).fetchall()]
+    if not days:
+        return None
+    first, last = days[0], days[-1]
+    span = (datetime.strptime(last, "%Y%m%d") - datetime.strptime(first, "%Y%m%d")).days + 1
+    if span != len(days):
+        return None
+    missing = []
+    if start < first:
+        missing.append((start, _shift(first, -1)))
+    if last < end:
+        missing.append((_shift(last, 1), end))
+    return (first, last), missing
+
+
+def query(start: str, end: str, corp_code: Optional[str] = None, stock_code: Optional[str] = None,
+          kind: Optional[str] = None, final: bool = True) -> pd.DataFrame:
+    # 접수일자 범위 검색 (최근 접수 순), 조건이 있으면 해당 보조 색인 사용
+    sql = f"SELECT {', '.join(COLUMNS)} FROM disclosures WHERE rcept_dt BETWEEN ? AND ?"
+    params: List[Any] = [start, end]
+    if corp_code:
+        sql += " AND corp_code = ?"
+        params.append(corp_code)
+    if stock_code:
+        sql += " AND stock_code = ?"
+        params.append(stock_code)
+    if kind:
+        sql += " AND kind = ?"
+        params.append(kind)
+    if final:
+        sql += " AND final = 1"
+    sql += " ORDER BY rcept_no DESC"
+    return pd.DataFrame(_connection().execute(sql, params).fetchall(), columns=COLUMNS)
+
+
+def lookup(rcept_nos: List[str]) -> Dict[str, Dict[str, Any]]:
+    # 접수번호별 저장된 공시 (고유번호·종목코드·공시유형 보완용)
+    found = {}
+    for i in range(0, len(rcept_nos), 500):
+        chunk = list(rcept_nos[i:i + 500])
+        placeholders = ", ".join("?" * len(chunk))
+        for row in _connection().execute(
+                f"SELECT rcept_no, corp_code, stock_code, kind FROM disclosures WHERE rcept_no IN ({placeholders})",
+                chunk).fetchall():
+            found[row[0]] = {"corp_code": row[1], "stock_code": row[2], "kind": row[3]}
+    return found
+
+
+def corp_classes() -> Dict[str, str]:
+    # 고유번호별 법인구분 (Y: 유가증권, K: 코스닥, N: 코넥스, E: 기타), 최근 공시 기준
+    rows = _connection().execute(
+        "SELECT corp_code, corp_cls FROM disclosures WHERE corp_cls != '' ORDER BY rcept_no").fetchall()
+    return dict(rows)
+
+
+async def list_with_store(fetch_range: Callable[[Optional[str], Optional[str]], Awaitable[Any]],
+                          start: Optional[str], end: Optional[str], corp_code: Optional[str] = None,
+                          stock_code: Optional[str] = None, kind: Optional[str] = None,
+                          final: bool = True, local: bool = True) -> pd.DataFrame:
+    # 공시 목록 조회: 동기화된 기간은 저장소에서 범위 검색, 나머지 기간(주로 당일)만 fetch_range로 DART 조회
+    # fetch_range(start, end): 해당 기간의 DART 조회 (None이면 호출자가 받은 값 그대로)
+    plan = None
+    if DISCLOSURE_STORE_ENABLED and local:
+        plan = await upstream.call("disclosure_store", coverage,
+                                   normalize_date(start) or "19000101", normalize_date(end) or today())
+    if plan is None:
+        result = await fetch_range(start, end)
+        return pd.DataFrame() if result is None else result
+
+    (local_start, local_end), missing = plan
+    frames = [await upstream.call("disclosure_store", query, local_start, local_end, corp_code, stock_code, kind, final)]
+    for missing_start, missing_end in missing:
+        try:
+            frames.append(await fetch_range(missing_start, missing_end))
+        except ValueError as e:
+            # 013: 조회된 데이터 없음 (나머지 기간에 공시가 없는 경우)
+            if not (e.args and isinstance(e.args[0], dict) and e.args[0].get("status") == "013"):
+                raise
+    frames = [frame for frame in frames if frame is not None and not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    merged = pd.concat(frames, ignore_index=True)
+    return merged.drop_duplicates("rcept_no").sort_values("rcept_no", ascending=False, ignore_index=True)
+
+
+async def sync_once() -> Dict[str, Any]:
+    # 한 워커만 동기화 (다른 워커가 실행 중이거나 주기 안에 실행했으면 건너뜀)
+    with singleflight.exclusive("disclosure_sync") as leader:
+        if not leader:
+            return {"status": "skipped"}
+        conn = _connection()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_sync'").fetchone()
+        if row is not None and time.time() - float(row[0]) < DISCLOSURE_SYNC_INTERVAL * 0.9:
+            return {"status": "skipped"}
+
+        dart = await dart_client.ensure_client()
+        synced = {}
+        for day in await upstream.call("disclosure_store", days_to_sync):
+            synced_at = time.time()
+            frames = {}
+            for kind in KINDS:
+                frames[kind] = await upstream.call("disclosure_sync", dart.list, None, start=day, end=day,
+                                                   kind=kind, final=False)
+            synced[day] = await upstream.call("disclosure_store", ingest, day, frames, synced_at)
+        await upstream.call("disclosure_store", prune)
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_sync', ?)", (str(time.time()),))
+        conn.commit()
+        return {"status": "success", "days": synced}
+
+
+async def sync_loop():
+    # 백그라운드 동기화 (실패해도 다음 주기에 다시 시도)
+    while True:
+        try:
+            await sync_once()
+        except Exception as e:
+            print(f"경고: 공시 목록 동기화 실패: {str(e)}")
+        await asyncio.sleep(DISCLOSURE_SYNC_INTERVAL)
+
+
+def stats() -> Dict[str, Any]:
+    conn = _connection()
+    rows, oldest, newest = conn.execute("SELECT COUNT(*), MIN(rcept_dt), MAX(rcept_dt) FROM disclosures").fetchone()
+    days, complete = conn.execute("SELECT COUNT(*), COALESCE(SUM(complete), 0) FROM synced_days").fetchone()
+    last_sync = conn.execute("SELECT value FROM meta WHERE key = 'last_sync'").fetchone()
+    return {
+        "path": DISCLOSURE_STORE_PATH,
+        "enabled": DISCLOSURE_STORE_ENABLED,
+        "rows": rows,
+        "oldest": oldest,
+        "newest": newest,
+        "synced_days": days,
+        "complete_days": complete,
+        "window_days": DISCLOSURE_SYNC_DAYS,
+        "last_sync": datetime.fromtimestamp(float(last_sync[0]), KST).isoformat() if last_sync else None,
+    }
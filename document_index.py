@@ -0,0 +1,189 @@
+import os
+import re
+import html
+from typing import Optional, List, Dict, Any, Tuple
+
+# 공시 원문 구간 조회 설정
+DOCUMENT_PAGE_SIZE = int(os.environ.get("DOCUMENT_PAGE_SIZE", "20000"))  # 기본 페이지 크기 (문자 수)
+DOCUMENT_MAX_PAGE_SIZE = int(os.environ.get("DOCUMENT_MAX_PAGE_SIZE", "200000"))
+
+# 구간 조회를 지원하는 쿼리 타입
+DOCUMENT_QUERY_TYPES = {"document", "retrieve"}
+
+# 줄을 바꾸는 공시 XML 태그
+_BLOCK_TAGS = {"P", "TITLE", "TABLE", "TR", "TBODY", "THEAD", "BR", "PGBRK", "COVER", "LIBRARY", "BODY", "SUMMARY"}
+_CELL_TAGS = {"TD", "TH", "TE", "TU"}
+_TOKEN = re.compile(r"<(/?)([A-Za-z][A-Za-z0-9\-]*)[^>]*>|<![^>]*>|<\?[^>]*\?>|([^<]+)")
+_SECTION = re.compile(r"SECTION-(\d+)$")
+_SPACES = re.compile(r"\s+")
+# 텍스트 원문의 목차 제목 (예: "I. 회사의 개요", "1. 회사의 개요")
+_TEXT_HEADING = re.compile(r"^[ \t]*((?:([IVX]+)|(\d+))\.[ \t]*\S[^\n]{0,80})$", re.MULTILINE)
+
+
+class DocumentIndex:
+    # 원문에서 한 번 추출한 텍스트와 목차(구간별 문자 위치)
+    def __init__(self, text: str, sections: List[Dict[str, Any]]):
+        self.text = text
+        self.sections = sections
+        self._pages: Dict[int, List[Tuple[int, int]]] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.text) * 2 + len(self.sections) * 200
+
+    def toc(self) -> List[Dict[str, Any]]:
+        return [{**section, "length": section["end"] - section["start"]} for section in self.sections]
+
+    def find_section(self, section: str) -> Optional[Dict[str, Any]]:
+        # 목차 번호(id)가 같거나 제목에 검색어가 포함된 첫 구간
+        query = _SPACES.sub("", section)
+        for item in self.sections:
+            if item["id"] == query:
+                return item
+        for item in self.sections:
+            if query and query in _SPACES.sub("", item["title"]):
+                return item
+        return None
+
+    def page_bounds(self, page_size: int) -> List[Tuple[int, int]]:
+        # page_size 이하로 나누되 가능하면 줄바꿈에서 자른다
+        if page_size not in self._pages:
+            bounds = []
+            start = 0
+            length = len(self.text)
+            while start < length:
+                end = min(start + page_size, length)
+                if end < length:
+                    newline = self.text.rfind("\n", start + page_size // 2, end)
+                    if newline != -1:
+                        end = newline + 1
+                bounds.append((start, end))
+                start = end
+            self._pages[page_size] = bounds or [(0, 0)]
+        return self._pages[page_size]
+
+
+def _close_sections(sections: List[Dict[str, Any]], level: int, position: int) -> None:
+    # 같은 수준 이상의 새 제목이 나오면 열려 있는 하위 구간을 닫는다
+    for item in reversed(sections):
+        if item["end"] is not None:
+            continue
+        if item["level"] >= level:
+            item["end"] = position
+
+
+def _from_xml(source: str) -> DocumentIndex:
+    # 공시 XML을 한 번 훑으며 텍스트를 추출하고 TITLE 위치로 목차를 만든다
+    # (DART 원문은 XML 형식이 깨진 경우가 많아 파서 대신 태그 단위로 처리)
+    parts: List[str] = []
+    length = 0
+    sections: List[Dict[str, Any]] = []
+    level = 1
+    title: Optional[List[str]] = None
+    last = "\n"
+
+    def emit(value: str) -> None:
+        nonlocal length, last
+        if not value or (value == "\n" and last == "\n"):
+            return
+        parts.append(value)
+        length += len(value)
+        last = value[-1]
+
+    for match in _TOKEN.finditer(source):
+        closing, tag, text = match.groups()
+        if text is not None:
+            text = _SPACES.sub(" ", html.unescape(text))
+            if text.strip():
+                emit(text.strip() if last in "\n\t" else text)
+                if title is not None:
+                    title.append(text)
+            continue
+        if tag is None:
+            continue
+        tag = tag.upper()
+        section = _SECTION.match(tag)
+        if section and not closing:
+            level = int(section.group(1))
+        elif section and closing:
+            level = max(1, int(section.group(1)) - 1)
+        if tag == "TITLE" and not closing:
+            emit("\n")
+            _close_sections(sections, level, length)
+            sections.append({"id": str(len(sections) + 1), "title": "", "level": level, "start": length, "end": None})
+            title = []
+        elif tag == "TITLE" and closing and title is not None:
+            sections[-1]["title"] = _SPACES.sub(" ", "".join(title)).strip()
+            title = None
+        if tag in _BLOCK_TAGS:
+            emit("\n")
+        elif tag in _CELL_TAGS and closing:
+            emit("\t")
+
+    text = "".join(parts)
+    _close_sections(sections, 0, len(text))
+    return DocumentIndex(text, sections)
+
+
+def _from_text(source: str) -> DocumentIndex:
+    # 추출된 텍스트 원문은 로마 숫자(1단계)·아라비아 숫자(2단계) 제목으로 목차를 만든다
+    sections: List[Dict[str, Any]] = []
+    for match in _TEXT_HEADING.finditer(source):
+        level = 1 if match.group(2) else 2
+        _close_sections(sections, level, match.start(1))
+        sections.append({"id": str(len(sections) + 1), "title": match.group(1).strip(), "level": level,
+                         "start": match.start(1), "end": None})
+    _close_sections(sections, 0, len(source))
+    return DocumentIndex(source, sections)
+
+
+def build(source: str) -> DocumentIndex:
+    if "<TITLE" in source or "<title" in source:
+        return _from_xml(source)
+    return _from_text(source)
+
+
+def view(index: DocumentIndex, toc: bool = False, section: Optional[str] = None,
+         char_start: Optional[int] = None, char_end: Optional[int] = None,
+         page: Optional[int] = None, page_size: Optional[int] = None) -> Dict[str, Any]:
+    # 요청한 구간만 담은 응답 (목차 / 목차 구간 / 문자 범위 / 페이지)
+    # 구간을 찾지 못하면 LookupError, 잘못된 범위는 ValueError
+    if toc:
+        return {"status": "success", "length": len(index.text), "sections": index.toc()}
+
+    text = index.text
+    base = 0
+    result: Dict[str, Any] = {"status": "success"}
+    if section is not None:
+        item = index.find_section(section)
+        if item is None:
+            raise LookupError(section)
+        base = item["start"]
+        text = index.text[item["start"]:item["end"]]
+        result["section"] = {**item, "length": item["end"] - item["start"]}
+
+    if char_start is not None or char_end is not None:
+        start = char_start or 0
+        end = len(text) if char_end is None else min(char_end, len(text))
+        if start < 0 or end < start:
+            raise ValueError("char_start/char_end")
+        result["range"] = {"start": base + start, "end": base + end, "length": len(text)}
+        text = text[start:end]
+
+    if page is not None or page_size is not None:
+        page = 1 if page is None else page
+        page_size = DOCUMENT_PAGE_SIZE if page_size is None else page_size
+        if page < 1 or page_size < 1 or page_size > DOCUMENT_MAX_PAGE_SIZE:
+            raise ValueError("page/page_size")
+        if section is None and char_start is None and char_end is None:
+            bounds = index.page_bounds(page_size)
+        else:
+            bounds = DocumentIndex(text, []).page_bounds(page_size)
+        if page > len(bounds):
+            raise ValueError("page")
+        start, end = bounds[page - 1]
+        result["page"] = {"page": page, "page_size": page_size, "total_pages": len(bounds)}
+        text = text[start:end]
+
+    result["data"] = text
+    return result
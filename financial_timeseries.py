@@ -0,0 +1,144 @@
+import os
+import asyncio
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Callable, Awaitable, Tuple
+import pandas as pd
+
+# 재무 시계열 조회 설정
+FINANCIAL_TIMESERIES_MAX_YEARS = int(os.environ.get("FINANCIAL_TIMESERIES_MAX_YEARS", "10"))
+
+# 보고서 코드 → (분기 번호, 보고서 기준 기간 표기) (사업연도 안에서의 순서)
+REPORT_CODES = {
+    "11013": (1, "Q1"),  # 1분기보고서
+    "11012": (2, "H1"),  # 반기보고서
+    "11014": (3, "Q3"),  # 3분기보고서
+    "11011": (4, "FY"),  # 사업보고서
+}
+
+# 기간 합계로 보고되는 손익 계열 재무제표 (재무상태표는 시점 잔액)
+FLOW_STATEMENTS = {"IS", "CIS"}
+
+
+def parse_years(start_year: Optional[str], end_year: Optional[str], bsns_year: Optional[str]) -> List[str]:
+    # 시작·종료 사업연도 (하나만 지정하면 그 해만, 둘 다 없으면 bsns_year), 잘못된 범위는 ValueError
+    start = start_year or bsns_year or end_year
+    end = end_year or bsns_year or start_year
+    if not start or not end:
+        raise ValueError("start_year/end_year")
+    start, end = int(start), int(end)
+    if start > end or end > datetime.now().year or end - start + 1 > FINANCIAL_TIMESERIES_MAX_YEARS:
+        raise ValueError("start_year/end_year")
+    return [str(year) for year in range(start, end + 1)]
+
+
+def parse_reprt_codes(reprt_codes: Optional[str]) -> List[str]:
+    # 콤마 구분 보고서 코드 (기본값: 네 보고서 모두), 사업연도 안의 순서로 정렬
+    if not reprt_codes:
+        return list(REPORT_CODES)
+    codes = {code.strip() for code in reprt_codes.split(",") if code.strip()}
+    if not codes or not codes <= set(REPORT_CODES):
+        raise ValueError("reprt_codes")
+    return sorted(codes, key=lambda code: REPORT_CODES[code][0])
+
+
+def parse_amounts(values: pd.Series) -> pd.Series:
+    # "1,234,000" / "-" / "" → 숫자 (변환할 수 없으면 NaN)
+    return pd.to_numeric(values.astype(str).str.replace(",", "", regex=False).str.strip(), errors="coerce")
+
+
+def _prepare(frames: Dict[Tuple[str, str], pd.DataFrame], fs_div: Optional[str]) -> pd.DataFrame:
+    # 기간별 결과를 하나로 합치고 개별/연결 구분 선택 (지정하지 않으면 기간마다 연결 우선)
+    parts = []
+    for (year, code), frame in frames.items():
+        if frame is None or frame.empty or "account_nm" not in frame.columns:
+            continue
+        part = frame.reindex(columns=["account_nm", "fs_div", "sj_div", "ord", "thstrm_amount", "thstrm_add_amount"])
+        parts.append(part.assign(year=int(year), quarter=REPORT_CODES[code][0]))
+    if not parts:
+        return pd.DataFrame()
+
+    data = pd.concat(parts, ignore_index=True)
+    data["fs_div"] = data["fs_div"].fillna("").astype(str)
+    data["sj_div"] = data["sj_div"].fillna("").astype(str)
+    if fs_div:
+        data = data[data["fs_div"] == fs_div]
+    else:
+        has_cfs = data["fs_div"].eq("CFS").groupby([data["year"], data["quarter"]]).transform("any")
+        data = data[data["fs_div"].eq("CFS") | ~has_cfs]
+
+    data["amount"] = parse_amounts(data["thstrm_amount"])
+    # 분기·반기 보고서의 손익 항목은 누적금액(thstrm_add_amount)이 있으면 누적 기준으로 사용
+    cumulative = parse_amounts(data["thstrm_add_amount"])
+    data["cumulative"] = cumulative.where(cumulative.notna() & (data["quarter"] != 4), data["amount"])
+    data["ord"] = pd.to_numeric(data["ord"], errors="coerce")
+    return data
+
+
+def pivot(frames: Dict[Tuple[str, str], pd.DataFrame], fs_div: Optional[str] = None,
+          quarterly: bool = False) -> pd.DataFrame:
+    # 계정과목(account_nm) × 기간 표 (재무제표 구분(sj_div)별로 행 구분)
+    # quarterly: 손익 항목은 누적금액의 차이로 분기별 금액을 구하고, 재무상태표 항목은 분기말 잔액을 사용
+    data = _prepare(frames, fs_div)
+    if data.empty:
+        return pd.DataFrame(columns=["sj_div", "account_nm"])
+
+    index = ["sj_div", "account_nm"]
+    order = data.groupby(index, sort=False)["ord"].min()
+    if quarterly:
+        flow = data["sj_div"].isin(FLOW_STATEMENTS)
+        cumulative = data[flow].pivot_table(index=index, columns=["year", "quarter"], values="cumulative", aggfunc="first")
+        if not cumulative.empty:
+            # 같은 사업연도의 이전 분기 누적금액과의 차이 (1분기는 누적금액 그대로)
+            cumulative = cumulative.T.reindex(
+                pd.MultiIndex.from_product([sorted(data["year"].unique()), [1, 2, 3, 4]], names=["year", "quarter"])).T
+            previous = cumulative.T.groupby(level="year").shift(1).T
+            first = cumulative.columns.get_level_values("quarter") == 1
+            previous.loc[:, first] = 0
+            values = cumulative - previous
+        else:
+            values = cumulative
+        balances = data[~flow].pivot_table(index=index, columns=["year", "quarter"], values="amount", aggfunc="first")
+        table = pd.concat([values, balances])
+        labels = {column: f"{column[0]}Q{column[1]}" for column in table.columns}
+    else:
+        table = data.pivot_table(index=index, columns=["year", "quarter"], values="amount", aggfunc="first")
+        names = {number: name for number, name in REPORT_CODES.values()}
+        labels = {column: f"{column[0]}{names[column[1]]}" for column in table.columns}
+
+    # 실제로 조회된 기간만, 사업연도·분기 순서로
+    periods = set(zip(data["year"], data["quarter"]))
+    columns = sorted(column for column in table.columns if column in periods)
+    table = table.reindex(columns=columns).dropna(how="all")
+    table = table.loc[order.reindex(table.index).sort_values(kind="stable").index]
+    table.columns = [labels[column] for column in columns]
+    return table.reset_index()
+
+
+async def fetch(fetch_period: Callable[[str, str], Awaitable[pd.DataFrame]], years: List[str], reprt_codes: List[str],
+                fs_div: Optional[str] = None, quarterly: bool = False) -> Dict[str, Any]:
+    # 사업연도 × 보고서 코드별 재무제표를 동시에 조회(fetch_period, 기간별 캐시 사용)한 뒤 하나의 표로 변환
+    # 일부 기간이 실패해도 나머지 결과는 반환하고 실패한 기간을 failed_periods로 알린다
+    periods = [(year, code) for year in years for code in reprt_codes]
+    results = await asyncio.gather(*(fetch_period(year, code) for year, code in periods), return_exceptions=True)
+
+    frames = {}
+    failed_periods = []
+    errors = []
+    for (year, code), result in zip(periods, results):
+        if isinstance(result, BaseException):
+            failed_periods.append({"bsns_year": year, "reprt_code": code, "error": str(getattr(result, "detail", result))})
+            errors.append(result)
+            continue
+        frames[(year, code)] = result
+
+    if errors and not frames:
+        # 모든 기간이 실패하면 원래 예외를 그대로 전달
+        raise errors[0]
+
+    payload = {
+        "status": "partial" if failed_periods else "success",
+        "data": pivot(frames, fs_div, quarterly),
+    }
+    if failed_periods:
+        payload["failed_periods"] = failed_periods
+    return payload
@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import time
+import asyncio
+from typing import Optional, List, Dict, Any, Tuple
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow가 없으면 pickle 파일로 저장 (메모리 매핑 없이 읽음)
+    pq = None
+
+import dart_client
+import disclosure_store
+import financial_timeseries
+import multi_financial
+import singleflight
+import upstream
+
+# 상장사 전체 주요 재무정보 저장소 (사업연도·보고서 코드별 파일, 조회 시 DART를 호출하지 않음)
+FINANCIAL_WAREHOUSE_DIR = os.environ.get("FINANCIAL_WAREHOUSE_DIR", os.path.join("data", "warehouse"))
+FINANCIAL_WAREHOUSE_MAX_ROWS = int(os.environ.get("FINANCIAL_WAREHOUSE_MAX_ROWS", "1000"))  # 스크리닝 응답 행 수 상한
+
+# 다중회사 주요계정 API 계정과목 → 컬럼명
+ACCOUNTS = {
+    "유동자산": "current_assets",
+    "비유동자산": "non_current_assets",
+    "자산총계": "total_assets",
+    "유동부채": "current_liabilities",
+    "비유동부채": "non_current_liabilities",
+    "부채총계": "total_liabilities",
+    "자본금": "capital_stock",
+    "이익잉여금": "retained_earnings",
+    "자본총계": "total_equity",
+    "매출액": "revenue",
+    "영업이익": "operating_income",
+    "법인세차감전순이익": "pretax_income",
+    "당기순이익": "net_income",
+}
+
+# 미리 계산하는 재무비율 (분자 / 분모 × 100, %)
+RATIOS = {
+    "operating_margin": ("operating_income", "revenue"),  # 영업이익률
+    "net_margin": ("net_income", "revenue"),  # 순이익률
+    "roe": ("net_income", "total_equity"),  # 자기자본이익률
+    "roa": ("net_income", "total_assets"),  # 총자산이익률
+    "debt_ratio": ("total_liabilities", "total_equity"),  # 부채비율
+    "current_ratio": ("current_assets", "current_liabilities"),  # 유동비율
+}
+
+IDENTITY_COLUMNS = ["corp_code", "corp_name", "stock_code", "corp_cls", "bsns_year", "reprt_code", "fs_div", "rcept_no"]
+NUMERIC_COLUMNS = list(ACCOUNTS.values()) + list(RATIOS)
+MARKETS = {"Y", "K", "N", "E"}
+
+# 스크리닝 조건 연산자 (NaN은 != 외에는 조건을 만족하지 않음)
+OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+# (경로, 수정 시각) → 읽어 둔 파일 (다른 워커가 파일을 교체하면 다시 읽음)
+_loaded: Dict[str, Tuple[float, pd.DataFrame]] = {}
+_status: Dict[str, Any] = {"running": None, "last": None}
+
+_ACCOUNT_NOISE = re.compile(r"\s+|\(손실\)")
+
+
+def partition_path(bsns_year: str, reprt_code: str) -> str:
+    extension = "parquet" if pq is not None else "pkl"
+    return os.path.join(FINANCIAL_WAREHOUSE_DIR, f"{bsns_year}_{reprt_code}.{extension}")
+
+
+def _companies_path() -> str:
+    return os.path.join(FINANCIAL_WAREHOUSE_DIR, "companies.json")
+
+
+def build_partition(data: pd.DataFrame, listed: pd.DataFrame, classes: Dict[str, str],
+                    bsns_year: str, reprt_code: str) -> pd.DataFrame:
+    # 다중회사 주요계정 결과(회사 × 계정 행)를 회사당 한 행으로 펼치고 재무비율 계산 (연결 우선, 없으면 개별)
+    columns = IDENTITY_COLUMNS + NUMERIC_COLUMNS
+    if data is None or data.empty or "account_nm" not in data.columns:
+        return pd.DataFrame(columns=columns)
+
+    data = data.reindex(columns=["corp_code", "fs_div", "account_nm", "thstrm_amount", "rcept_no"])
+    data["corp_code"] = data["corp_code"].astype(str).str.strip()
+    data["fs_div"] = data["fs_div"].fillna("").astype(str)
+    has_cfs = data["fs_div"].eq("CFS").groupby(data["corp_code"]).transform("any")
+    data = data[data["fs_div"].eq("CFS") | ~has_cfs]
+    data = data.assign(
+        account=data["account_nm"].astype(str).str.replace(_ACCOUNT_NOISE, "", regex=True).map(ACCOUNTS),
+        amount=financial_timeseries.parse_amounts(data["thstrm_amount"]),
+    ).dropna(subset=["account"])
+
+    wide = data.pivot_table(index="corp_code", columns="account", values="amount", aggfunc="first")
+    wide = wide.reindex(columns=list(ACCOUNTS.values()))
+    meta = data.groupby("corp_code").agg(fs_div=("fs_div", "first"), rcept_no=("rcept_no", "first"))
+    frame = listed.set_index("corp_code")[["corp_name", "stock_code"]].join(meta, how="inner").join(wide)
+
+    for name, (numerator, denominator) in RATIOS.items():
+        frame[name] = frame[numerator] / frame[denominator].where(frame[denominator] != 0) * 100
+    frame = frame.reset_index()
+    frame["corp_cls"] = frame["corp_code"].map(classes).fillna("")
+    frame["bsns_year"] = bsns_year
+    frame["reprt_code"] = reprt_code
+    return frame.reindex(columns=columns)
+
+
+def write_partition(frame: pd.DataFrame, bsns_year: str, reprt_code: str) -> str:
+    # 다른 워커가 읽는 도중의 파일을 바꾸지 않도록 임시 파일에 쓴 뒤 교체
+    os.makedirs(FINANCIAL_WAREHOUSE_DIR, exist_ok=True)
+    path = partition_path(bsns_year, reprt_code)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if pq is not None:
+        frame.to_parquet(tmp_path, index=False)
+    else:
+        frame.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load(bsns_year: str, reprt_code: str) -> Optional[pd.DataFrame]:
+    path = partition_path(bsns_year, reprt_code)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    if pq is not None:
+        frame = pq.read_table(path, memory_map=True).to_pandas()
+    else:
+        frame = pd.read_pickle(path)
+    _loaded[path] = (mtime, frame)
+    return frame
+
+
+def _load_classes() -> Dict[str, str]:
+    try:
+        with open(_companies_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_classes(classes: Dict[str, str]) -> None:
+    os.makedirs(FINANCIAL_WAREHOUSE_DIR, exist_ok=True)
+    tmp_path = f"{_companies_path()}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(classes, f)
+    os.replace(tmp_path, _companies_path())
+
+
+async def _corp_classes(dart, corp_codes: List[str]) -> Dict[str, str]:
+    # 법인구분: 이전에 확인한 값 → 로컬 공시 저장소 → 기업개황 조회(처음 한 번만) 순으로 확인
+    classes = await upstream.call("warehouse", _load_classes)
+    if disclosure_store.DISCLOSURE_STORE_ENABLED:
+        classes.update(await upstream.call("disclosure_store", disclosure_store.corp_classes))
+    missing = [code for code in corp_codes if not classes.get(code)]
+
+    async def lookup(code: str) -> Optional[str]:
+        try:
+            company = await upstream.call("warehouse_ingest", dart.company, code)
+        except Exception:
+            return None
+        return company.get("corp_cls") if isinstance(company, dict) else None
+
+    for code, corp_cls in zip(missing, await asyncio.gather(*(lookup(code) for code in missing))):
+        if corp_cls:
+            classes[code] = corp_cls
+    await upstream.call("warehouse", _save_classes, classes)
+    return classes
+
+
+def is_running() -> bool:
+    with singleflight.exclusive("financial_warehouse") as leader:
+        return not leader
+
+
+async def ingest(bsns_year: str, reprt_code: str) -> Dict[str, Any]:
+    # 상장사 전체의 다중회사 주요계정을 받아 저장소 파일로 저장 (한 번에 한 워커만 실행)
+    with singleflight.exclusive("financial_warehouse") as leader:
+        if not leader:
+            return {"status": "skipped"}
+        started = time.time()
+        _status["running"] = {"bsns_year": bsns_year, "reprt_code": reprt_code, "started_at": started}
+        try:
+            dart = await dart_client.ensure_client()
+            index = dart_client.get_index()
+            listed = index.listed()
+            corp_codes = listed["corp_code"].tolist()
+
+            result = await multi_financial.fetch(dart, corp_codes, bsns_year, reprt_code)
+            classes = await _corp_classes(dart, corp_codes)
+            frame = await upstream.call("warehouse", build_partition, result["data"], listed, classes, bsns_year, reprt_code)
+            path = await upstream.call("warehouse", write_partition, frame, bsns_year, reprt_code)
+            _status["last"] = {
+                "status": result["status"], "bsns_year": bsns_year, "reprt_code": reprt_code, "path": path,
+                "companies": len(frame), "failed_chunks": len(result.get("failed_chunks", [])),
+                "started_at": started, "elapsed": round(time.time() - started, 1),
+            }
+        except Exception as e:
+            _status["last"] = {"status": "error", "bsns_year": bsns_year, "reprt_code": reprt_code,
+                               "error": str(e), "started_at": started}
+            print(f"경고: 재무정보 저장소 적재 실패: {str(e)}")
+        finally:
+            _status["running"] = None
+        return _status["last"]
+
+
+def screen(frame: pd.DataFrame, markets: Optional[List[str]] = None, filters: Optional[List[Dict[str, Any]]] = None,
+           sort_by: Optional[str] = None, ascending: bool = False, limit: int = 100, offset: int = 0,
+           fields: Optional[List[str]] = None) -> Tuple[int, pd.DataFrame]:
+    # 컬럼 배열 단위 조건 평가 (조건을 만족하는 전체 건수, 요청한 구간의 행)
+    # 알 수 없는 컬럼·연산자는 ValueError
+    mask = np.ones(len(frame), dtype=bool)
+    if markets:
+        mask &= frame["corp_cls"].isin(markets).to_numpy()
+    for item in filters or []:
+        field, op, value = item["field"], item["op"], item["value"]
+        if field not in NUMERIC_COLUMNS:
+            raise ValueError(f"field: {field}")
+        if op not in OPERATORS:
+            raise ValueError(f"op: {op}")
+        with np.errstate(invalid="ignore"):
+            mask &= OPERATORS[op](frame[field].to_numpy(dtype=float), float(value))
+
+    result = frame[mask]
+    if sort_by:
+        if sort_by not in frame.columns:
+            raise ValueError(f"sort_by: {sort_by}")
+        result = result.sort_values(sort_by, ascending=ascending, na_position="last", kind="stable")
+    if fields:
+        unknown = [field for field in fields if field not in frame.columns]
+        if unknown:
+            raise ValueError(f"fields: {', '.join(unknown)}")
+        result = result[["corp_code", "corp_name"] + [field for field in fields if field not in ("corp_code", "corp_name")]]
+    return int(mask.sum()), result.iloc[offset:offset + limit].reset_index(drop=True)
+
+
+def stats() -> Dict[str, Any]:
+    partitions = []
+    if os.path.isdir(FINANCIAL_WAREHOUSE_DIR):
+        for name in sorted(os.listdir(FINANCIAL_WAREHOUSE_DIR)):
+            if name.endswith((".parquet", ".pkl")):
+                path = os.path.join(FINANCIAL_WAREHOUSE_DIR, name)
+                partitions.append({"name": name, "size": os.path.getsize(path), "modified_at": os.path.getmtime(path)})
+    return {
+        "path": FINANCIAL_WAREHOUSE_DIR,
+        "format": "parquet" if pq is not None else "pickle",
+        "partitions": partitions,
+        "running": _status["running"],
+        "last": _status["last"],
+    }
@@ -0,0 +1,123 @@
+import operator
+from typing import Optional, List, Dict, Any, Tuple
+import numpy as np
+import pandas as pd
+
+import financial_timeseries
+
+# DataFrame 결과의 컬럼 선택·행 조건·정렬·페이지 지정
+# where 예시: {"account_nm": ["매출액", "영업이익"], "sj_div": "IS", "thstrm_amount": {">": 1000000}}
+# - 값: 같음, 목록: 목록 중 하나, 객체: 연산자별 조건 (모두 만족)
+COMPARISONS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+OPERATORS = set(COMPARISONS) | {"==", "!=", "in", "not_in", "contains"}
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def parse(fields: Optional[str] = None, where: Optional[Dict[str, Any]] = None, sort: Optional[str] = None,
+          limit: Optional[int] = None, offset: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    # 요청 값 검증 (형식이 잘못되면 ValueError), 지정한 값이 없으면 None
+    if not fields and not where and not sort and limit is None and offset is None:
+        return None
+    conditions = []
+    for column, condition in (where or {}).items():
+        if isinstance(condition, dict):
+            for op, value in condition.items():
+                if op not in OPERATORS:
+                    raise ValueError(f"where.{column}: {op}")
+                if op in ("in", "not_in") and not isinstance(value, list):
+                    raise ValueError(f"where.{column}.{op}")
+                conditions.append((column, op, value))
+        elif isinstance(condition, list):
+            conditions.append((column, "in", condition))
+        else:
+            conditions.append((column, "==", condition))
+    if limit is not None and limit < 0:
+        raise ValueError("limit")
+    if offset is not None and offset < 0:
+        raise ValueError("offset")
+    # sort: "컬럼" 오름차순, "-컬럼" 내림차순 (콤마로 여러 개)
+    order = [(key[1:], False) if key.startswith("-") else (key, True) for key in _split(sort)]
+    return {"fields": _split(fields), "where": conditions, "sort": order, "limit": limit, "offset": offset or 0}
+
+
+def _numeric(column: pd.Series) -> pd.Series:
+    # 숫자 컬럼은 그대로, 문자열 금액("1,234")은 숫자로 변환 (변환할 수 없으면 NaN)
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+        return column
+    return financial_timeseries.parse_amounts(column)
+
+
+def _text(column: pd.Series) -> pd.Series:
+    return column.astype(object).where(column.notna(), "").astype(str).str.strip()
+
+
+def _mask(column: pd.Series, op: str, value: Any) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(column) and op not in ("contains", "in", "not_in"):
+        value = pd.to_datetime(str(value))
+        if op in COMPARISONS:
+            return COMPARISONS[op](column, value).to_numpy()
+        return (column == value).to_numpy() if op == "==" else (column != value).to_numpy()
+    if op in COMPARISONS:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            # 숫자가 아닌 값은 문자열 순서로 비교 (예: "2024-01-01")
+            return COMPARISONS[op](_text(column), str(value)).to_numpy()
+        return COMPARISONS[op](_numeric(column), number).fillna(False).to_numpy(dtype=bool)
+    if op == "contains":
+        return _text(column).str.contains(str(value), regex=False).to_numpy()
+    if op in ("in", "not_in"):
+        found = _text(column).isin([str(item) for item in value]).to_numpy()
+        return found if op == "in" else ~found
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        equal = (_numeric(column) == value).to_numpy()
+    else:
+        equal = (_text(column) == ("" if value is None else str(value))).to_numpy()
+    return equal if op == "==" else ~equal
+
+
+def _sort_key(column: pd.Series) -> pd.Series:
+    # 모든 값이 숫자(또는 빈 값)인 컬럼은 숫자 순, 그 외에는 문자열 순
+    if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_datetime64_any_dtype(column):
+        return column
+    numeric = financial_timeseries.parse_amounts(column)
+    text = _text(column)
+    if numeric.notna().sum() == (text != "").sum():
+        return numeric
+    return text
+
+
+def apply(df: pd.DataFrame, spec: Dict[str, Any]) -> Tuple[int, pd.DataFrame]:
+    # (조건을 만족하는 전체 행 수, 결과) 반환, 없는 컬럼은 KeyError (결과가 없는 빈 표는 그대로)
+    if df.shape[1] == 0:
+        return 0, df
+    columns = set(df.columns)
+    unknown = [name for name in spec["fields"] + [c for c, _, _ in spec["where"]] + [c for c, _ in spec["sort"]]
+               if name not in columns]
+    if unknown:
+        raise KeyError(", ".join(dict.fromkeys(unknown)))
+
+    if spec["where"]:
+        mask = np.ones(len(df), dtype=bool)
+        for column, op, value in spec["where"]:
+            mask &= _mask(df[column], op, value)
+        df = df[mask]
+    total = len(df)
+    if spec["sort"]:
+        df = df.sort_values([column for column, _ in spec["sort"]],
+                            ascending=[ascending for _, ascending in spec["sort"]],
+                            key=_sort_key, kind="stable", na_position="last")
+    if spec["offset"] or spec["limit"] is not None:
+        end = None if spec["limit"] is None else spec["offset"] + spec["limit"]
+        df = df.iloc[spec["offset"]:end]
+    if spec["fields"]:
+        df = df[spec["fields"]]
+    return total, df.reset_index(drop=True)
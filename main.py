@@ -1,11 +1,36 @@
 import os
-import json
+import sys
+import asyncio
+from contextlib import asynccontextmanager
 from typing import Optional, List, Dict, Any
-from fastapi import FastAPI, HTTPException, Query, Depends
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Query, Depends, Header, Request, Response
+from fastapi.responses import StreamingResponse, JSONResponse
+from pydantic import BaseModel, ValidationError
 import pandas as pd
 from io import BytesIO
 
+import admission
+import artifact_store
+import attachment_cache
+import circuit_breaker
+import compression
+import corp_index
+import dart_client
+import disclosure_feed
+import disclosure_store
+import document_index
+import financial_timeseries
+import financial_warehouse
+import frame_query
+import metrics
+import multi_financial
+import rate_limiter
+import response_cache
+import serializer
+import singleflight
+import upstream
+import warmup
+
 # API 설정 상수
 SWAGGER_HEADERS = {
     "title": "LINKBRICKS HORIZON-AI DART API",
@@ -18,13 +43,70 @@ SWAGGER_HEADERS = {
     },
 }
 
-app = FastAPI(**SWAGGER_HEADERS)
+# 워밍업 시 자주 조회되는 기업 응답을 미리 캐시 (WARMUP_PREFETCH_COMPANIES 설정 시)
+async def prefetch_company(company: str, query_type: str):
+    await cached_fetch(DartRequest(company=company, query_type=query_type, auth_key=REQUIRED_AUTH_KEY))
+
+# 기업 고유번호 스냅샷 갱신 여부 확인 주기 (초)
+CORP_CODE_CHECK_INTERVAL = int(os.environ.get("CORP_CODE_CHECK_INTERVAL", "600"))
+
+async def _corp_code_refresh_loop():
+    # 스냅샷이 갱신 주기를 넘기면 백그라운드에서 교체 (다른 워커가 갱신한 스냅샷 우선 사용)
+    while True:
+        await asyncio.sleep(CORP_CODE_CHECK_INTERVAL)
+        try:
+            await upstream.call("corp_codes", dart_client.refresh_corp_codes, False)
+        except Exception as e:
+            print(f"경고: 기업 고유번호 갱신 실패: {str(e)}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 워커 시작 시 DART 클라이언트와 기업 고유번호 테이블을 한 번만 준비
+    # 요청 수신을 막지 않도록 백그라운드에서 워밍업 (/healthz는 즉시 응답, /readyz는 워밍업 완료 후 200)
+    # 초기화에 실패하면 첫 요청 또는 갱신 주기에 재시도
+    warmup_task = asyncio.create_task(warmup.run(prefetch_company))
+    refresh_task = asyncio.create_task(_corp_code_refresh_loop())
+    # 공시 목록 동기화 (여러 워커 중 한 워커만 실제로 실행)
+    sync_task = asyncio.create_task(disclosure_store.sync_loop()) if disclosure_store.DISCLOSURE_STORE_ENABLED else None
+    # 신규 공시 피드 (구독자가 있을 때만 동작)
+    feed_task = asyncio.create_task(disclosure_feed.feed_loop()) if disclosure_feed.DISCLOSURE_FEED_ENABLED else None
+    # 요청 처리 지표를 워커별 파일로 기록 (/metrics에서 모든 워커 합산)
+    metrics_task = asyncio.create_task(metrics.flush_loop()) if metrics.METRICS_ENABLED else None
+    yield
+    refresh_task.cancel()
+    for task in (warmup_task, sync_task, feed_task, metrics_task):
+        if task is not None:
+            task.cancel()
+    upstream.shutdown()
+
+app = FastAPI(**SWAGGER_HEADERS, lifespan=lifespan)
+app.add_middleware(metrics.MetricsMiddleware)
+
+# DART를 지금 사용할 수 없음: 호출 한도 초과(429), 응답 오류·차단기 작동(503)은 재시도 시간과 함께 응답
+@app.exception_handler(circuit_breaker.UpstreamUnavailable)
+async def upstream_unavailable_handler(request, exc: circuit_breaker.UpstreamUnavailable):
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail},
+                        headers={"Retry-After": str(int(exc.retry_after) + 1)})
+
+# 클라이언트 연결이 끊겨 처리를 취소한 요청 (응답은 전달되지 않으며 지표·로그용 상태 코드 499)
+@app.exception_handler(admission.ClientDisconnected)
+async def client_disconnected_handler(request, exc: admission.ClientDisconnected):
+    return Response(status_code=499)
 
 # 환경변수에서 인증키 가져오기
 REQUIRED_AUTH_KEY = os.environ.get("REQUIRED_AUTH_KEY", "")
 if not REQUIRED_AUTH_KEY:
     print("경고: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다. API 인증이 작동하지 않을 수 있습니다.")
 
+# 지원하는 쿼리 타입 (그 외 값은 지표 레이블에 "unsupported"로 집계)
+QUERY_TYPES = {
+    "disclosure", "report", "company_info", "company", "company_code", "major_shareholder", "major_shareholder_exec",
+    "executive", "dividend", "capital", "report_content", "financial_timeseries", "section_financial", "full_financial",
+    "multi_financial", "report_key", "document", "retrieve", "sub_docs", "attach_docs", "attach_files", "download",
+    "disclosure_date", "disclosure_date_ex", "disclosure_ticker", "audit", "stock_suspension", "stock_change",
+    "biz_overview", "event", "regstate",
+}
+
 # 입력 모델 정의
 class DartRequest(BaseModel):
     company: str
@@ -53,62 +135,353 @@ class DartRequest(BaseModel):
     kind_detail: Optional[str] = None  # 공시 상세 유형
     final: Optional[bool] = None  # 최종보고서 여부
     extract_text: Optional[bool] = None  # 텍스트 추출 여부
+    stream: Optional[bool] = None  # 행 단위 NDJSON 스트리밍 응답 여부
+    orient: Optional[str] = None  # 데이터 형식 (records: 행 목록(기본값), columnar: 컬럼명 + 컬럼별 배열)
+    cache_control: Optional[str] = None  # 캐시 제어 (no-cache: 새로 조회 후 저장, no-store: 캐시 사용 안 함)
+    toc: Optional[bool] = None  # 공시 원문 목차만 조회 (document, retrieve)
+    section: Optional[str] = None  # 공시 원문 목차 구간 (목차 번호 또는 제목 일부)
+    char_start: Optional[int] = None  # 공시 원문 텍스트 시작 위치 (문자)
+    char_end: Optional[int] = None  # 공시 원문 텍스트 끝 위치 (문자, 미포함)
+    page: Optional[int] = None  # 공시 원문 텍스트 페이지 번호 (1부터)
+    page_size: Optional[int] = None  # 공시 원문 텍스트 페이지 크기 (문자 수)
+    start_year: Optional[str] = None  # 재무 시계열 시작 사업연도
+    end_year: Optional[str] = None  # 재무 시계열 종료 사업연도
+    reprt_codes: Optional[str] = None  # 재무 시계열 보고서 코드 (콤마로 구분, 기본값: 전체)
+    quarterly: Optional[bool] = None  # 재무 시계열 분기별 금액 변환 여부 (누적금액 차이)
+    fields: Optional[str] = None  # 응답 컬럼 (콤마로 구분, DataFrame 결과에 적용)
+    where: Optional[Dict[str, Any]] = None  # 행 조건 (예: {"account_nm": ["매출액", "영업이익"], "thstrm_amount": {">": 0}})
+    sort: Optional[str] = None  # 정렬 컬럼 (콤마로 구분, "-컬럼"은 내림차순)
+    limit: Optional[int] = None  # 최대 행 수
+    offset: Optional[int] = None  # 건너뛸 행 수
+    timeout: Optional[float] = None  # 처리 기한 (초, 없으면 X-Request-Timeout 헤더 또는 쿼리 타입별 기본값)
 
-# Pandas DataFrame을 JSON 변환 함수
-def convert_df_to_json(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    if df is None or df.empty:
-        return []
-    
-    # NaN 값 처리
-    df = df.fillna("")
-    
-    # 날짜 타입 처리
-    for col in df.columns:
-        if pd.api.types.is_datetime64_any_dtype(df[col]):
-            df[col] = df[col].dt.strftime('%Y-%m-%d')
-    
-    return json.loads(df.to_json(orient='records', force_ascii=False))
+# 일괄 조회 요청 모델 (requests 항목은 auth_key를 제외한 DartRequest 본문)
+class DartBatchRequest(BaseModel):
+    auth_key: str  # 사용자가 제공하는 인증키 (일괄 요청 전체에 1회 적용)
+    requests: List[Dict[str, Any]]  # 개별 조회 요청 목록
+    concurrency: Optional[int] = None  # 동시 실행 수 (최대 BATCH_MAX_CONCURRENCY)
+    stream: Optional[bool] = None  # 완료되는 순서대로 NDJSON 스트리밍 여부
+    orient: Optional[str] = None  # 데이터 형식 (records, columnar)
+    cache_control: Optional[str] = None  # 캐시 제어 (모든 항목에 적용)
+    timeout: Optional[float] = None  # 항목별 처리 기한 (초, 항목의 timeout이 우선)
+
+# 재무 스크리닝 조건 (field: 계정·재무비율 컬럼, op: >, >=, <, <=, ==, !=)
+class ScreenFilter(BaseModel):
+    field: str
+    op: str
+    value: float
+
+# 재무 스크리닝 요청 모델 (재무정보 저장소에서 조회, DART를 호출하지 않음)
+class ScreenRequest(BaseModel):
+    auth_key: str  # 사용자가 제공하는 인증키
+    bsns_year: str  # 사업연도
+    reprt_code: Optional[str] = None  # 보고서 코드 (기본값: 11011 사업보고서)
+    markets: Optional[str] = None  # 법인구분 (Y: 유가증권, K: 코스닥, N: 코넥스, E: 기타, 콤마로 구분)
+    filters: List[ScreenFilter] = []  # 조건 목록 (모두 만족하는 회사)
+    sort_by: Optional[str] = None  # 정렬 컬럼
+    ascending: Optional[bool] = None  # 오름차순 여부 (기본값: 내림차순)
+    limit: Optional[int] = None  # 최대 행 수 (기본값: 100)
+    offset: Optional[int] = None  # 건너뛸 행 수
+    fields: Optional[str] = None  # 응답 컬럼 (콤마로 구분, 기본값: 전체)
+    orient: Optional[str] = None  # 데이터 형식 (records, columnar)
+
+# 일괄 조회 설정
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", "500"))
+BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", "16"))
+BATCH_DEFAULT_CONCURRENCY = int(os.environ.get("BATCH_DEFAULT_CONCURRENCY", "8"))
+
+# 조회 결과 DataFrame 정리 (JSON 직렬화는 응답 시 serializer에서 컬럼 단위로 수행)
+def as_frame(df: Optional[pd.DataFrame]):
+    return pd.DataFrame() if df is None else df
+
+# 기업명/종목코드/고유번호를 단일 기업으로 확인 (로컬 인덱스 사용, 네트워크 호출 없음)
+def resolve_company(company: str) -> Dict[str, Any]:
+    try:
+        with metrics.phase("resolve"):
+            return dart_client.get_index().resolve(company)
+    except corp_index.AmbiguousCompanyError as e:
+        raise HTTPException(status_code=409, detail={
+            "message": f"'{company}'에 해당하는 기업이 여러 개입니다. corp_code를 지정하거나 후보 중 하나를 선택해주세요.",
+            "candidates": e.candidates,
+        })
+    except corp_index.CompanyNotFoundError:
+        raise HTTPException(status_code=404, detail=f"'{company}' 기업을 찾을 수 없습니다.")
+
+def resolve_corp_code(request: DartRequest) -> str:
+    # 사용자가 직접 corp_code를 제공한 경우 그대로 사용
+    if request.corp_code:
+        return request.corp_code
+    return resolve_company(request.company)["corp_code"]
 
 # API 상태 확인용 메인 라우트
 @app.get("/")
 async def root():
-    # OpenDartReader import는 가능한 늦게 수행
-    try:
-        import OpenDartReader
-        return {
-            "message": "LINKBRICKS HORIZON-AI DART API에 오신 것을 환영합니다", 
-            "status": "active",
-            "opendartreader_imported": True
-        }
-    except ImportError:
-        return {
-            "message": "LINKBRICKS HORIZON-AI DART API에 오신 것을 환영합니다", 
-            "status": "active",
-            "opendartreader_imported": False
-        }
+    # OpenDartReader import는 워밍업에서 수행 (여기서는 import 여부만 확인)
+    return {
+        "message": "LINKBRICKS HORIZON-AI DART API에 오신 것을 환영합니다", 
+        "status": "active",
+        "opendartreader_imported": "OpenDartReader" in sys.modules
+    }
+
+# 생존 확인 (프로세스가 요청을 처리할 수 있으면 항상 200, 외부 호출 없음)
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+# 준비 상태 확인 (워밍업이 끝나고 DART 클라이언트가 준비된 워커만 200, 아니면 503)
+@app.get("/readyz")
+async def readyz():
+    status = warmup.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
 
 # 통합 API 엔드포인트
 @app.post("/api/dart")
-async def query_dart(request: DartRequest):
+async def query_dart(request: DartRequest, raw_request: Request, cache_control: Optional[str] = Header(None),
+                     accept: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None),
+                     x_request_timeout: Optional[float] = Header(None)):
     # 인증키 확인
-    if not REQUIRED_AUTH_KEY:
-        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    with metrics.phase("auth"):
+        if not REQUIRED_AUTH_KEY:
+            raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+        
+        if request.auth_key != REQUIRED_AUTH_KEY:
+            raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    # 인증된 요청만 쿼리 타입별 지표에 포함 (지원하지 않는 쿼리 타입은 레이블이 늘어나지 않도록 하나로 집계)
+    metrics.begin(request.query_type if request.query_type in QUERY_TYPES else "unsupported")
+    # 처리 기한 (DART 호출 대기·실행과 HTTP 제한 시간에 적용)
+    admission.begin(request.query_type, request.timeout or x_request_timeout)
     
-    if request.auth_key != REQUIRED_AUTH_KEY:
-        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    orient = request.orient or "records"
+    if orient not in serializer.ORIENTS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 데이터 형식: {orient} (records, columnar 중 선택)")
+    
+    wants_document_view(request)
+    spec = frame_query_spec(request)
+    
+    # 캐시 제어 (요청 본문의 cache_control 우선, 없으면 Cache-Control 헤더)
+    directive = request.cache_control or cache_control or ""
+    # 동시 처리 요청이 많으면 바로 거절하고, 조회 중 클라이언트 연결이 끊기면 작업 취소
+    entry, cache_status, age = await admission.run(raw_request.receive, cached_fetch(request, directive))
+    headers = {"X-Cache": cache_status}
+    if age is not None:
+        headers["Age"] = str(int(age))
+    if cache_status == "STALE":
+        headers["Warning"] = '110 - "Response is Stale"'
     
+    # 공시 원문 구간 조회: 필요한 부분만 응답 (구간 응답 본문은 캐시하지 않음)
+    view = await document_view(request, entry)
+    payload = entry.payload if view is None else view
+    # 컬럼 선택·행 조건·정렬·페이지: 캐시된 원본 결과에서 잘라 응답
+    payload = await apply_frame_query(payload, spec)
+    metrics.rows(sum(len(value) for value in payload.values() if isinstance(value, pd.DataFrame)))
+    
+    # 스트리밍 모드: 행을 나누어 NDJSON으로 전송 (전체 본문을 한 번에 만들지 않음)
+    if request.stream or "application/x-ndjson" in (accept or ""):
+        return StreamingResponse(serializer.iter_ndjson(payload), media_type="application/x-ndjson", headers=headers)
+    
+    # 구간·컬럼 선택 응답 본문은 캐시하지 않음 (캐시 항목에는 원본 직렬화 결과만 보관)
+    if payload is not entry.payload:
+        with metrics.phase("serialize"):
+            body = serializer.render(payload, orient)
+        body = await encode_body(body, request.query_type, accept_encoding, headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    # DataFrame에서 응답 본문 바이트를 바로 생성 (캐시 항목에는 직렬화 결과도 함께 보관)
+    with metrics.phase("serialize"):
+        body, rendered = entry.body(orient)
+    added = len(body) if rendered else 0
+    # 압축 응답: 인코딩별 압축 결과도 캐시 항목에 보관하여 다시 압축하지 않음
+    headers["Vary"] = "Accept-Encoding"
+    encoding = compression.negotiate(accept_encoding, len(body))
+    if encoding is not None:
+        level = compression.level_for(request.query_type, encoding)
+        with metrics.phase("compress"):
+            body, encoded = await upstream.call("compression", entry.compressed, orient, encoding, level)
+        headers["Content-Encoding"] = encoding
+        if encoded:
+            added += len(body)
+    # 캐시 키는 기업명을 고유번호로 바꾼 요청 기준이므로 항목에 보관한 키 사용
+    if added and entry.key:
+        response_cache.cache.grow(entry.key, added)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# 캐시하지 않는 응답 본문 압축 (Accept-Encoding에 따라, 작은 본문은 그대로)
+async def encode_body(body: bytes, query_type: str, accept_encoding: Optional[str], headers: Dict[str, str]) -> bytes:
+    headers["Vary"] = "Accept-Encoding"
+    encoding = compression.negotiate(accept_encoding, len(body))
+    if encoding is None:
+        return body
+    headers["Content-Encoding"] = encoding
+    with metrics.phase("compress"):
+        return await upstream.call("compression", compression.compress, body, encoding, compression.level_for(query_type, encoding))
+
+# 메모리 캐시 → 디스크 저장소 → DART 순서로 조회
+# directive - no-store: 캐시를 읽지도 저장하지도 않음, no-cache: 새로 조회한 뒤 캐시 갱신
+# 만료 직후의 항목은 바로 응답하고 백그라운드에서 갱신하며, DART 장애 시에는 만료된 항목으로 대신 응답
+# 반환값: (캐시 항목, 캐시 상태(HIT/STORE/MISS/COALESCED/STALE/BYPASS), 캐시 경과 시간)
+async def cached_fetch(request: DartRequest, directive: str = ""):
+    directive = directive.lower()
+    request = await canonicalize(request)
+    params = request.model_dump()
+    ttl = response_cache.ttl_for(request.query_type, params)
+    if "no-store" in directive or ttl <= 0:
+        return response_cache.CachedResponse(await fetch_dart(request)), "BYPASS", None
+    
+    key = response_cache.cache_key(params)
+    if "no-cache" not in directive:
+        cached = response_cache.cache.get(key)
+        if cached is not None:
+            entry, age = cached
+            return entry, "HIT", age
+        stale = response_cache.cache.get_stale(key, response_cache.STALE_WHILE_REVALIDATE)
+        if stale is not None:
+            asyncio.ensure_future(revalidate(request, key, ttl))
+            entry, age = stale
+            return entry, "STALE", age
+    
+    # 같은 요청이 이미 진행 중이면 새로 조회하지 않고 그 결과를 함께 사용 (single-flight)
+    flight_key = key + (":no-cache" if "no-cache" in directive else "")
+    try:
+        (entry, cache_status), coalesced = await singleflight.do(
+            flight_key, lambda: load_or_fetch(request, key, ttl, directive))
+    except circuit_breaker.UpstreamUnavailable:
+        stale = response_cache.cache.get_stale(key, response_cache.STALE_IF_ERROR)
+        if stale is None:
+            raise
+        entry, age = stale
+        return entry, "STALE", age
+    return entry, "COALESCED" if coalesced else cache_status, None
+
+# 만료된 캐시 항목을 백그라운드에서 갱신 (같은 키의 요청과 single-flight로 합류)
+async def revalidate(request: DartRequest, key: str, ttl: int):
+    # 요청의 남은 기한 대신 새 기한으로 갱신 (백그라운드 작업이므로 과부하 차단은 적용하지 않음)
+    admission.begin(request.query_type, shed=False)
     try:
-        # 필요할 때만 OpenDartReader 가져오기
-        import OpenDartReader
+        await singleflight.do(key, lambda: load_or_fetch(request, key, ttl, ""))
+    except Exception as e:
+        print(f"경고: 캐시 갱신 실패: {str(e)}")
+
+def wants_document_view(request: DartRequest) -> bool:
+    view_fields = (request.toc, request.section, request.char_start, request.char_end, request.page, request.page_size)
+    if all(value is None for value in view_fields):
+        return False
+    if request.query_type not in document_index.DOCUMENT_QUERY_TYPES:
+        raise HTTPException(status_code=400, detail="목차·구간·페이지 조회는 document, retrieve 쿼리 타입에서만 지원합니다.")
+    return True
+
+def frame_query_spec(request: DartRequest) -> Optional[Dict[str, Any]]:
+    # 컬럼 선택·행 조건·정렬·페이지 지정 검증 (DART 조회 전에 형식 오류를 알림)
+    try:
+        return frame_query.parse(request.fields, request.where, request.sort, request.limit, request.offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"fields/where/sort/limit/offset 형식 오류: {str(e)} "
+                                                    f"(where 연산자: {', '.join(sorted(frame_query.OPERATORS))})")
+
+# 캐시된 원본 결과에 컬럼 선택·행 조건·정렬·페이지 적용 (원본은 그대로 두고 새 응답을 만든다)
+async def apply_frame_query(payload: Dict[str, Any], spec: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if spec is None:
+        return payload
+    data = payload.get("data")
+    if not isinstance(data, pd.DataFrame):
+        raise HTTPException(status_code=400, detail="fields/where/sort/limit/offset은 표 형식(DataFrame) 결과에만 사용할 수 있습니다.")
+    try:
+        total, data = await upstream.call("frame_query", frame_query.apply, data, spec)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"결과에 없는 컬럼: {e.args[0]} (사용 가능한 컬럼: {', '.join(map(str, payload['data'].columns))})")
+    result = {**payload, "data": data}
+    if spec["limit"] is not None or spec["offset"]:
+        result["total"] = total
+    return result
+
+# 공시 원문 구간 조회 (목차·구간·문자 범위·페이지 지정 시)
+# 원문 텍스트 추출과 목차 생성은 캐시 항목당 한 번만 스레드 풀에서 실행하고 결과를 항목에 보관
+# 반환값: 구간 응답, 구간 지정이 없으면 None
+async def document_view(request: DartRequest, entry: response_cache.CachedResponse) -> Optional[Dict[str, Any]]:
+    if not wants_document_view(request):
+        return None
+    if not isinstance(entry.payload.get("data"), str):
+        raise HTTPException(status_code=400, detail="공시 원문 텍스트가 없어 구간 조회를 할 수 없습니다.")
+    
+    if entry.document is None:
+        index, _ = await singleflight.do(
+            f"document_index:{entry.key}:{id(entry)}",
+            lambda: upstream.call("document_index", document_index.build, entry.payload["data"]))
+        if entry.document is None:
+            entry.document = index
+            if entry.key:
+                response_cache.cache.grow(entry.key, index.size)
+    
+    try:
+        return document_index.view(entry.document, toc=bool(request.toc), section=request.section,
+                                   char_start=request.char_start, char_end=request.char_end,
+                                   page=request.page, page_size=request.page_size)
+    except LookupError:
+        raise HTTPException(status_code=404, detail=f"'{request.section}' 목차 구간을 찾을 수 없습니다.")
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"잘못된 구간 지정입니다. (page_size는 최대 {document_index.DOCUMENT_MAX_PAGE_SIZE}자)")
+
+# 고유번호 기준 쿼리는 기업명을 먼저 고유번호로 바꿔 같은 기업의 요청이 같은 캐시 키를 쓰도록 함
+async def canonicalize(request: DartRequest) -> DartRequest:
+    if request.query_type not in response_cache.CORP_CODE_QUERY_TYPES or request.corp_code:
+        return request
+    if not dart_client.is_ready():
+        try:
+            await upstream.call("corp_codes", dart_client.init_client)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"DART API 연결 실패: {str(e)}")
+    return request.model_copy(update={"corp_code": resolve_company(request.company)["corp_code"]})
+
+# 디스크 저장소 확인 후 DART 조회, 결과를 메모리 캐시와 디스크 저장소에 저장
+async def load_or_fetch(request: DartRequest, key: str, ttl: int, directive: str):
+    if not artifact_store.is_storable(request.query_type):
+        result = await fetch_dart(request)
+        return cache_response(key, result, ttl), "MISS"
+    
+    # 불변 문서·확정 재무제표는 워커 간 임대를 잡고 공유 디스크 저장소부터 확인
+    # (다른 워커가 같은 문서를 받는 중이었다면 기다린 뒤 그 결과를 사용)
+    async with singleflight.lease(key) as waited:
+        if "no-cache" not in directive or waited:
+            try:
+                result = await upstream.call("artifact_store", artifact_store.get, key)
+            except Exception as e:
+                print(f"경고: 디스크 저장소 조회 실패: {str(e)}")
+                result = None
+            if result is not None:
+                if waited:
+                    singleflight.count("lease_hits")
+                return cache_response(key, result, ttl), "STORE"
         
-        # DART API 키 가져오기 (환경 변수에서)
-        DART_API_KEY = os.environ.get("DART_API_KEY", "")
-        if not DART_API_KEY:
+        result = await fetch_dart(request)
+        entry = cache_response(key, result, ttl)
+        if not response_cache.is_empty(result):
+            try:
+                await upstream.call("artifact_store", artifact_store.put, key, request.query_type, result)
+            except Exception as e:
+                print(f"경고: 디스크 저장소 저장 실패: {str(e)}")
+        return entry, "MISS"
+
+# 응답 원본을 메모리 캐시에 저장 (직렬화 본문은 처음 응답할 때 만들어 크기에 추가)
+def cache_response(key: str, result: Dict[str, Any], ttl: int) -> response_cache.CachedResponse:
+    # 빈 결과나 일부만 성공한 결과는 짧게 캐시
+    if response_cache.is_empty(result) or result.get("status") == "partial":
+        ttl = min(ttl, response_cache.EMPTY_TTL)
+    entry = response_cache.CachedResponse(result)
+    entry.key = key
+    response_cache.cache.set(key, entry, ttl, response_cache.estimate_size(result))
+    return entry
+
+# 쿼리 타입별 DART 조회 (인증 및 캐시 처리 이후 실행)
+async def fetch_dart(request: DartRequest) -> Dict[str, Any]:
+    try:
+        # DART API 키 확인 (환경 변수에서)
+        if not dart_client.DART_API_KEY:
             raise HTTPException(status_code=500, detail="DART API 키가 설정되지 않았습니다. 환경 변수 DART_API_KEY를 설정해주세요.")
         
-        # 매 요청마다 새 클라이언트 인스턴스 생성
+        # 워커 시작 시 생성한 공유 클라이언트 사용
         try:
-            dart = OpenDartReader(DART_API_KEY)
+            dart = await dart_client.ensure_client()
+        except ImportError:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"DART API 연결 실패: {str(e)}")
             
@@ -117,180 +490,127 @@ async def query_dart(request: DartRequest):
             # 1. 기업 공시정보 조회
             final = request.final if request.final is not None else True
             
-            if request.start_date and request.end_date:
-                result = dart.list(request.company, start=request.start_date, end=request.end_date, 
-                                  kind=request.kind, kind_detail=request.kind_detail, final=final)
-            elif request.start_date:
-                result = dart.list(request.company, start=request.start_date, 
-                                  kind=request.kind, kind_detail=request.kind_detail, final=final)
-            else:
-                result = dart.list(request.company, 
+            # 로컬 공시 저장소에 동기화된 기간은 저장소에서, 나머지 기간만 DART에서 조회
+            # (상세 유형(kind_detail)은 저장소에 없으므로 DART에서 조회)
+            # 기업명은 한 번만 고유번호로 해석하고 DART 조회에도 같은 고유번호 사용 (OpenDartReader의 기업명 재검색 방지)
+            corp_code = resolve_company(request.company)["corp_code"] if request.company else None
+            
+            async def fetch_range(start, end):
+                return await upstream.call(request.query_type, dart.list, corp_code, start=start, end=end, 
                                   kind=request.kind, kind_detail=request.kind_detail, final=final)
             
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await disclosure_store.list_with_store(fetch_range, request.start_date, request.end_date, corp_code=corp_code,
+                                                            kind=request.kind, final=final, local=not request.kind_detail)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "report":
             # 2. 정기 최종 보고서 조회
-            if request.start_date and request.end_date:
-                result = dart.list(request.company, start=request.start_date, end=request.end_date, kind='A')
-            elif request.start_date:
-                result = dart.list(request.company, start=request.start_date, kind='A')
-            else:
-                result = dart.list(request.company, kind='A')
+            corp_code = resolve_company(request.company)["corp_code"] if request.company else None
+            
+            async def fetch_range(start, end):
+                return await upstream.call(request.query_type, dart.list, corp_code, start=start, end=end, kind='A')
             
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await disclosure_store.list_with_store(fetch_range, request.start_date, request.end_date,
+                                                            corp_code=corp_code, kind="A")
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "company_info":
             # 3. 기업 개황정보 조회
-            result = dart.company_by_name(request.company)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.company_by_name, request.company)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "company":
             # 3-2. 단일 기업 개황정보 조회
-            # 기업명/종목코드/고유번호 확인
+            # 기업명/종목코드/고유번호로 고유번호 찾기
+            corp_code = resolve_corp_code(request)
+            
             try:
-                if not request.corp_code:
-                    # 기업명이나 종목코드로 고유번호 찾기
-                    corp_code = dart.find_corp_code(request.company)
-                else:
-                    corp_code = request.corp_code
-                
-                result = dart.company(corp_code)
+                result = await upstream.call(request.query_type, dart.company, corp_code)
                 # 딕셔너리를 그대로 반환
                 return {"status": "success", "data": result}
+            except circuit_breaker.UpstreamUnavailable:
+                raise
             except Exception as e:
                 raise HTTPException(status_code=404, detail=f"기업 정보를 찾을 수 없습니다: {str(e)}")
             
         elif request.query_type == "report_content":
             # 4. 사업보고서 내용 조회
-            # 기업명으로 corp_code 자동 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                # 사용자가 직접 corp_code를 제공한 경우
-                corp_code = request.corp_code
+            # 기업명으로 corp_code 자동 조회 (사용자가 직접 corp_code를 제공한 경우 그대로 사용)
+            corp_code = resolve_corp_code(request)
                 
             if not request.bsns_year:
                 raise HTTPException(status_code=400, detail="사업보고서 조회에는 사업연도(bsns_year)가 필요합니다.")
             if not request.reprt_code:
                 raise HTTPException(status_code=400, detail="사업보고서 조회에는 보고서 코드(reprt_code)가 필요합니다. 예: 11011(사업보고서), 11012(반기보고서), 11013(1분기보고서), 11014(3분기보고서)")
             
-            result = dart.finstate(corp_code, request.bsns_year, request.reprt_code)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.finstate, corp_code, request.bsns_year, request.reprt_code)
+            return {"status": "success", "data": as_frame(result)}
+            
+        elif request.query_type == "financial_timeseries":
+            # 4-1. 재무 시계열 조회 (사업연도 × 보고서 코드별 report_content를 동시에 조회하여 계정과목 × 기간 표로 변환)
+            corp_code = resolve_corp_code(request)
+            try:
+                years = financial_timeseries.parse_years(request.start_year, request.end_year, request.bsns_year)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"재무 시계열 조회에는 시작·종료 사업연도(start_year, end_year)가 필요합니다. 최대 {financial_timeseries.FINANCIAL_TIMESERIES_MAX_YEARS}년까지 조회할 수 있습니다.")
+            try:
+                reprt_codes = financial_timeseries.parse_reprt_codes(request.reprt_codes)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="보고서 코드(reprt_codes)는 11011(사업보고서), 11012(반기보고서), 11013(1분기보고서), 11014(3분기보고서) 중에서 콤마로 구분하여 지정해주세요.")
+            
+            # 기간별 조회는 report_content와 같은 캐시·디스크 저장소를 사용 (이미 조회한 기간은 다시 조회하지 않음)
+            async def fetch_period(bsns_year, reprt_code):
+                entry, _, _ = await cached_fetch(DartRequest(company=request.company, query_type="report_content",
+                                                             auth_key=request.auth_key, corp_code=corp_code,
+                                                             bsns_year=bsns_year, reprt_code=reprt_code))
+                return entry.payload.get("data")
+            
+            return await financial_timeseries.fetch(fetch_period, years, reprt_codes, request.fs_div, bool(request.quarterly))
             
         elif request.query_type == "company_code":
             # 5. 기업 고유번호 조회
-            try:
-                result = dart.find_corp_code(request.company)
-                return {"status": "success", "company": request.company, "corp_code": result}
-            except Exception as e:
-                raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
+            company = resolve_company(request.company)
+            return {"status": "success", "company": request.company, "corp_code": company["corp_code"],
+                    "corp_name": company["corp_name"], "stock_code": company["stock_code"]}
             
         elif request.query_type == "major_shareholder":
             # 6. 대량보유 상황 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
+            corp_code = resolve_corp_code(request)
                 
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
-                
-            result = dart.major_shareholders(corp_code)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.major_shareholders, corp_code)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "major_shareholder_exec":
             # 6-2. 임원ㆍ주요주주 소유보고 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
+            corp_code = resolve_corp_code(request)
                 
-            result = dart.major_shareholders_exec(corp_code)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.major_shareholders_exec, corp_code)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "executive":
             # 7. 임원 현황 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
+            corp_code = resolve_corp_code(request)
                 
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
-                
-            result = dart.executive_all(corp_code)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.executive_all, corp_code)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "dividend":
             # 8. 배당 정보 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
+            corp_code = resolve_corp_code(request)
                 
-            result = dart.dividend(corp_code)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.dividend, corp_code)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "capital":
             # 9. 자본금 변동사항 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
+            corp_code = resolve_corp_code(request)
                 
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
-                
-            result = dart.capital(corp_code)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.capital, corp_code)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "section_financial":
             # 10. 재무제표 특정 항목만 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
+            corp_code = resolve_corp_code(request)
                 
             if not request.bsns_year:
                 raise HTTPException(status_code=400, detail="재무제표 항목 조회에는 사업연도(bsns_year)가 필요합니다.")
@@ -299,22 +619,12 @@ async def query_dart(request: DartRequest):
             fs_div = request.fs_div if request.fs_div else "CFS"  # 기본값: 연결재무제표
             
             # 섹션 재무제표 항목 조회
-            result = dart.finstate_all(corp_code, request.bsns_year, fs_div=fs_div)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.finstate_all, corp_code, request.bsns_year, fs_div=fs_div)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "full_financial":
             # 11. 전체 재무제표 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
+            corp_code = resolve_corp_code(request)
                 
             if not request.bsns_year:
                 raise HTTPException(status_code=400, detail="전체 재무제표 조회에는 사업연도(bsns_year)가 필요합니다.")
@@ -324,22 +634,12 @@ async def query_dart(request: DartRequest):
             # 개별/연결구분
             separate = request.separate if request.separate is not None else False  # 기본값: 연결재무제표
             
-            result = dart.xbrl(corp_code, request.bsns_year, request.reprt_code, separate=separate)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.xbrl, corp_code, request.bsns_year, request.reprt_code, separate=separate)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "report_key":
             # 12. 사업보고서 주요정보 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
+            corp_code = resolve_corp_code(request)
                 
             if not request.bsns_year:
                 raise HTTPException(status_code=400, detail="사업보고서 주요정보 조회에는 사업연도(bsns_year)가 필요합니다.")
@@ -350,23 +650,27 @@ async def query_dart(request: DartRequest):
             # reprt_code(보고서 코드)
             reprt_code = request.reprt_code if request.reprt_code else "11011"  # 기본값: 사업보고서
             
-            result = dart.report(corp_code, request.key_word, request.bsns_year, reprt_code=reprt_code)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.report, corp_code, request.key_word, request.bsns_year, reprt_code=reprt_code)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "disclosure_date":
             # 13. 특정 날짜의 공시 목록 조회
             if not request.date:
                 raise HTTPException(status_code=400, detail="특정 날짜의 공시 목록 조회에는 날짜(date)가 필요합니다. 형식: YYYYMMDD")
             
-            result = dart.list_date(request.date)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            # 동기화가 끝난 날짜는 로컬 공시 저장소에서 조회
+            async def fetch_range(start, end):
+                return await upstream.call(request.query_type, dart.list_date, request.date)
+            
+            result = await disclosure_store.list_with_store(fetch_range, request.date, request.date)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "disclosure_date_ex":
             # 14. 특정 날짜의 공시 목록 조회 (확장)
             date = request.date if request.date else None  # 기본값: 오늘
             
-            result = dart.list_date_ex(date)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.list_date_ex, date)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "disclosure_ticker":
             # 15. 특정 종목코드의 공시 목록 조회
@@ -374,37 +678,29 @@ async def query_dart(request: DartRequest):
             
             # ticker가 입력되지 않았다면 회사명으로 종목코드 또는 고유번호 찾기
             if not ticker:
-                try:
-                    # 회사명으로 회사 정보 조회 (상장 여부 확인)
-                    company_info = dart.company_by_name(request.company)
-                    if company_info is None or company_info.empty:
-                        raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                    
-                    # 종목코드 확인
-                    ticker = company_info.iloc[0]['stock_code'] if 'stock_code' in company_info.columns else None
+                # 로컬 인덱스에서 회사 정보 확인 (상장 여부 확인)
+                company = resolve_company(request.company)
+                ticker = company["stock_code"]
+                
+                # 종목코드가 없으면(비상장 기업) 고유번호로 list 함수 조회 (list_ticker 대신)
+                if not ticker:
+                    async def fetch_range(start, end):
+                        return await upstream.call(request.query_type, dart.list, company["corp_code"], start=start, end=end)
                     
-                    # 종목코드가 없거나 비어있으면(비상장 기업) 회사명이나 고유번호를 대신 사용
-                    if not ticker or ticker == "":
-                        # OpenDartReader의 list 함수에 회사명이나 고유번호를 직접 전달
-                        corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                        if not corp_code:
-                            raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 정보를 찾을 수 없습니다.")
-                        
-                        # 비상장 기업은 list 함수로 조회 (list_ticker 대신)
-                        start = request.start_date
-                        end = request.end_date
-                        result = dart.list(corp_code, start=start, end=end)
-                        return {"status": "success", "data": convert_df_to_json(result)}
-                except Exception as e:
-                    raise HTTPException(status_code=404, detail=f"기업 정보 조회 중 오류 발생: {str(e)}")
-            
-            # 종목코드가 있는 경우(상장 기업) list_ticker 함수 사용
-            start = request.start_date
-            end = request.end_date
+                    result = await disclosure_store.list_with_store(fetch_range, request.start_date, request.end_date,
+                                                                    corp_code=company["corp_code"])
+                    return {"status": "success", "data": as_frame(result)}
+            
+            # 종목코드가 있는 경우(상장 기업) list_ticker 함수 사용 (동기화된 기간은 로컬 공시 저장소에서 조회)
+            async def fetch_range(start, end):
+                return await upstream.call(request.query_type, dart.list_ticker, ticker, start=start, end=end)
             
             try:
-                result = dart.list_ticker(ticker, start=start, end=end)
-                return {"status": "success", "data": convert_df_to_json(result)}
+                result = await disclosure_store.list_with_store(fetch_range, request.start_date, request.end_date,
+                                                                stock_code=ticker)
+                return {"status": "success", "data": as_frame(result)}
+            except circuit_breaker.UpstreamUnavailable:
+                raise
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"공시 목록 조회 중 오류 발생: {str(e)}")
             
@@ -413,23 +709,29 @@ async def query_dart(request: DartRequest):
             if not request.rcept_no:
                 raise HTTPException(status_code=400, detail="첨부문서 목록 조회에는 접수번호(rcept_no)가 필요합니다.")
             
-            result = dart.sub_docs(request.rcept_no)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.sub_docs, request.rcept_no)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "attach_docs":
             # 17. 첨부 문서 리스트 조회
             if not request.rcept_no:
                 raise HTTPException(status_code=400, detail="첨부 문서 리스트 조회에는 접수번호(rcept_no)가 필요합니다.")
             
-            result = dart.attach_docs(request.rcept_no)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.attach_docs, request.rcept_no)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "attach_files":
             # 18. 첨부 파일 리스트 조회
             if not request.rcept_no:
                 raise HTTPException(status_code=400, detail="첨부 파일 리스트 조회에는 접수번호(rcept_no)가 필요합니다.")
             
-            result = dart.attach_files(request.rcept_no)
+            result = await upstream.call(request.query_type, dart.attach_files, request.rcept_no)
+            # OpenDartReader는 {파일명: URL} dict를 반환하므로 (file_name, url) 표로 바꾸고
+            # 파일별 프록시 다운로드 경로 추가 (/api/dart/file/{rcept_no}/{번호}, 번호는 proxy_attachment와 같은 목록 순서)
+            if isinstance(result, dict):
+                result = pd.DataFrame({"file_name": list(result.keys()), "url": list(result.values())})
+            if isinstance(result, pd.DataFrame) and not result.empty and {"file_name", "url"} <= set(result.columns):
+                result = result.assign(proxy_url=[f"/api/dart/file/{request.rcept_no}/{i}" for i in range(len(result))])
             return {"status": "success", "data": result}
             
         elif request.query_type == "download":
@@ -447,8 +749,10 @@ async def query_dart(request: DartRequest):
                 raise HTTPException(status_code=400, detail="공시서류 원문 조회에는 접수번호(rcept_no)가 필요합니다.")
             
             try:
-                result = dart.document(request.rcept_no)
+                result = await upstream.call(request.query_type, dart.document, request.rcept_no)
                 return {"status": "success", "data": result}
+            except circuit_breaker.UpstreamUnavailable:
+                raise
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"공시서류 원문 조회 중 오류 발생: {str(e)}")
                 
@@ -459,8 +763,10 @@ async def query_dart(request: DartRequest):
             
             try:
                 extract_text = request.extract_text if request.extract_text is not None else True
-                result = dart.retrieve(request.rcept_no, extract_text=extract_text)
+                result = await upstream.call(request.query_type, dart.retrieve, request.rcept_no, extract_text=extract_text)
                 return {"status": "success", "data": result}
+            except circuit_breaker.UpstreamUnavailable:
+                raise
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"공시 원문 텍스트 추출 중 오류 발생: {str(e)}")
             
@@ -469,7 +775,7 @@ async def query_dart(request: DartRequest):
             if not request.corp_codes:
                 raise HTTPException(status_code=400, detail="다중회사 재무제표 조회에는 여러 기업코드(corp_codes)가 필요합니다. 콤마로 구분된 문자열 형식으로 제공하세요.")
             
-            corp_codes = request.corp_codes.split(',')
+            corp_codes = multi_financial.parse_corp_codes(request.corp_codes)
             
             if not request.bsns_year:
                 raise HTTPException(status_code=400, detail="다중회사 재무제표 조회에는 사업연도(bsns_year)가 필요합니다.")
@@ -477,83 +783,37 @@ async def query_dart(request: DartRequest):
             if not request.reprt_code:
                 raise HTTPException(status_code=400, detail="다중회사 재무제표 조회에는 보고서 코드(reprt_code)가 필요합니다. 예: 11011(사업보고서), 11012(반기보고서), 11013(1분기보고서), 11014(3분기보고서)")
             
-            # 단일 계정과목 다중회사 조회 (finstate_sli_multi 함수)
-            if request.account_nm:
-                result = dart.finstate_sli_multi(corp_codes, request.bsns_year, request.reprt_code, request.account_nm)
-            # 다중회사 주요 재무제표 조회 (finstate_multi 함수) 
-            else:
-                result = dart.finstate_multi(corp_codes, request.bsns_year, request.reprt_code)
-            
-            return {"status": "success", "data": convert_df_to_json(result)}
+            # 기업코드 목록을 나누어 동시에 조회 후 병합 (account_nm이 있으면 단일 계정과목 조회)
+            return await multi_financial.fetch(dart, corp_codes, request.bsns_year, request.reprt_code, request.account_nm)
             
         elif request.query_type == "audit":
             # 23. 외부감사인 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
+            corp_code = resolve_corp_code(request)
                 
             if request.includes_exec:  # 전체 내역 조회
-                result = dart.audit_all(corp_code)
+                result = await upstream.call(request.query_type, dart.audit_all, corp_code)
             else:  # 기본 내역 조회
-                result = dart.audit(corp_code)
+                result = await upstream.call(request.query_type, dart.audit, corp_code)
                 
-            return {"status": "success", "data": convert_df_to_json(result)}
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "stock_suspension":
             # 24. 상장폐지 현황 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
+            corp_code = resolve_corp_code(request)
                 
-            result = dart.suspensions_changes(corp_code)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.suspensions_changes, corp_code)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "stock_change":
             # 25. 증자(감자) 현황 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
+            corp_code = resolve_corp_code(request)
                 
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
-                
-            result = dart.stock_total_amount(corp_code)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.stock_total_amount, corp_code)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "biz_overview":
             # 26. 사업의 내용 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
+            corp_code = resolve_corp_code(request)
                 
             if not request.bsns_year:
                 raise HTTPException(status_code=400, detail="사업의 내용 조회에는 사업연도(bsns_year)가 필요합니다.")
@@ -561,26 +821,16 @@ async def query_dart(request: DartRequest):
             # rpt_type(보고서 유형)
             rpt_type = request.rpt_type if request.rpt_type else "1"  # 기본값: 사업보고서
             
-            result = dart.report(corp_code, "business_content", request.bsns_year, reprt_code=request.reprt_code, rpt_type=rpt_type)
+            result = await upstream.call(request.query_type, dart.report, corp_code, "business_content", request.bsns_year, reprt_code=request.reprt_code, rpt_type=rpt_type)
             # HTML 형식의 결과 처리
             if isinstance(result, str):
                 return {"status": "success", "data": result}
             else:
-                return {"status": "success", "data": convert_df_to_json(result)}
+                return {"status": "success", "data": as_frame(result)}
                 
         elif request.query_type == "event":
             # 27. 주요사항보고서 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
+            corp_code = resolve_corp_code(request)
                 
             if not request.event_type:
                 raise HTTPException(status_code=400, detail="주요사항보고서 조회에는 이벤트 타입(event_type)이 필요합니다. 예: '부도발생', '영업정지', '회생절차', '유상증자' 등")
@@ -589,22 +839,12 @@ async def query_dart(request: DartRequest):
             start = request.start_date
             end = request.end_date
             
-            result = dart.event(corp_code, request.event_type, start=start, end=end)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.event, corp_code, request.event_type, start=start, end=end)
+            return {"status": "success", "data": as_frame(result)}
             
         elif request.query_type == "regstate":
             # 28. 증권신고서 조회
-            if not request.corp_code:
-                # 기업명으로 기업 코드 조회
-                company_info = dart.company_by_name(request.company)
-                if company_info is None or company_info.empty:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업을 찾을 수 없습니다.")
-                
-                corp_code = company_info.iloc[0]['corp_code'] if 'corp_code' in company_info.columns else None
-                if not corp_code:
-                    raise HTTPException(status_code=404, detail=f"'{request.company}' 기업의 코드를 찾을 수 없습니다.")
-            else:
-                corp_code = request.corp_code
+            corp_code = resolve_corp_code(request)
                 
             if not request.key_word:
                 raise HTTPException(status_code=400, detail="증권신고서 조회에는 키워드(key_word)가 필요합니다. 예: '주식의포괄적교환이전', '합병', '증권예탁증권', '채무증권', '지분증권', '분할'")
@@ -613,19 +853,105 @@ async def query_dart(request: DartRequest):
             start = request.start_date
             end = request.end_date
             
-            result = dart.regstate(corp_code, request.key_word, start=start, end=end)
-            return {"status": "success", "data": convert_df_to_json(result)}
+            result = await upstream.call(request.query_type, dart.regstate, corp_code, request.key_word, start=start, end=end)
+            return {"status": "success", "data": as_frame(result)}
             
         else:
             raise HTTPException(status_code=400, detail=f"지원하지 않는 쿼리 타입: {request.query_type}")
             
-    except HTTPException:
+    except (HTTPException, circuit_breaker.UpstreamUnavailable):
         raise
     except ImportError:
         raise HTTPException(status_code=500, detail="OpenDartReader 라이브러리를 불러올 수 없습니다.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 조회 중 오류 발생: {str(e)}")
 
+# 일괄 조회 API 엔드포인트
+@app.post("/api/dart/batch")
+async def query_dart_batch(batch: DartBatchRequest, raw_request: Request, cache_control: Optional[str] = Header(None),
+                           accept: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None),
+                           x_request_timeout: Optional[float] = Header(None)):
+    # 인증키 확인 (일괄 요청 전체에 1회)
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if batch.auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    metrics.begin("batch")
+    
+    if not batch.requests:
+        raise HTTPException(status_code=400, detail="일괄 조회에는 하나 이상의 요청(requests)이 필요합니다.")
+    if len(batch.requests) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"일괄 조회 요청은 최대 {BATCH_MAX_ITEMS}개까지 가능합니다.")
+    
+    orient = batch.orient or "records"
+    if orient not in serializer.ORIENTS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 데이터 형식: {orient} (records, columnar 중 선택)")
+    
+    directive = batch.cache_control or cache_control or ""
+    concurrency = max(1, min(batch.concurrency or BATCH_DEFAULT_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    # 같은 기업명은 한 번만 해석 (결과 또는 오류를 공유)
+    resolved: Dict[str, Any] = {}
+    
+    async def run_item(index: int, item: Dict[str, Any]) -> bytes:
+        try:
+            request = DartRequest(**{"company": "", **item, "auth_key": batch.auth_key})
+            wants_document_view(request)
+            spec = frame_query_spec(request)
+            if request.query_type in response_cache.CORP_CODE_QUERY_TYPES and not request.corp_code:
+                if request.company not in resolved:
+                    try:
+                        request = await canonicalize(request)
+                        resolved[request.company] = request.corp_code
+                    except HTTPException as e:
+                        resolved[request.company] = e
+                        raise
+                elif isinstance(resolved[request.company], HTTPException):
+                    raise resolved[request.company]
+                else:
+                    request = request.model_copy(update={"corp_code": resolved[request.company]})
+            async with semaphore:
+                # 항목별 처리 기한은 동시 실행 슬롯을 얻은 뒤부터 (항목마다 별도 작업이므로 서로 영향 없음)
+                admission.begin(request.query_type, request.timeout or batch.timeout or x_request_timeout)
+                entry, cache_status, _ = await cached_fetch(request, directive)
+            view = await document_view(request, entry)
+            payload = await apply_frame_query(entry.payload if view is None else view, spec)
+            return serializer.render({"index": index, "cache": cache_status, **payload}, orient)
+        except HTTPException as e:
+            return serializer.dumps({"index": index, "status": "error", "status_code": e.status_code, "detail": e.detail})
+        except circuit_breaker.UpstreamUnavailable as e:
+            return serializer.dumps({"index": index, "status": "error", "status_code": e.status_code, "detail": e.detail,
+                                     "retry_after": int(e.retry_after) + 1})
+        except ValidationError as e:
+            return serializer.dumps({"index": index, "status": "error", "status_code": 422,
+                                     "detail": e.errors(include_url=False, include_input=False)})
+        except Exception as e:
+            return serializer.dumps({"index": index, "status": "error", "status_code": 500,
+                                     "detail": f"데이터 조회 중 오류 발생: {str(e)}"})
+    
+    tasks = [asyncio.ensure_future(run_item(i, item)) for i, item in enumerate(batch.requests)]
+    
+    # 스트리밍 모드: 완료되는 순서대로 항목별 결과를 한 줄씩 전송
+    # (동시 처리 요청 수 상한은 응답 시작 전에 확인하고, 연결이 끊기면 남은 항목을 취소)
+    if batch.stream or "application/x-ndjson" in (accept or ""):
+        results = admission.stream(tasks)
+        
+        async def iter_results():
+            try:
+                async for result in results:
+                    yield result + b"\n"
+            finally:
+                await results.aclose()
+        return StreamingResponse(iter_results(), media_type="application/x-ndjson")
+    
+    results = await admission.run(raw_request.receive, asyncio.gather(*tasks))
+    body = b'{"status":"success","results":[' + b",".join(results) + b"]}"
+    headers = {}
+    body = await encode_body(body, "batch", accept_encoding, headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 # 첨부파일 다운로드 URL 조회 엔드포인트
 @app.get("/api/dart/file/{rcept_no}")
 async def get_file_url(rcept_no: str, auth_key: str):
@@ -642,3 +968,275 @@ async def get_file_url(rcept_no: str, auth_key: str):
         return {"status": "success", "download_url": url}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"첨부파일 URL 조회 중 오류 발생: {str(e)}")
+
+# 첨부파일 다운로드 프록시 엔드포인트
+# 첫 요청은 DART에서 받는 대로 청크 단위로 전달하면서 로컬 캐시에 저장하고, 이후 요청은 디스크에서 바로 전송
+# file_index: attach_files 조회 결과의 순번 (0부터)
+@app.get("/api/dart/file/{rcept_no}/{file_index}")
+async def proxy_attachment(rcept_no: str, file_index: int, auth_key: str,
+                           range: Optional[str] = Header(None), if_none_match: Optional[str] = Header(None),
+                           if_range: Optional[str] = Header(None)):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    # 첨부파일 목록 (응답 캐시·디스크 저장소 사용)
+    entry, _, _ = await cached_fetch(DartRequest(company="", query_type="attach_files", auth_key=auth_key, rcept_no=rcept_no))
+    files = entry.payload.get("data")
+    if isinstance(files, pd.DataFrame):
+        files = list(zip(files["file_name"], files["url"])) if {"file_name", "url"} <= set(files.columns) else []
+    elif isinstance(files, dict):
+        files = list(files.items())
+    else:
+        files = []
+    if file_index < 0 or file_index >= len(files):
+        raise HTTPException(status_code=404, detail=f"첨부파일을 찾을 수 없습니다: {rcept_no} {file_index}번")
+    file_name, url = str(files[file_index][0]), str(files[file_index][1])
+    if not attachment_cache.is_allowed(url):
+        raise HTTPException(status_code=502, detail="허용되지 않은 첨부파일 주소입니다.")
+    
+    info = await upstream.call("artifact_store", attachment_cache.lookup, url)
+    if info is not None:
+        return attachment_cache.file_response(info, range, if_none_match, if_range, "HIT")
+    
+    try:
+        response = await upstream.call("attachment", attachment_cache.open_upstream, url)
+    except circuit_breaker.UpstreamUnavailable:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"첨부파일 다운로드 중 오류 발생: {str(e)}")
+    
+    # 범위 요청은 파일 전체를 캐시에 받은 뒤 해당 범위만 전송
+    if range:
+        info = await attachment_cache.download(url, response, file_name)
+        return attachment_cache.file_response(info, range, if_none_match, if_range, "MISS")
+    
+    headers = {
+        "Content-Disposition": attachment_cache.content_disposition(file_name),
+        "X-Cache": "MISS",
+    }
+    if response.headers.get("Content-Length") and not response.headers.get("Content-Encoding"):
+        headers["Content-Length"] = response.headers["Content-Length"]
+    return StreamingResponse(attachment_cache.iter_download(url, response, file_name),
+                             media_type=attachment_cache.content_type_for(response, file_name), headers=headers)
+
+# 신규 공시 실시간 피드 (SSE 또는 long-poll)
+# - Accept: text/event-stream 이면 SSE, 그 외에는 새 공시가 올라올 때까지(최대 timeout초) 기다렸다가 JSON으로 응답
+# - since(또는 SSE 재연결 시 Last-Event-ID) 이후 놓친 공시를 먼저 전달
+# - corp_code·kind는 쉼표로 여러 개 지정, report_nm은 보고서명에 포함된 문자열
+@app.get("/api/dart/stream")
+async def stream_disclosures(auth_key: str, corp_code: Optional[str] = None, kind: Optional[str] = None,
+                             report_nm: Optional[str] = None, since: Optional[int] = None, timeout: float = 30,
+                             accept: Optional[str] = Header(None), last_event_id: Optional[str] = Header(None)):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    if not disclosure_feed.DISCLOSURE_FEED_ENABLED:
+        raise HTTPException(status_code=503, detail="신규 공시 피드가 비활성화되어 있습니다.")
+    
+    corp_codes = [code.strip() for code in corp_code.split(",") if code.strip()] if corp_code else None
+    kinds = [value.strip().upper() for value in kind.split(",") if value.strip()] if kind else None
+    if kinds and any(value not in disclosure_store.KINDS or len(value) != 1 for value in kinds):
+        raise HTTPException(status_code=400, detail=f"공시 유형(kind)은 {', '.join(disclosure_store.KINDS)} 중에서 지정해주세요.")
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    
+    if "text/event-stream" in (accept or ""):
+        async def events():
+            async with disclosure_feed.subscribe(corp_codes, kinds, report_nm, since) as (subscriber, backlog):
+                async for chunk in disclosure_feed.iter_sse(subscriber, backlog):
+                    yield chunk
+        
+        return StreamingResponse(events(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    
+    async with disclosure_feed.subscribe(corp_codes, kinds, report_nm, since) as (subscriber, backlog):
+        return await disclosure_feed.wait(subscriber, backlog, timeout)
+
+# 재무 스크리닝 엔드포인트 (재무정보 저장소의 상장사 주요계정·재무비율을 조건으로 검색)
+@app.post("/api/dart/screen")
+async def screen_financials(request: ScreenRequest, accept_encoding: Optional[str] = Header(None)):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if request.auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    orient = request.orient or "records"
+    if orient not in serializer.ORIENTS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 데이터 형식: {orient} (records, columnar 중 선택)")
+    
+    reprt_code = request.reprt_code or "11011"
+    markets = [market.strip().upper() for market in request.markets.split(",") if market.strip()] if request.markets else None
+    if markets and not set(markets) <= financial_warehouse.MARKETS:
+        raise HTTPException(status_code=400, detail="법인구분(markets)은 Y(유가증권), K(코스닥), N(코넥스), E(기타) 중에서 지정해주세요.")
+    limit = min(request.limit or 100, financial_warehouse.FINANCIAL_WAREHOUSE_MAX_ROWS)
+    if limit < 1 or (request.offset or 0) < 0:
+        raise HTTPException(status_code=400, detail="limit은 1 이상, offset은 0 이상이어야 합니다.")
+    fields = [field.strip() for field in request.fields.split(",") if field.strip()] if request.fields else None
+    
+    frame = await upstream.call("warehouse", financial_warehouse.load, request.bsns_year, reprt_code)
+    if frame is None:
+        raise HTTPException(status_code=404, detail=f"재무정보 저장소에 {request.bsns_year}년 {reprt_code} 보고서 자료가 없습니다. 관리자 적재 후 이용해주세요.")
+    
+    try:
+        total, result = await upstream.call("warehouse", financial_warehouse.screen, frame, markets,
+                                            [item.model_dump() for item in request.filters], request.sort_by,
+                                            bool(request.ascending), limit, request.offset or 0, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"스크리닝 조건 오류: {str(e)} (사용 가능한 컬럼: {', '.join(financial_warehouse.NUMERIC_COLUMNS)})")
+    
+    payload = {"status": "success", "bsns_year": request.bsns_year, "reprt_code": reprt_code, "total": total, "data": result}
+    headers = {}
+    body = await encode_body(serializer.render(payload, orient), "screen", accept_encoding, headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# 재무정보 저장소 적재 (관리자용, 상장사 전체 다중회사 주요계정 조회를 백그라운드에서 실행)
+@app.post("/api/admin/warehouse/ingest")
+async def ingest_warehouse(auth_key: str, bsns_year: str, reprt_code: str = "11011"):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    if reprt_code not in financial_timeseries.REPORT_CODES:
+        raise HTTPException(status_code=400, detail="보고서 코드(reprt_code)는 11011, 11012, 11013, 11014 중 하나여야 합니다.")
+    if financial_warehouse.is_running():
+        raise HTTPException(status_code=409, detail="재무정보 저장소 적재가 이미 실행 중입니다.")
+    
+    asyncio.ensure_future(financial_warehouse.ingest(bsns_year, reprt_code))
+    return JSONResponse(status_code=202, content={"status": "accepted", "bsns_year": bsns_year, "reprt_code": reprt_code})
+
+# 재무정보 저장소 상태 조회
+@app.get("/api/admin/warehouse")
+async def get_warehouse_stats(auth_key: str):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    try:
+        stats = await upstream.call("warehouse", financial_warehouse.stats)
+        return {"status": "success", "data": stats}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"재무정보 저장소 조회 중 오류 발생: {str(e)}")
+
+# 기업 고유번호 테이블 강제 갱신 (관리자용)
+@app.post("/api/admin/corp_codes/refresh")
+async def refresh_corp_codes(auth_key: str):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    try:
+        status = await upstream.call("corp_codes", dart_client.refresh_corp_codes, True)
+        return {"status": "success", "data": status}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"기업 고유번호 갱신 중 오류 발생: {str(e)}")
+
+# 업스트림 실행 풀 상태 조회 (큐 대기 수, 대기 시간)
+@app.get("/api/admin/upstream")
+async def get_upstream_stats(auth_key: str):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    return {"status": "success", "data": {**upstream.stats(), "admission": admission.stats()}}
+
+# 응답 캐시 상태 조회 (적중/미스 횟수, 사용량)
+@app.get("/api/admin/cache")
+async def get_cache_stats(auth_key: str):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    return {"status": "success", "data": {**response_cache.cache.stats(), "singleflight": singleflight.stats()}}
+
+# 응답 캐시 비우기 (현재 워커)
+@app.delete("/api/admin/cache")
+async def clear_cache(auth_key: str):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    response_cache.cache.clear()
+    return {"status": "success"}
+
+# 디스크 저장소 상태 조회
+@app.get("/api/admin/store")
+async def get_store_stats(auth_key: str):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    try:
+        stats = await upstream.call("artifact_store", artifact_store.stats)
+        stats["attachments"] = await upstream.call("artifact_store", attachment_cache.stats)
+        stats["disclosures"] = await upstream.call("disclosure_store", disclosure_store.stats)
+        stats["disclosure_feed"] = await upstream.call("disclosure_store", disclosure_feed.stats)
+        return {"status": "success", "data": stats}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"디스크 저장소 조회 중 오류 발생: {str(e)}")
+
+# DART API 호출 한도 상태 조회 (모든 워커 공유)
+@app.get("/api/admin/rate_limit")
+async def get_rate_limit_stats(auth_key: str):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    try:
+        stats = await upstream.call("rate_limiter", rate_limiter.stats)
+        return {"status": "success", "data": stats}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"호출 한도 상태 조회 중 오류 발생: {str(e)}")
+
+# 요청 처리 지표 (Prometheus 텍스트 형식, 모든 워커 합산)
+@app.get("/metrics")
+async def get_metrics(auth_key: str):
+    # 인증키 확인
+    if not REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=500, detail="서버 설정 오류: 환경변수 REQUIRED_AUTH_KEY가 설정되지 않았습니다.")
+    
+    if auth_key != REQUIRED_AUTH_KEY:
+        raise HTTPException(status_code=403, detail="인증키가 유효하지 않습니다.")
+    
+    if not metrics.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="요청 처리 지표가 비활성화되어 있습니다 (METRICS_ENABLED).")
+    
+    try:
+        metrics.flush()
+        merged = await upstream.call("metrics", metrics.collect)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"지표 조회 중 오류 발생: {str(e)}")
+    return Response(content=metrics.render(merged), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import asyncio
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, Tuple
+
+# 요청 처리 지표 (Prometheus 텍스트 형식, 워커별로 파일에 기록하고 /metrics 조회 시 모든 워커를 합산)
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join("data", "metrics"))
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "10"))  # 워커별 지표 파일 기록 주기 (초)
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+ROWS_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+CALLS_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+# 지표 이름 → (종류, 설명, 히스토그램 구간)
+METRICS = {
+    "dart_http_requests_total": ("counter", "HTTP 요청 수 (엔드포인트·쿼리 타입·상태 코드·캐시 상태별)", None),
+    "dart_http_request_seconds": ("histogram", "HTTP 요청 처리 시간", SECONDS_BUCKETS),
+    "dart_request_phase_seconds": ("histogram", "요청 단계별 처리 시간 (auth, resolve, upstream, serialize, compress)", SECONDS_BUCKETS),
+    "dart_request_upstream_calls": ("histogram", "요청 하나가 호출한 DART API 수", CALLS_BUCKETS),
+    "dart_response_bytes": ("histogram", "응답 본문 크기 (압축 후)", BYTES_BUCKETS),
+    "dart_response_rows": ("histogram", "응답 표 형식 결과의 행 수", ROWS_BUCKETS),
+    "dart_upstream_calls_total": ("counter", "DART API 호출 수 (쿼리 타입·결과별, 재시도 포함 1회)", None),
+    "dart_upstream_call_seconds": ("histogram", "DART API 호출 시간 (호출 한도·동시성 대기와 재시도 포함)", SECONDS_BUCKETS),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# 이름 → 레이블 → 값 (counter: 합계, histogram: [구간별 개수..., +Inf 개수, 합계])
+_values: Dict[str, Dict[Labels, Any]] = {name: {} for name in METRICS}
+
+
+class RequestMetrics:
+    # 요청 하나의 단계별 시간과 DART 호출 수 (요청 처리 중 호출된 곳에서 누적)
+    def __init__(self):
+        self.query_type = ""
+        self.phases: Dict[str, float] = {}
+        self.upstream_calls = 0
+        self.rows: Optional[int] = None
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels: str) -> None:
+    if not METRICS_ENABLED:
+        return
+    key = _labels(**labels)
+    series = _values[name]
+    series[key] = series.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    if not METRICS_ENABLED:
+        return
+    buckets = METRICS[name][2]
+    key = _labels(**labels)
+    series = _values[name]
+    if key not in series:
+        series[key] = [0] * (len(buckets) + 1) + [0.0]
+    counts = series[key]
+    counts[bisect_left(buckets, value)] += 1
+    counts[-1] += value
+
+
+def start() -> RequestMetrics:
+    tracked = RequestMetrics()
+    _current.set(tracked)
+    return tracked
+
+
+def begin(query_type: str) -> None:
+    # 현재 요청의 쿼리 타입 레이블 지정
+    tracked = _current.get()
+    if tracked is not None:
+        tracked.query_type = query_type
+
+
+def add_phase(phase_name: str, seconds: float) -> None:
+    tracked = _current.get()
+    if tracked is not None:
+        tracked.phases[phase_name] = tracked.phases.get(phase_name, 0.0) + seconds
+
+
+@contextmanager
+def phase(phase_name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase(phase_name, time.perf_counter() - started)
+
+
+def rows(count: int) -> None:
+    tracked = _current.get()
+    if tracked is not None:
+        tracked.rows = count
+
+
+def record_upstream(query_type: str, seconds: float, outcome: str) -> None:
+    # DART API 호출 1회 (upstream.call 단위) 기록, 요청 안에서의 호출이면 요청별 호출 수와 upstream 단계 시간에 합산
+    inc("dart_upstream_calls_total", query_type=query_type, outcome=outcome)
+    observe("dart_upstream_call_seconds", seconds, query_type=query_type)
+    tracked = _current.get()
+    if tracked is not None:
+        tracked.upstream_calls += 1
+        tracked.phases["upstream"] = tracked.phases.get("upstream", 0.0) + seconds
+
+
+def finish(tracked: RequestMetrics, endpoint: str, status: int, seconds: float,
+           size: Optional[int] = None, cache: str = "") -> None:
+    query_type = tracked.query_type or "-"
+    inc("dart_http_requests_total", endpoint=endpoint, query_type=query_type, status=str(status), cache=cache or "-")
+    observe("dart_http_request_seconds", seconds, endpoint=endpoint, query_type=query_type)
+    if not tracked.query_type:
+        return
+    for phase_name, value in tracked.phases.items():
+        observe("dart_request_phase_seconds", value, query_type=query_type, phase=phase_name)
+    observe("dart_request_upstream_calls", tracked.upstream_calls, query_type=query_type)
+    if size is not None:
+        observe("dart_response_bytes", size, query_type=query_type)
+    if tracked.rows is not None:
+        observe("dart_response_rows", tracked.rows, query_type=query_type)
+
+
+def _path(pid: int) -> str:
+    return os.path.join(METRICS_DIR, f"{pid}.json")
+
+
+def flush() -> None:
+    # 이 워커의 누적 지표를 파일로 기록 (다른 워커가 읽는 도중의 파일을 바꾸지 않도록 임시 파일에 쓴 뒤 교체)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    snapshot = {name: [[list(key), value] for key, value in series.items()] for name, series in _values.items()}
+    path = _path(os.getpid())
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # 다른 사용자의 프로세스
+        return True
+    return True
+
+
+def collect() -> Dict[str, Dict[Labels, Any]]:
+    # 살아 있는 모든 워커의 지표 파일 합산 (종료된 워커의 파일은 삭제)
+    merged: Dict[str, Dict[Labels, Any]] = {name: {} for name in METRICS}
+    for file_name in os.listdir(METRICS_DIR):
+        if not file_name.endswith(".json"):
+            continue
+        path = os.path.join(METRICS_DIR, file_name)
+        pid = int(file_name[:-5]) if file_name[:-5].isdigit() else 0
+        if not _alive(pid):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, series in snapshot.items():
+            if name not in merged:
+                continue
+            for key, value in series:
+                key = tuple(tuple(item) for item in key)
+                current = merged[name].get(key)
+                if current is None:
+                    merged[name][key] = value
+                elif isinstance(value, list):
+                    merged[name][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    merged[name][key] = current + value
+    return merged
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: List[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def render(merged: Dict[str, Dict[Labels, Any]]) -> str:
+    lines = []
+    for name, (kind, description, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        for key, value in sorted(merged[name].items()):
+            labels = list(key)
+            if kind == "counter":
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ["+Inf"], value[:-1]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels + [('le', str(bound))])} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {value[-1]}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+async def flush_loop():
+    # 주기적으로 워커별 지표 파일 갱신 (/metrics를 받은 워커가 다른 워커의 지표를 읽을 수 있도록)
+    # 요청 처리 중 바뀌는 지표를 읽으므로 이벤트 루프에서 기록 (파일 크기는 수십 KB 수준)
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+        try:
+            flush()
+        except Exception as e:
+            print(f"경고: 지표 파일 기록 실패: {str(e)}")
+
+
+class MetricsMiddleware:
+    # 모든 HTTP 요청의 처리 시간·상태 코드·응답 크기 기록 (스트리밍 응답은 전송이 끝날 때까지)
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        tracked = start()
+        started = time.perf_counter()
+        response = {"status": 500, "size": 0, "cache": ""}
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                for key, value in message.get("headers") or []:
+                    if key.lower() == b"x-cache":
+                        response["cache"] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            endpoint = getattr(scope.get("endpoint"), "__name__", "unmatched")
+            finish(tracked, endpoint, response["status"], time.perf_counter() - started,
+                   response["size"], response["cache"])
@@ -0,0 +1,95 @@
+import os
+import asyncio
+from typing import Optional, List, Dict, Any
+import pandas as pd
+
+import response_cache
+import upstream
+
+# 다중회사 재무제표 조회 분할 설정 (OpenDART 다중회사 주요계정 API는 1회 최대 100개 회사)
+MULTI_FINANCIAL_CHUNK_SIZE = int(os.environ.get("MULTI_FINANCIAL_CHUNK_SIZE", "100"))
+
+
+def parse_corp_codes(corp_codes: str) -> List[str]:
+    # 콤마 구분 문자열을 순서를 유지한 채 공백 제거·중복 제거
+    codes = []
+    seen = set()
+    for code in corp_codes.split(","):
+        code = code.strip()
+        if code and code not in seen:
+            seen.add(code)
+            codes.append(code)
+    return codes
+
+
+def _corp_key(corp_code: str, bsns_year: str, reprt_code: str, account_nm: Optional[str]) -> str:
+    # 회사 단위 결과 캐시 키
+    return response_cache.cache_key({
+        "query_type": "multi_financial:corp", "corp_code": corp_code,
+        "bsns_year": bsns_year, "reprt_code": reprt_code, "account_nm": account_nm,
+    })
+
+
+async def fetch(dart, corp_codes: List[str], bsns_year: str, reprt_code: str,
+                account_nm: Optional[str] = None) -> Dict[str, Any]:
+    # 회사 단위 캐시에 있는 회사는 건너뛰고, 나머지를 나누어 동시에 조회한 뒤 하나의 DataFrame으로 병합
+    # 일부 묶음이 실패해도 나머지 결과는 반환하고 실패한 묶음을 failed_chunks로 알린다
+    ttl = response_cache.ttl_for("multi_financial", {})
+    frames = []
+    missing = []
+    for code in corp_codes:
+        # 회사 수만큼 찾으므로 적중률 통계에는 넣지 않음 (요청 단위 캐시 조회에서 한 번 집계)
+        cached = response_cache.cache.peek(_corp_key(code, bsns_year, reprt_code, account_nm))
+        if cached is not None:
+            frames.append(cached)
+        else:
+            missing.append(code)
+
+    chunks = [missing[i:i + MULTI_FINANCIAL_CHUNK_SIZE] for i in range(0, len(missing), MULTI_FINANCIAL_CHUNK_SIZE)]
+
+    async def fetch_chunk(chunk: List[str]) -> pd.DataFrame:
+        # 다중회사 주요계정 조회 (finstate에 콤마로 연결한 고유번호를 주면 fnlttMultiAcnt API 사용)
+        # OpenDartReader는 결과가 없을 때 사업연도를 숫자와 비교하므로 정수로 전달
+        result = await upstream.call("multi_financial", dart.finstate, ",".join(chunk), int(bsns_year), reprt_code)
+        if account_nm and result is not None and "account_nm" in result.columns:
+            # 단일 계정과목 조회는 API가 없으므로 받은 주요계정에서 선택
+            result = result[result["account_nm"].astype(str).str.strip() == account_nm.strip()]
+        return result
+
+    results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks), return_exceptions=True)
+
+    failed_chunks = []
+    errors = []
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            failed_chunks.append({"corp_codes": chunk, "error": str(result)})
+            errors.append(result)
+            continue
+        result = result if result is not None else pd.DataFrame()
+        frames.append(result)
+
+        # 회사 단위로 나누어 캐시 (결과가 없는 회사도 짧게 캐시하여 반복 조회 방지)
+        if "corp_code" in result.columns:
+            groups = dict(tuple(result.groupby(result["corp_code"].astype(str).str.strip(), sort=False)))
+        else:
+            groups = {}
+        for code in chunk:
+            frame = groups.get(code)
+            if frame is None:
+                if "corp_code" not in result.columns:
+                    continue
+                frame = result.iloc[0:0]
+            response_cache.cache.set(_corp_key(code, bsns_year, reprt_code, account_nm), frame,
+                                     ttl if not frame.empty else min(ttl, response_cache.EMPTY_TTL),
+                                     int(frame.memory_usage(index=True, deep=True).sum()))
+
+    if chunks and len(failed_chunks) == len(chunks) and not frames:
+        # 모든 묶음이 실패하면 원래 예외를 그대로 전달 (호출 한도 초과 등은 상위에서 상태 코드로 변환)
+        raise errors[0]
+
+    frames = [frame for frame in frames if not frame.empty]
+    data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    payload = {"status": "partial" if failed_chunks else "success", "data": data}
+    if failed_chunks:
+        payload["failed_chunks"] = failed_chunks
+    return payload
@@ -0,0 +1,195 @@
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+import contextvars
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Tuple
+
+import admission
+import circuit_breaker
+
+# DART API 키 하나를 모든 워커가 공유하므로 호출 한도를 로컬 SQLite 파일로 조정
+RATE_LIMIT_PATH = os.environ.get("RATE_LIMIT_PATH", os.path.join("data", "rate_limit.sqlite"))
+DART_RATE_PER_MINUTE = float(os.environ.get("DART_RATE_PER_MINUTE", "600"))
+DART_RATE_BURST = float(os.environ.get("DART_RATE_BURST", "60"))
+DART_DAILY_QUOTA = int(os.environ.get("DART_DAILY_QUOTA", "20000"))
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() != "false"
+
+KST = timezone(timedelta(hours=9))  # OpenDART 일일 한도는 한국 시간 자정에 초기화
+
+# 우선순위 등급: 낮은 등급은 토큰과 일일 한도의 일부를 상위 등급 몫으로 남겨둔다
+# (min_tokens: 버킷에 이만큼 남아 있어야 사용 가능, quota_share: 일일 한도 중 사용 가능한 비율, max_wait: 기본 대기 한도)
+PRIORITY_CLASSES = {
+    "interactive": {"min_tokens": 0.0, "quota_share": 1.0, "max_wait": 5.0},
+    "normal": {"min_tokens": 0.2, "quota_share": 0.95, "max_wait": 15.0},
+    "bulk": {"min_tokens": 0.5, "quota_share": 0.8, "max_wait": 60.0},
+}
+
+QUERY_PRIORITIES = {
+    "company_code": "interactive",
+    "company": "interactive",
+    "company_info": "interactive",
+    "disclosure": "interactive",
+    "disclosure_ticker": "interactive",
+    "multi_financial": "bulk",
+    "disclosure_date": "bulk",
+    "disclosure_date_ex": "bulk",
+    "disclosure_sync": "bulk",
+    "warehouse_ingest": "bulk",
+}
+
+
+class RateLimited(circuit_breaker.UpstreamUnavailable):
+    status_code = 429
+
+
+_local = threading.local()
+
+# 실행 중인 DART 호출의 우선순위와 미리 차감한 토큰 수 (upstream이 호출을 실행하는 컨텍스트에 설정)
+_call = contextvars.ContextVar("rate_limit_call", default=None)
+
+
+def priority_for(query_type: str) -> str:
+    return QUERY_PRIORITIES.get(query_type, "normal")
+
+
+def _connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        directory = os.path.dirname(RATE_LIMIT_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(RATE_LIMIT_PATH, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS bucket ("
+            " id INTEGER PRIMARY KEY CHECK (id = 1), tokens REAL NOT NULL, updated_at REAL NOT NULL,"
+            " day TEXT NOT NULL, used INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO bucket (id, tokens, updated_at, day, used) VALUES (1, ?, ?, ?, 0)",
+            (DART_RATE_BURST, time.time(), _today()),
+        )
+        _local.conn = conn
+    return conn
+
+
+def _today() -> str:
+    return datetime.now(KST).strftime("%Y%m%d")
+
+
+def _seconds_until_reset() -> float:
+    now = datetime.now(KST)
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - now).total_seconds()
+
+
+def try_acquire(priority: str, cost: int = 1) -> Tuple[bool, float, str]:
+    # 토큰 버킷과 일일 한도를 한 트랜잭션에서 확인·차감 (BEGIN IMMEDIATE로 워커 간 원자성 보장)
+    # 반환값: (성공 여부, 다시 시도까지 대기 시간(초), 실패 사유)
+    rule = PRIORITY_CLASSES[priority]
+    conn = _connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        tokens, updated_at, day, used = conn.execute(
+            "SELECT tokens, updated_at, day, used FROM bucket WHERE id = 1").fetchone()
+        now = time.time()
+        rate = DART_RATE_PER_MINUTE / 60.0
+        tokens = min(DART_RATE_BURST, tokens + (now - updated_at) * rate)
+        today = _today()
+        if day != today:
+            day, used = today, 0
+
+        if used + cost > DART_DAILY_QUOTA * rule["quota_share"]:
+            conn.execute("UPDATE bucket SET tokens = ?, updated_at = ?, day = ?, used = ? WHERE id = 1",
+                         (tokens, now, day, used))
+            conn.execute("COMMIT")
+            return False, _seconds_until_reset(), "quota"
+
+        required = cost + DART_RATE_BURST * rule["min_tokens"]
+        if tokens < required:
+            conn.execute("UPDATE bucket SET tokens = ?, updated_at = ?, day = ?, used = ? WHERE id = 1",
+                         (tokens, now, day, used))
+            conn.execute("COMMIT")
+            return False, (required - tokens) / rate, "rate"
+
+        conn.execute("UPDATE bucket SET tokens = ?, updated_at = ?, day = ?, used = ? WHERE id = 1",
+                     (tokens - cost, now, day, used + cost))
+        conn.execute("COMMIT")
+        return True, 0.0, ""
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _rejected(reason: str, wait: float) -> RateLimited:
+    if reason == "quota":
+        return RateLimited("DART API 일일 호출 한도를 초과했습니다. 한도는 자정(KST)에 초기화됩니다.", wait)
+    return RateLimited("DART API 호출 한도를 초과했습니다. 잠시 후 다시 시도해주세요.", wait)
+
+
+async def acquire(query_type: str, max_wait: float = None) -> None:
+    # 한도를 넘으면 실패시키지 않고 max_wait까지 대기열에서 기다린다
+    # 일일 한도 소진은 기다려도 풀리지 않으므로 즉시 RateLimited 발생
+    if not RATE_LIMIT_ENABLED:
+        return
+    priority = priority_for(query_type)
+    max_wait = PRIORITY_CLASSES[priority]["max_wait"] if max_wait is None else max_wait
+    deadline = time.monotonic() + max_wait
+    while True:
+        ok, wait, reason = await asyncio.to_thread(try_acquire, priority)
+        if ok:
+            return
+        remaining = deadline - time.monotonic()
+        if reason == "quota" or remaining <= 0 or wait > remaining:
+            raise _rejected(reason, wait)
+        await asyncio.sleep(min(wait, remaining))
+
+
+def begin_call(query_type: str, prepaid: int = 1) -> None:
+    # upstream이 호출 실행 직전(실행 스레드의 컨텍스트)에서 호출: 이후 HTTP 요청은 이 우선순위로 차감
+    _call.set({"priority": priority_for(query_type), "prepaid": prepaid})
+
+
+def charge_request() -> None:
+    # DART HTTP 요청 1건마다 호출 (dart_client 전용 세션)
+    # 한 번의 호출이 목록 페이지·회사별 조회 등 여러 요청을 보내므로 요청 수만큼 차감한다
+    # 첫 요청은 upstream이 실행 전에 미리 차감한 토큰을 쓰고, 이후 요청은 실행 스레드에서 토큰을 기다린다
+    call = _call.get()
+    if call is None or not RATE_LIMIT_ENABLED:
+        return
+    if call["prepaid"]:
+        call["prepaid"] -= 1
+        return
+    priority = call["priority"]
+    deadline = time.monotonic() + admission.within_deadline(PRIORITY_CLASSES[priority]["max_wait"])
+    while True:
+        ok, wait, reason = try_acquire(priority)
+        if ok:
+            return
+        remaining = deadline - time.monotonic()
+        if reason == "quota" or remaining <= 0 or wait > remaining:
+            raise _rejected(reason, wait)
+        time.sleep(min(wait, remaining))
+
+
+def stats() -> Dict[str, Any]:
+    conn = _connection()
+    tokens, updated_at, day, used = conn.execute("SELECT tokens, updated_at, day, used FROM bucket WHERE id = 1").fetchone()
+    tokens = min(DART_RATE_BURST, tokens + (time.time() - updated_at) * DART_RATE_PER_MINUTE / 60.0)
+    if day != _today():
+        used = 0
+    return {
+        "enabled": RATE_LIMIT_ENABLED,
+        "rate_per_minute": DART_RATE_PER_MINUTE,
+        "burst": DART_RATE_BURST,
+        "tokens": round(tokens, 2),
+        "daily_quota": DART_DAILY_QUOTA,
+        "daily_used": used,
+        "daily_remaining": max(0, DART_DAILY_QUOTA - used),
+        "reset_in_seconds": int(_seconds_until_reset()),
+        "priorities": {name: {**rule, "quota_limit": int(DART_DAILY_QUOTA * rule["quota_share"])}
+                       for name, rule in PRIORITY_CLASSES.items()},
+    }
@@ -0,0 +1,273 @@
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple
+import pandas as pd
+
+import compression
+import serializer
+
+# 응답 캐시 크기 제한
+RESPONSE_CACHE_MAX_MB = float(os.environ.get("RESPONSE_CACHE_MAX_MB", "256"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "20000"))
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# 쿼리 타입별 TTL (초), 0이면 캐시하지 않음
+DEFAULT_TTLS = {
+    # 접수번호(rcept_no) 기준의 제출 완료 문서: 사실상 불변
+    "document": 30 * DAY,
+    "retrieve": 30 * DAY,
+    "sub_docs": 30 * DAY,
+    "attach_docs": 30 * DAY,
+    "attach_files": 30 * DAY,
+    # 사업연도·보고서 코드 기준 재무제표: 제출 후 거의 변하지 않음
+    "report_content": 7 * DAY,
+    "full_financial": 7 * DAY,
+    "section_financial": 7 * DAY,
+    "multi_financial": 7 * DAY,
+    "financial_timeseries": DAY,  # 기간별 결과는 report_content로 캐시
+    # 기업 단위 현황 정보
+    "company": DAY,
+    "company_info": DAY,
+    "dividend": 6 * HOUR,
+    "executive": 6 * HOUR,
+    "capital": 6 * HOUR,
+    "audit": 6 * HOUR,
+    "report_key": 6 * HOUR,
+    "biz_overview": 6 * HOUR,
+    "stock_suspension": 6 * HOUR,
+    "stock_change": 6 * HOUR,
+    "major_shareholder": HOUR,
+    "major_shareholder_exec": HOUR,
+    # 공시 목록: 새 공시가 계속 추가됨
+    "disclosure": 10 * MINUTE,
+    "report": 10 * MINUTE,
+    "disclosure_ticker": 10 * MINUTE,
+    "event": 10 * MINUTE,
+    "regstate": 10 * MINUTE,
+    "disclosure_date": DAY,  # 지난 날짜 기준 (당일은 TODAY_TTL)
+    "disclosure_date_ex": DAY,
+    # 로컬에서 처리되는 조회
+    "company_code": 0,
+    "download": 0,
+}
+
+# 당일 공시 목록 및 빈 결과(아직 제출되지 않은 보고서 등)의 TTL
+TODAY_TTL = int(os.environ.get("RESPONSE_CACHE_TODAY_TTL", str(2 * MINUTE)))
+EMPTY_TTL = int(os.environ.get("RESPONSE_CACHE_EMPTY_TTL", str(10 * MINUTE)))
+
+# 만료된 응답을 보관하여 사용하는 기간 (초)
+# - STALE_WHILE_REVALIDATE: 만료 직후에는 이전 응답을 바로 주고 백그라운드에서 갱신
+# - STALE_IF_ERROR: DART 장애·호출 한도 초과 시 이전 응답으로 대신 응답
+STALE_WHILE_REVALIDATE = int(os.environ.get("RESPONSE_CACHE_STALE_WHILE_REVALIDATE", str(MINUTE)))
+STALE_IF_ERROR = int(os.environ.get("RESPONSE_CACHE_STALE_IF_ERROR", str(DAY)))
+
+
+def _parse_ttls(value: str) -> Dict[str, int]:
+    # "dividend=3600,disclosure=300" 형식의 환경변수 파싱
+    ttls = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        key, ttl = item.split("=", 1)
+        ttls[key.strip()] = int(ttl)
+    return ttls
+
+
+TTLS = {**DEFAULT_TTLS, **_parse_ttls(os.environ.get("RESPONSE_CACHE_TTL", ""))}
+
+
+def ttl_for(query_type: str, params: Dict[str, Any]) -> int:
+    ttl = TTLS.get(query_type, 10 * MINUTE)
+    if query_type in ("disclosure_date", "disclosure_date_ex"):
+        date = (params.get("date") or "").replace("-", "")
+        if not date or date >= datetime.now().strftime("%Y%m%d"):
+            return min(ttl, TODAY_TTL)
+    return ttl
+
+
+# company 값을 사용하지 않는 쿼리 타입 (접수번호·날짜·복수 고유번호 기준)
+COMPANY_INDEPENDENT_QUERY_TYPES = {
+    "document", "retrieve", "sub_docs", "attach_docs", "attach_files", "download",
+    "disclosure_date", "disclosure_date_ex", "multi_financial",
+}
+
+
+# 고유번호(corp_code)로 조회하는 쿼리 타입: corp_code가 있으면 company 값은 사용하지 않음
+CORP_CODE_QUERY_TYPES = {
+    "company", "report_content", "financial_timeseries", "major_shareholder", "major_shareholder_exec", "executive", "dividend",
+    "capital", "section_financial", "full_financial", "report_key", "audit", "stock_suspension",
+    "stock_change", "biz_overview", "event", "regstate",
+}
+
+# 조회 결과가 아닌 응답 표현에만 영향을 주는 요청 필드 (캐시 키에서 제외)
+# (공시 원문 목차·구간·페이지 지정, 컬럼 선택·행 조건·정렬·페이지는 캐시된 원본에서 잘라 응답, 처리 기한은 결과와 무관)
+PRESENTATION_FIELDS = {
+    "auth_key", "cache_control", "orient", "stream", "timeout",
+    "toc", "section", "char_start", "char_end", "page", "page_size",
+    "fields", "where", "sort", "limit", "offset",
+}
+
+
+def cache_key(params: Dict[str, Any]) -> str:
+    # 인증키·캐시 제어값·응답 형식을 제외하고 정규화한 요청 파라미터의 해시
+    ignored = set(PRESENTATION_FIELDS)
+    if params.get("query_type") in COMPANY_INDEPENDENT_QUERY_TYPES:
+        ignored.add("company")
+    if params.get("query_type") in CORP_CODE_QUERY_TYPES and params.get("corp_code"):
+        ignored.add("company")
+    normalized = {}
+    for key, value in params.items():
+        if key in ignored or value is None:
+            continue
+        normalized[key] = value.strip() if isinstance(value, str) else value
+    raw = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def is_empty(payload: Dict[str, Any]) -> bool:
+    data = payload.get("data", True)
+    if isinstance(data, pd.DataFrame):
+        return data.empty
+    return data is None or (isinstance(data, (list, dict, str)) and not data)
+
+
+def estimate_size(payload: Dict[str, Any]) -> int:
+    # 캐시 크기 계산용 응답 원본의 대략적인 메모리 사용량
+    size = 0
+    for value in payload.values():
+        if isinstance(value, pd.DataFrame):
+            size += int(value.memory_usage(index=True, deep=True).sum())
+        elif isinstance(value, (str, bytes)):
+            size += len(value)
+        else:
+            size += len(serializer.dumps(value))
+    return size
+
+
+class CachedResponse:
+    # 캐시 항목: 원본 응답(DataFrame 포함)과 데이터 형식별 직렬화 본문
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.payload = payload
+        self.bodies: Dict[str, bytes] = {}
+        self.encoded: Dict[Tuple[str, str], bytes] = {}  # (데이터 형식, 인코딩) → 압축한 본문
+        self.document = None  # 공시 원문 목차 인덱스 (구간 조회 시 생성)
+        self.key: Optional[str] = None  # 메모리 캐시 키 (정규화한 요청 기준, 캐시에 저장한 항목만)
+
+    def body(self, orient: str = "records") -> Tuple[bytes, bool]:
+        # (본문, 새로 직렬화했는지 여부) 반환
+        if orient in self.bodies:
+            return self.bodies[orient], False
+        self.bodies[orient] = serializer.render(self.payload, orient)
+        return self.bodies[orient], True
+
+    def compressed(self, orient: str, encoding: str, level: int) -> Tuple[bytes, bool]:
+        # (압축한 본문, 새로 압축했는지 여부) 반환 (직렬화 본문이 이미 있어야 함)
+        key = (orient, encoding)
+        if key in self.encoded:
+            return self.encoded[key], False
+        self.encoded[key] = compression.compress(self.bodies[orient], encoding, level)
+        return self.encoded[key], True
+
+
+class ResponseCache:
+    # TTL + LRU 메모리 캐시 (워커 단위, 전체 크기 제한)
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, list]" = OrderedDict()  # key -> [저장 시각, 만료 시각, 크기, 값]
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        # (값, 경과 시간) 반환
+        # 만료된 항목은 STALE_IF_ERROR 동안 get_stale용으로 남겨둔다
+        entry = self.entries.get(key)
+        now = time.time()
+        if entry is None or entry[1] <= now:
+            if entry is not None and entry[1] + STALE_IF_ERROR <= now:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[3], now - entry[0]
+
+    def peek(self, key: str) -> Optional[Any]:
+        # 유효한 항목의 값만 반환 (적중률 통계에 반영하지 않음, 요청 안에서 여러 번 찾는 부분 결과 조회용)
+        entry = self.entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        self.entries.move_to_end(key)
+        return entry[3]
+
+    def get_stale(self, key: str, max_stale: int) -> Optional[Tuple[Any, float]]:
+        # 만료 후 max_stale초 이내인 항목의 (값, 경과 시간) 반환
+        entry = self.entries.get(key)
+        now = time.time()
+        if entry is None or entry[1] + max_stale <= now:
+            return None
+        self.entries.move_to_end(key)
+        self.stale_hits += 1
+        return entry[3], now - entry[0]
+
+    def set(self, key: str, value: Any, ttl: int, size: int) -> None:
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        if key in self.entries:
+            self._remove(key)
+        now = time.time()
+        self.entries[key] = [now, now + ttl, size, value]
+        self.size += size
+        self._evict()
+
+    def grow(self, key: str, size: int) -> None:
+        # 기존 항목에 직렬화 본문 등이 추가된 만큼 크기 반영
+        entry = self.entries.get(key)
+        if entry is None:
+            return
+        entry[2] += size
+        self.size += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.entries and (self.size > self.max_bytes or len(self.entries) > self.max_entries):
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        self.size -= entry[2]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "pid": os.getpid(),
+            "entries": len(self.entries),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+        }
+
+
+cache = ResponseCache(int(RESPONSE_CACHE_MAX_MB * 1024 * 1024), RESPONSE_CACHE_MAX_ENTRIES)
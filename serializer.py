@@ -0,0 +1,103 @@
+import os
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterator
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 대체
+    orjson = None
+
+# 데이터 형식
+# - records: 행 목록 [{"컬럼": 값, ...}, ...] (기본값, 기존 응답과 동일)
+# - columnar: 컬럼명과 컬럼별 배열 {"columns": [...], "values": [[...], ...]} (컬럼명을 한 번만 포함하여 크기 절감)
+ORIENTS = ("records", "columnar")
+
+# NDJSON 스트리밍 시 한 번에 직렬화하는 행 수 (요청당 직렬화 메모리 상한)
+NDJSON_CHUNK_ROWS = int(os.environ.get("NDJSON_CHUNK_ROWS", "1000"))
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, pd.DataFrame):
+        return json.loads(encode_frame(value))
+    if isinstance(value, pd.Series):
+        return value.tolist()
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    # 기존 convert_df_to_json과 같은 값 규칙: 날짜는 YYYY-MM-DD 문자열, 결측값은 ""
+    # 변환이 필요한 컬럼만 얕은 복사본에서 교체한다
+    out = None
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        converted = column
+        if pd.api.types.is_datetime64_any_dtype(converted):
+            converted = converted.dt.strftime("%Y-%m-%d")
+        if converted.hasnans:
+            converted = converted.astype(object).where(converted.notna(), "")
+        if converted is not column:
+            if out is None:
+                out = df.copy(deep=False)
+            out.isetitem(i, converted)
+    return df if out is None else out
+
+
+def encode_frame(df: pd.DataFrame, orient: str = "records") -> bytes:
+    # DataFrame을 JSON 바이트로 바로 직렬화 (pandas C 인코더, 파이썬 객체 변환 없음)
+    if df is None or df.empty:
+        return b'{"columns":[],"values":[]}' if orient == "columnar" else b"[]"
+    df = prepare_frame(df)
+    if orient == "columnar":
+        columns = dumps([str(c) for c in df.columns])
+        values = b",".join(
+            df.iloc[:, i].to_json(orient="values", force_ascii=False).encode("utf-8") for i in range(df.shape[1])
+        )
+        return b'{"columns":' + columns + b',"values":[' + values + b"]}"
+    return df.to_json(orient="records", force_ascii=False).encode("utf-8")
+
+
+def render(payload: Dict[str, Any], orient: str = "records") -> bytes:
+    # 응답 본문 생성: DataFrame 값은 직접 직렬화하고 나머지는 JSON 인코더로 처리
+    parts = []
+    for key, value in payload.items():
+        if isinstance(value, pd.DataFrame):
+            encoded = encode_frame(value, orient)
+        else:
+            encoded = dumps(value)
+        parts.append(dumps(str(key)) + b":" + encoded)
+    return b"{" + b",".join(parts) + b"}"
+
+
+def iter_ndjson(payload: Dict[str, Any], chunk_rows: int = 0) -> Iterator[bytes]:
+    # data를 한 줄에 한 행씩(NDJSON) 내보내고, 마지막 줄에 data 외 항목(status, failed_chunks 등)을 {"_meta": {...}}로 보낸다
+    # DataFrame은 chunk_rows 행 단위로 잘라 직렬화하므로 전체 본문을 메모리에 만들지 않는다
+    chunk_rows = chunk_rows or NDJSON_CHUNK_ROWS
+    data = payload.get("data")
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunk_rows):
+            chunk = prepare_frame(data.iloc[start:start + chunk_rows])
+            lines = chunk.to_json(orient="records", lines=True, force_ascii=False)
+            yield lines.encode("utf-8") + (b"" if lines.endswith("\n") else b"\n")
+    elif isinstance(data, list):
+        for row in data:
+            yield dumps(row) + b"\n"
+    elif data is not None:
+        yield dumps(data) + b"\n"
+    meta = {key: value for key, value in payload.items() if key != "data"}
+    if meta:
+        yield dumps({"_meta": meta}) + b"\n"
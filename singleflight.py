@@ -0,0 +1,128 @@
+import os
+import time
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Awaitable, Dict, Any
+
+import admission
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 fcntl 미지원 환경에서는 워커 간 임대 비활성화
+    fcntl = None
+
+# 워커 간 임대(lease) 파일 위치와 대기 설정
+SINGLEFLIGHT_LOCK_DIR = os.environ.get("SINGLEFLIGHT_LOCK_DIR", os.path.join("data", "locks"))
+SINGLEFLIGHT_LEASE_TIMEOUT = float(os.environ.get("SINGLEFLIGHT_LEASE_TIMEOUT", "60"))
+SINGLEFLIGHT_LOCK_STRIPES = int(os.environ.get("SINGLEFLIGHT_LOCK_STRIPES", "1024"))  # 잠금 파일 수 상한
+SINGLEFLIGHT_POLL_INTERVAL = 0.1
+
+# 진행 중인 업스트림 조회 (키 -> 작업)
+_flights: Dict[str, asyncio.Task] = {}
+_waiters: Dict[asyncio.Task, int] = {}  # 작업별 결과를 기다리는 요청 수
+_stats = {"leaders": 0, "coalesced": 0, "cancelled": 0, "lease_waits": 0, "lease_hits": 0, "lease_timeouts": 0}
+
+
+def count(name: str) -> None:
+    _stats[name] = _stats.get(name, 0) + 1
+
+
+async def do(key: str, factory: Callable[[], Awaitable[Any]]):
+    # 같은 키의 조회가 진행 중이면 새로 호출하지 않고 그 결과를 함께 받는다
+    # 반환값: (결과, 합류 여부)
+    task = _flights.get(key)
+    if task is not None:
+        _stats["coalesced"] += 1
+        return await _join(task), True
+
+    _stats["leaders"] += 1
+    # 먼저 요청한 클라이언트가 연결을 끊어도 대기 중인 요청은 결과를 받을 수 있도록 별도 작업으로 실행
+    task = asyncio.ensure_future(factory())
+    _flights[key] = task
+    task.add_done_callback(lambda _: _flights.pop(key, None))
+    return await _join(task), False
+
+
+async def _join(task: asyncio.Task):
+    _waiters[task] = _waiters.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _waiters[task] -= 1
+        if not _waiters[task]:
+            del _waiters[task]
+            if not task.done():
+                # 기다리던 요청이 모두 취소되면 (클라이언트 연결 끊김 등) 공유 조회도 취소
+                task.cancel()
+                _stats["cancelled"] += 1
+
+
+def _try_lock(path: str):
+    fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd
+    except OSError:
+        os.close(fd)
+        return None
+
+
+@asynccontextmanager
+async def lease(key: str):
+    # 워커 간 임대: 다른 워커가 같은 키를 조회 중이면 끝날 때까지 기다린다 (요청 처리 기한까지만)
+    # yield 값은 다른 워커를 기다렸는지 여부 (True면 공유 저장소를 다시 확인할 것)
+    if fcntl is None:
+        yield False
+        return
+
+    os.makedirs(SINGLEFLIGHT_LOCK_DIR, exist_ok=True)
+    stripe = int(hashlib.sha1(key.encode("utf-8")).hexdigest(), 16) % SINGLEFLIGHT_LOCK_STRIPES
+    path = os.path.join(SINGLEFLIGHT_LOCK_DIR, f"{stripe:04d}.lock")
+    fd = _try_lock(path)
+    waited = False
+    if fd is None:
+        waited = True
+        _stats["lease_waits"] += 1
+        deadline = time.monotonic() + admission.within_deadline(SINGLEFLIGHT_LEASE_TIMEOUT)
+        while fd is None and time.monotonic() < deadline:
+            await asyncio.sleep(min(SINGLEFLIGHT_POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+            fd = _try_lock(path)
+        if fd is None:
+            _stats["lease_timeouts"] += 1
+            if admission.expired():
+                # 요청 처리 기한 초과: 다른 워커의 조회를 더 기다리지 않고 실패
+                raise admission.exceeded()
+            # 임대 대기 시간 초과: 잠금 없이 진행
+    try:
+        yield waited
+    finally:
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+@contextmanager
+def exclusive(name: str):
+    # 워커 간 배타 실행 (백그라운드 작업을 한 워커만 실행할 때 사용)
+    # 다른 워커가 실행 중이면 기다리지 않고 False를 yield
+    if fcntl is None:
+        yield True
+        return
+
+    os.makedirs(SINGLEFLIGHT_LOCK_DIR, exist_ok=True)
+    fd = _try_lock(os.path.join(SINGLEFLIGHT_LOCK_DIR, f"{name}.lock"))
+    try:
+        yield fd is not None
+    finally:
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "pid": os.getpid(),
+        "in_flight": len(_flights),
+        **_stats,
+    }
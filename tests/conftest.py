@@ -0,0 +1,82 @@
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+# 저장소 루트의 모듈을 바로 import
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmark"))
+
+# 모듈 import 전에 로컬 저장소 경로를 임시 디렉터리로 지정 (저장소의 data/ 디렉터리를 건드리지 않음)
+DATA_DIR = tempfile.mkdtemp(prefix="opendart-tests-")
+for name, path in {
+    "ARTIFACT_STORE_PATH": "artifacts.sqlite",
+    "ATTACHMENT_CACHE_DIR": "attachments",
+    "CORP_CODE_SNAPSHOT_PATH": "corp_codes.table",
+    "DISCLOSURE_FEED_PATH": "disclosure_feed.sqlite",
+    "DISCLOSURE_STORE_PATH": "disclosures.sqlite",
+    "FINANCIAL_WAREHOUSE_DIR": "warehouse",
+    "METRICS_DIR": "metrics",
+    "RATE_LIMIT_PATH": "rate_limit.sqlite",
+    "SINGLEFLIGHT_LOCK_DIR": "locks",
+}.items():
+    os.environ.setdefault(name, os.path.join(DATA_DIR, path))
+os.environ.setdefault("DART_API_KEY", "test-key")
+os.environ.setdefault("REQUIRED_AUTH_KEY", "test-auth")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")  # 호출 한도 테스트에서만 켬
+
+
+@pytest.fixture(scope="session")
+def fake_server():
+    # 벤치마크용 OpenDART 대체 서버를 임의 포트로 실행
+    import fake_dart
+    settings = fake_dart.Settings()
+    server = fake_dart.serve(0, settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, settings
+    server.shutdown()
+
+
+@pytest.fixture
+def fake_dart(fake_server, monkeypatch):
+    # 대체 서버를 DART로 사용하는 클라이언트 (기업 고유번호는 세션에서 한 번만 내려받음)
+    # 반환값은 대체 서버 설정 (settings.requests: 엔드포인트별 요청 수)
+    import dart_client
+    server, settings = fake_server
+    monkeypatch.setattr(dart_client, "DART_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    dart_client.init_client()
+    with settings.lock:
+        settings.requests.clear()
+    settings.error_rate = 0.0
+    yield settings
+    settings.error_rate = 0.0
+
+
+@pytest.fixture
+def api(fake_dart, tmp_path, monkeypatch):
+    # 대체 서버를 DART로 사용하는 /api/dart 호출 (응답 캐시·디스크 저장소는 테스트마다 새로 만들고 시작 시 백그라운드 작업은 실행하지 않음)
+    # api(query_type=..., company=...) → httpx 응답
+    from starlette.testclient import TestClient
+    import artifact_store
+    import main
+    import response_cache
+    monkeypatch.setattr(response_cache, "cache", response_cache.ResponseCache(64 * 1024 * 1024, 10000))
+    monkeypatch.setattr(artifact_store, "ARTIFACT_STORE_PATH", str(tmp_path / "artifacts.sqlite"))
+    monkeypatch.setattr(artifact_store, "_local", artifact_store.threading.local())
+    client = TestClient(main.app)
+
+    def post(path="/api/dart", headers=None, **body):
+        return client.post(path, json={"auth_key": os.environ["REQUIRED_AUTH_KEY"], "company": "삼성전자", **body},
+                           headers=headers)
+
+    return post
+
+
+@pytest.fixture(autouse=True)
+def fresh_semaphores(monkeypatch):
+    # 쿼리 타입별 동시성 세마포어는 처음 대기한 이벤트 루프에 묶이므로 테스트(asyncio.run)마다 새로 만든다
+    import upstream
+    monkeypatch.setattr(upstream, "_semaphores", {})
@@ -0,0 +1,123 @@
+import asyncio
+import contextvars
+import json
+
+import pytest
+
+import admission
+
+
+@pytest.fixture(autouse=True)
+def counters(monkeypatch):
+    monkeypatch.setattr(admission, "_inflight", 0)
+    monkeypatch.setattr(admission, "_stats", dict.fromkeys(admission._stats, 0))
+    monkeypatch.setattr(admission, "ADMISSION_ENABLED", True)
+
+
+def test_deadlines():
+    assert admission.deadline_for("document") == 60
+    assert admission.deadline_for("company") == admission.REQUEST_DEADLINE_DEFAULT
+    assert admission.deadline_for("company", 1000) == admission.REQUEST_DEADLINE_MAX
+    assert admission.deadline_for("company", 0.01) == 0.1
+
+    def run():
+        assert admission.remaining() is None and admission.within_deadline(5) == 5
+        admission.begin("company", 2)
+        assert 0 < admission.remaining() <= 2
+        assert admission.within_deadline(5) <= 2 and admission.within_deadline(1) == 1
+        assert admission.http_timeout() <= 2
+        assert not admission.expired()
+
+    contextvars.Context().run(run)
+
+
+def test_queue_checked_once_per_request(monkeypatch):
+    monkeypatch.setattr(admission, "ADMISSION_MAX_QUEUE", 2)
+
+    def run():
+        admission.begin("company")
+        with pytest.raises(admission.Overloaded):
+            admission.admit("company", 2, 0.0)
+        admission.admit("company", 5, 0.0)  # 이미 확인한 요청의 나머지 호출은 거절하지 않음
+
+        admission.begin("company")
+        with pytest.raises(admission.Overloaded):
+            admission.admit("company", 0, admission.ADMISSION_MAX_WAIT + 1)
+
+        admission.begin("company", shed=False)  # 백그라운드 작업은 거절하지 않음
+        admission.admit("company", 100, 100.0)
+
+    contextvars.Context().run(run)
+    assert admission._stats["rejected_queue"] == 1 and admission._stats["rejected_wait"] == 1
+
+
+def test_run_caps_inflight_and_cancels_on_disconnect(monkeypatch):
+    monkeypatch.setattr(admission, "ADMISSION_MAX_INFLIGHT", 1)
+
+    async def run():
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        slow = asyncio.ensure_future(asyncio.sleep(10))
+        first = asyncio.ensure_future(admission.run(receive, slow))
+        await asyncio.sleep(0.01)
+        assert admission._inflight == 1
+        with pytest.raises(admission.Overloaded):
+            await admission.run(receive, asyncio.sleep(0))
+        disconnect.set()
+        with pytest.raises(admission.ClientDisconnected):
+            await first
+        assert slow.cancelled()
+        assert await admission.run(receive, asyncio.sleep(0, "done")) == "done"
+
+    asyncio.run(run())
+    assert admission._inflight == 0
+    assert admission._stats["disconnected"] == 1 and admission._stats["rejected_inflight"] == 1
+
+
+def test_stream_releases_slot_and_cancels_remaining(monkeypatch):
+    monkeypatch.setattr(admission, "ADMISSION_MAX_INFLIGHT", 1)
+
+    async def run():
+        tasks = [asyncio.ensure_future(asyncio.sleep(delay, delay)) for delay in (0.01, 10)]
+        results = admission.stream(tasks)
+        assert admission._inflight == 1
+        with pytest.raises(admission.Overloaded):
+            admission.stream([asyncio.ensure_future(asyncio.sleep(0))])
+        assert await results.__anext__() == 0.01
+        await results.aclose()  # 응답 중 연결 끊김
+        await asyncio.sleep(0.01)
+        assert tasks[1].cancelled()
+
+    asyncio.run(run())
+    assert admission._inflight == 0 and admission._stats["disconnected"] == 1
+
+
+def test_api_overload_and_deadline(api, fake_dart, monkeypatch):
+    monkeypatch.setattr(admission, "ADMISSION_MAX_INFLIGHT", 0)
+    rejected = api(query_type="company_info")
+    assert rejected.status_code == 503 and "Retry-After" in rejected.headers
+    # 스트리밍 일괄 조회도 같은 상한 적용
+    batch = api(path="/api/dart/batch", requests=[{"company": "삼성전자", "query_type": "company_info"}], stream=True)
+    assert batch.status_code == 503
+    assert fake_dart.requests.get("company.json", 0) == 0
+
+    monkeypatch.setattr(admission, "ADMISSION_MAX_INFLIGHT", 10)
+    monkeypatch.setattr(fake_dart, "latency", 2.0)
+    monkeypatch.setattr(fake_dart, "jitter", 0.0)
+    assert api(query_type="company_info", timeout=0.3).status_code == 504
+
+
+def test_api_streamed_batch(api, fake_dart):
+    batch = api(path="/api/dart/batch", stream=True, requests=[
+        {"company": "삼성전자", "query_type": "company_info"},
+        {"company": "삼성전자", "query_type": "not_a_query_type"},
+    ])
+    assert batch.status_code == 200, batch.text
+    lines = sorted((json.loads(line) for line in batch.content.splitlines()), key=lambda item: item["index"])
+    assert lines[0]["data"][0]["corp_code"] == "00126380"
+    assert lines[1]["status"] == "error"
+    assert admission._inflight == 0 and admission._stats["admitted"] == 1
@@ -0,0 +1,52 @@
+import pytest
+
+import circuit_breaker
+
+# 쿼리 타입(및 백그라운드 작업 타입) → OpenDART 엔드포인트 계열
+EXPECTED_FAMILIES = {
+    "disclosure": "list",
+    "report": "list",
+    "disclosure_date": "list",
+    "disclosure_date_ex": "list",
+    "disclosure_ticker": "list",
+    "disclosure_sync": "list",
+    "disclosure_feed": "list",
+    "company": "company",
+    "company_info": "company",
+    "company_code": "report",  # 로컬 인덱스 조회 (DART 호출 없음)
+    "corp_codes": "company",
+    "warehouse_ingest": "company",
+    "report_content": "finstate",
+    "financial_timeseries": "finstate",
+    "section_financial": "finstate",
+    "full_financial": "finstate",
+    "multi_financial": "finstate",
+    "report_key": "report",
+    "biz_overview": "report",
+    "dividend": "report",
+    "executive": "report",
+    "capital": "report",
+    "audit": "report",
+    "major_shareholder": "report",
+    "major_shareholder_exec": "report",
+    "stock_suspension": "report",
+    "stock_change": "report",
+    "event": "report",
+    "regstate": "report",
+    "document": "document",
+    "retrieve": "document",
+    "sub_docs": "document",
+    "attach_docs": "document",
+    "attach_files": "document",
+    "attachment": "document",
+    "download": "report",  # URL만 만들어 반환 (DART 호출 없음)
+}
+
+
+@pytest.mark.parametrize("query_type,family", sorted(EXPECTED_FAMILIES.items()))
+def test_family_for(query_type, family):
+    assert circuit_breaker.family_for(query_type) == family
+
+
+def test_every_mapped_query_type_is_covered():
+    assert set(circuit_breaker.ENDPOINT_FAMILIES) <= set(EXPECTED_FAMILIES)
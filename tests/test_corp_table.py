@@ -0,0 +1,35 @@
+import pandas as pd
+
+import corp_table
+
+
+def _table(tmp_path, names):
+    corp_codes = pd.DataFrame({
+        "corp_code": [f"{i:08d}" for i in range(1, len(names) + 1)],
+        "corp_name": names,
+        "stock_code": [""] * len(names),
+        "modify_date": ["20240101"] * len(names),
+    })
+    path = str(tmp_path / "corp_codes.table")
+    corp_table.write(corp_codes, path)
+    return corp_table.open_table(path)
+
+
+def test_contains_does_not_match_across_adjacent_names(tmp_path):
+    # 고유번호 순으로 '삼성' 바로 뒤에 '전자'가 저장되어 바이트 묶음에는 '삼성전자'가 이어져 있음
+    table = _table(tmp_path, ["삼성", "전자", "한화"])
+    assert table.contains("성전") == []
+    assert table.contains("삼성전자") == []
+    assert table.contains("자한") == []
+
+
+def test_contains_finds_match_after_straddling_candidate(tmp_path):
+    table = _table(tmp_path, ["삼성", "전자", "성전기"])
+    assert table.contains("성전") == [2]
+
+
+def test_contains_reports_each_row_once(tmp_path):
+    table = _table(tmp_path, ["삼성전자", "삼성삼성", "엘지"])
+    assert table.contains("삼성") == [0, 1]
+    assert table.contains("지") == [2]
+    assert table.contains("") == [0, 1, 2]
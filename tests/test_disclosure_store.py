@@ -0,0 +1,71 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import circuit_breaker
+import disclosure_store
+import upstream
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(disclosure_store, "DISCLOSURE_STORE_PATH", str(tmp_path / "disclosures.sqlite"))
+    monkeypatch.setattr(disclosure_store, "_local", disclosure_store.threading.local())
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    return tmp_path
+
+
+def _frame(*reports):
+    return pd.DataFrame([{
+        "corp_code": "00126380", "corp_name": "삼성전자", "stock_code": "005930", "corp_cls": "Y",
+        "report_nm": report_nm, "rcept_no": rcept_no, "flr_nm": "삼성전자", "rcept_dt": rcept_no[:8], "rm": "",
+    } for rcept_no, report_nm in reports])
+
+
+def _finals():
+    return dict(disclosure_store._connection().execute("SELECT rcept_no, final FROM disclosures").fetchall())
+
+
+def test_amendment_supersedes_original(store):
+    disclosure_store.ingest("20240315", {"A": _frame(("20240315000001", "사업보고서 (2023.12)"))}, time.time())
+    disclosure_store.ingest("20240320", {"A": _frame(("20240320000001", "[기재정정]사업보고서 (2023.12)"))}, time.time())
+    assert _finals() == {"20240315000001": 0, "20240320000001": 1}
+
+
+def test_original_stored_after_amendment(store):
+    # 과거 날짜는 최근 순으로 채우므로 정정 보고서가 먼저 저장된다
+    disclosure_store.ingest("20240320", {"A": _frame(("20240320000001", "[기재정정]사업보고서 (2023.12)"))}, time.time())
+    disclosure_store.ingest("20240315", {"A": _frame(("20240315000001", "사업보고서 (2023.12)"))}, time.time())
+    assert _finals() == {"20240315000001": 0, "20240320000001": 1}
+    assert list(disclosure_store.query("20240301", "20240331")["rcept_no"]) == ["20240320000001"]
+    assert len(disclosure_store.query("20240301", "20240331", final=False)) == 2
+
+
+def test_repeated_reports_without_amendment_stay_final(store):
+    frame = _frame(("20240315000001", "주요사항보고서(자기주식취득결정)"), ("20240315000002", "주요사항보고서(자기주식취득결정)"))
+    disclosure_store.ingest("20240315", {"B": frame}, time.time())
+    assert _finals() == {"20240315000001": 1, "20240315000002": 1}
+
+
+def test_sync_marks_past_days_complete(store, fake_dart, monkeypatch):
+    monkeypatch.setattr(disclosure_store, "DISCLOSURE_SYNC_BACKFILL", 1)
+    result = asyncio.run(disclosure_store.sync_once())
+    assert result["status"] == "success"
+    days = dict(disclosure_store._connection().execute("SELECT day, complete FROM synced_days").fetchall())
+    assert days == {disclosure_store.today(): 0, disclosure_store._shift(disclosure_store.today(), -1): 1}
+    assert fake_dart.requests["list.json"] >= 2 * len(disclosure_store.KINDS)
+
+
+def test_throttled_sync_does_not_mark_day_complete(store, fake_dart, monkeypatch):
+    # DART가 요청 제한(020)으로 응답하면 빈 결과로 저장하지 않고 동기화를 중단
+    monkeypatch.setattr(disclosure_store, "DISCLOSURE_SYNC_BACKFILL", 1)
+    monkeypatch.setattr(upstream, "UPSTREAM_RETRIES", 0)
+    monkeypatch.setattr(fake_dart, "error_kinds", ("020",))
+    fake_dart.error_rate = 1.0
+    with pytest.raises(circuit_breaker.UpstreamUnavailable):
+        asyncio.run(disclosure_store.sync_once())
+    assert disclosure_store._connection().execute("SELECT COUNT(*) FROM synced_days").fetchone()[0] == 0
+    assert disclosure_store.coverage("20240101", disclosure_store.today()) is None
@@ -0,0 +1,73 @@
+import pytest
+
+import document_index
+import fake_dart as fake
+
+XML = ("<DOCUMENT><DOCUMENT-NAME>사업보고서</DOCUMENT-NAME><BODY>"
+       "<SECTION-1><TITLE>I. 회사의 개요</TITLE><P>개요 본문 &amp; 설명</P>"
+       "<SECTION-2><TITLE>1. 회사의 개요</TITLE><TABLE><TR><TD>항목</TD><TD>값</TD></TR></TABLE></SECTION-2>"
+       "<SECTION-2><TITLE>2. 회사의 연혁</TITLE><P>연혁 본문</P></SECTION-2></SECTION-1>"
+       "<SECTION-1><TITLE>II. 사업의 내용</TITLE><P>사업 본문</P></SECTION-1></BODY></DOCUMENT>")
+
+
+def test_xml_sections_and_text():
+    index = document_index.build(XML)
+    assert [(item["id"], item["title"], item["level"]) for item in index.sections] == [
+        ("1", "I. 회사의 개요", 1), ("2", "1. 회사의 개요", 2), ("3", "2. 회사의 연혁", 2), ("4", "II. 사업의 내용", 1)]
+    assert "<" not in index.text and "개요 본문 & 설명" in index.text
+    assert "항목\t값\t" in index.text
+    first, child, _, last = index.sections
+    # 상위 구간은 하위 구간을 포함하고 다음 같은 수준 제목에서 끝난다
+    assert first["start"] <= child["start"] < child["end"] <= first["end"] == last["start"]
+    assert last["end"] == len(index.text)
+
+
+def test_text_headings():
+    text = "머리말\nI. 회사의 개요\n1. 개요\n본문\nII. 사업의 내용\n사업 본문\n"
+    index = document_index.build(text)
+    assert [item["title"] for item in index.sections] == ["I. 회사의 개요", "1. 개요", "II. 사업의 내용"]
+    assert index.text == text
+
+
+def test_views():
+    index = document_index.build(XML)
+    toc = document_index.view(index, toc=True)
+    assert toc["length"] == len(index.text) and len(toc["sections"]) == 4
+
+    section = document_index.view(index, section="연혁")
+    assert section["data"].startswith("2. 회사의 연혁") and "연혁 본문" in section["data"]
+    assert document_index.view(index, section="4")["data"].startswith("II. 사업의 내용")
+
+    ranged = document_index.view(index, section="1", char_start=3, char_end=8)
+    assert ranged["data"] == index.text[index.sections[0]["start"] + 3:index.sections[0]["start"] + 8]
+    assert ranged["range"]["start"] == index.sections[0]["start"] + 3
+
+    pages = [document_index.view(index, page=number, page_size=10) for number in range(1, 100)
+             if number <= document_index.view(index, page=1, page_size=10)["page"]["total_pages"]]
+    assert "".join(page["data"] for page in pages) == index.text
+
+    with pytest.raises(LookupError):
+        document_index.view(index, section="없는 목차")
+    for bad in ({"char_start": 5, "char_end": 2}, {"page": 0}, {"page": 999}, {"page_size": document_index.DOCUMENT_MAX_PAGE_SIZE + 1}):
+        with pytest.raises(ValueError):
+            document_index.view(index, **bad)
+
+
+def test_api_document_views(api, fake_dart):
+    rcept_no = fake.rcept_nos()[0]
+    toc = api(query_type="document", rcept_no=rcept_no, toc=True)
+    assert toc.status_code == 200, toc.text
+    sections = toc.json()["sections"]
+    assert len(sections) == 10 and sections[2]["title"] == "3. 목차 3"
+
+    section = api(query_type="document", rcept_no=rcept_no, section="3")
+    assert section.headers["X-Cache"] == "HIT"
+    assert section.json()["section"]["length"] == len(section.json()["data"]) == sections[2]["length"]
+
+    page = api(query_type="document", rcept_no=rcept_no, page=2, page_size=5000).json()
+    assert page["page"]["total_pages"] > 2 and 0 < len(page["data"]) <= 5000
+    assert fake_dart.requests["document.xml"] == 1
+
+    assert api(query_type="document", rcept_no=rcept_no, section="없는 목차").status_code == 404
+    assert api(query_type="document", rcept_no=rcept_no, page=0).status_code == 400
+    assert api(query_type="company", toc=True).status_code == 400
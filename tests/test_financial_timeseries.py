@@ -0,0 +1,80 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+import financial_timeseries
+
+
+def _report(year, code, revenue, cumulative="", assets="100", fs_div="CFS"):
+    return pd.DataFrame([
+        {"account_nm": "자산총계", "fs_div": fs_div, "sj_div": "BS", "ord": "1", "thstrm_amount": assets, "thstrm_add_amount": ""},
+        {"account_nm": "매출액", "fs_div": fs_div, "sj_div": "IS", "ord": "2", "thstrm_amount": revenue,
+         "thstrm_add_amount": cumulative},
+    ])
+
+
+def test_parse_periods():
+    assert financial_timeseries.parse_years("2021", "2023", None) == ["2021", "2022", "2023"]
+    assert financial_timeseries.parse_years(None, None, "2022") == ["2022"]
+    for args in (("2023", "2021", None), (None, None, None), ("2000", "2023", None), ("2023", "2999", None)):
+        with pytest.raises(ValueError):
+            financial_timeseries.parse_years(*args)
+    assert financial_timeseries.parse_reprt_codes("11011, 11013") == ["11013", "11011"]
+    assert financial_timeseries.parse_reprt_codes(None) == ["11013", "11012", "11014", "11011"]
+    with pytest.raises(ValueError):
+        financial_timeseries.parse_reprt_codes("11011,99999")
+
+
+def test_pivot_reported_amounts():
+    frames = {
+        ("2023", "11013"): _report("2023", "11013", "1,000"),
+        ("2023", "11011"): _report("2023", "11011", "4,600", assets="130"),
+        ("2022", "11011"): pd.concat([_report("2022", "11011", "4,000", fs_div="OFS"),
+                                      _report("2022", "11011", "3,900")]),
+    }
+    table = financial_timeseries.pivot(frames)
+    assert list(table.columns) == ["sj_div", "account_nm", "2022FY", "2023Q1", "2023FY"]
+    revenue = table[table["account_nm"] == "매출액"].iloc[0]
+    assert (revenue["2022FY"], revenue["2023Q1"], revenue["2023FY"]) == (3900, 1000, 4600)  # 연결 우선
+    assert financial_timeseries.pivot(frames, fs_div="OFS")["2022FY"].tolist() == [100, 4000]
+
+
+def test_pivot_quarterly_differences():
+    frames = {
+        ("2023", "11013"): _report("2023", "11013", "1,000", cumulative="1,000", assets="100"),
+        ("2023", "11012"): _report("2023", "11012", "1,200", cumulative="2,200", assets="110"),
+        ("2023", "11014"): _report("2023", "11014", "1,100", cumulative="3,300", assets="120"),
+        ("2023", "11011"): _report("2023", "11011", "4,600", assets="130"),
+    }
+    table = financial_timeseries.pivot(frames, quarterly=True).set_index("account_nm")
+    assert table.loc["매출액", ["2023Q1", "2023Q2", "2023Q3", "2023Q4"]].tolist() == [1000, 1200, 1100, 1300]
+    assert table.loc["자산총계", ["2023Q1", "2023Q2", "2023Q3", "2023Q4"]].tolist() == [100, 110, 120, 130]
+
+
+def test_fetch_reports_failed_periods():
+    async def fetch_period(year, code):
+        if year == "2022":
+            raise ValueError("조회 실패")
+        return _report(year, code, "10")
+
+    payload = asyncio.run(financial_timeseries.fetch(fetch_period, ["2022", "2023"], ["11011"]))
+    assert payload["status"] == "partial"
+    assert payload["failed_periods"] == [{"bsns_year": "2022", "reprt_code": "11011", "error": "조회 실패"}]
+    assert list(payload["data"].columns) == ["sj_div", "account_nm", "2023FY"]
+    with pytest.raises(ValueError):
+        asyncio.run(financial_timeseries.fetch(fetch_period, ["2022"], ["11011"]))
+
+
+def test_api_shares_report_content_cache(api, fake_dart):
+    response = api(query_type="financial_timeseries", start_year="2022", end_year="2023", reprt_codes="11011")
+    assert response.status_code == 200, response.text
+    rows = response.json()["data"]
+    assert set(rows[0]) == {"sj_div", "account_nm", "2022FY", "2023FY"}
+    assert {row["account_nm"] for row in rows} >= {"매출액", "자산총계"}
+    assert fake_dart.requests["fnlttSinglAcnt.json"] == 2
+
+    period = api(query_type="report_content", bsns_year="2023", reprt_code="11011")
+    assert period.headers["X-Cache"] == "HIT"
+    assert fake_dart.requests["fnlttSinglAcnt.json"] == 2
+    assert api(query_type="financial_timeseries", start_year="2023", end_year="2021").status_code == 400
@@ -0,0 +1,43 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import disclosure_store
+import fake_dart as fake
+import financial_warehouse
+import response_cache
+
+
+@pytest.fixture
+def warehouse(tmp_path, monkeypatch):
+    monkeypatch.setattr(financial_warehouse, "FINANCIAL_WAREHOUSE_DIR", str(tmp_path / "warehouse"))
+    monkeypatch.setattr(disclosure_store, "DISCLOSURE_STORE_PATH", str(tmp_path / "disclosures.sqlite"))
+    monkeypatch.setattr(disclosure_store, "_local", disclosure_store.threading.local())
+    monkeypatch.setattr(response_cache, "cache", response_cache.ResponseCache(256 * 1024 * 1024, 100000))
+    return tmp_path
+
+
+def test_ingest_fills_warehouse(warehouse, fake_dart, monkeypatch):
+    # 법인구분은 한 회사만 기업개황으로 확인 (나머지는 이전에 확인한 값)
+    known = {company["corp_code"]: company["corp_cls"] for company in fake.companies()[1:]}
+    monkeypatch.setattr(financial_warehouse, "_load_classes", lambda: dict(known))
+    result = asyncio.run(financial_warehouse.ingest("2023", "11011"))
+    assert result["status"] == "success", result
+    assert result["failed_chunks"] == 0
+
+    frame = financial_warehouse.load("2023", "11011")
+    assert len(frame) == result["companies"] > 1000
+    samsung = frame[frame["corp_code"] == "00126380"].iloc[0]
+    assert samsung["stock_code"] == "005930" and samsung["corp_cls"] == "Y"
+    assert samsung["revenue"] > 0
+    assert np.isclose(samsung["operating_margin"], samsung["operating_income"] / samsung["revenue"] * 100)
+    assert fake_dart.requests["company.json"] == 1
+    # 상장사 100개씩 다중회사 주요계정 조회
+    assert fake_dart.requests["fnlttMultiAcnt.json"] == -(-len(frame) // 100)
+
+    total, rows = financial_warehouse.screen(frame, markets=["Y"], filters=[{"field": "revenue", "op": ">", "value": 0}],
+                                             sort_by="revenue", limit=10)
+    assert 0 < total <= len(frame)
+    assert len(rows) == 10
+    assert rows["revenue"].is_monotonic_decreasing
@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+import frame_query
+
+
+def _frame():
+    return pd.DataFrame({
+        "account_nm": ["매출액", "영업이익", "당기순이익", "자산총계"],
+        "sj_div": ["IS", "IS", "IS", "BS"],
+        "thstrm_amount": ["1,200", "150", "-30", "9,000"],
+        "ord": ["10", "9", "11", "2"],
+    })
+
+
+def test_parse_validates_input():
+    assert frame_query.parse() is None
+    spec = frame_query.parse("account_nm, thstrm_amount", {"sj_div": "IS", "account_nm": ["매출액"], "ord": {">": 1}},
+                             "-thstrm_amount,ord", 10, None)
+    assert spec["fields"] == ["account_nm", "thstrm_amount"]
+    assert spec["where"] == [("sj_div", "==", "IS"), ("account_nm", "in", ["매출액"]), ("ord", ">", 1)]
+    assert spec["sort"] == [("thstrm_amount", False), ("ord", True)]
+    assert (spec["limit"], spec["offset"]) == (10, 0)
+    for bad in ({"where": {"a": {"~": 1}}}, {"where": {"a": {"in": "x"}}}, {"limit": -1}, {"offset": -1}):
+        with pytest.raises(ValueError):
+            frame_query.parse(**bad)
+
+
+def test_where_on_amount_strings():
+    spec = frame_query.parse(where={"thstrm_amount": {">=": 150, "<": 5000}})
+    total, result = frame_query.apply(_frame(), spec)
+    assert total == 2
+    assert list(result["account_nm"]) == ["매출액", "영업이익"]
+    total, result = frame_query.apply(_frame(), frame_query.parse(where={"account_nm": {"contains": "이익"}}))
+    assert list(result["account_nm"]) == ["영업이익", "당기순이익"]
+    total, result = frame_query.apply(_frame(), frame_query.parse(where={"sj_div": {"not_in": ["IS"]}}))
+    assert list(result["account_nm"]) == ["자산총계"]
+
+
+def test_sort_numeric_strings_and_page():
+    spec = frame_query.parse(fields="account_nm", sort="-thstrm_amount", limit=2, offset=1)
+    total, result = frame_query.apply(_frame(), spec)
+    assert total == 4
+    assert list(result.columns) == ["account_nm"]
+    assert list(result["account_nm"]) == ["매출액", "영업이익"]  # 9,000 > 1,200 > 150 > -30
+    _, result = frame_query.apply(_frame(), frame_query.parse(sort="ord"))
+    assert list(result["ord"]) == ["2", "9", "10", "11"]
+
+
+def test_unknown_columns():
+    with pytest.raises(KeyError):
+        frame_query.apply(_frame(), frame_query.parse(fields="account_nm,missing"))
+    assert frame_query.apply(pd.DataFrame(), frame_query.parse(fields="missing"))[0] == 0
+
+
+def test_api_slices_cached_result(api, fake_dart):
+    body = {"query_type": "report_content", "bsns_year": "2023", "reprt_code": "11011"}
+    full = api(**body)
+    assert full.status_code == 200, full.text
+    rows = full.json()["data"]
+
+    sliced = api(fields="account_nm,thstrm_amount", where={"sj_div": "IS"}, sort="-thstrm_amount", limit=3, **body)
+    assert sliced.status_code == 200, sliced.text
+    assert sliced.headers["X-Cache"] == "HIT"  # 같은 원본 캐시 항목에서 잘라 응답
+    payload = sliced.json()
+    assert payload["total"] == sum(1 for row in rows if row["sj_div"] == "IS")
+    assert len(payload["data"]) == 3 and set(payload["data"][0]) == {"account_nm", "thstrm_amount"}
+    amounts = [int(row["thstrm_amount"].replace(",", "")) for row in payload["data"]]
+    assert amounts == sorted(amounts, reverse=True)
+    assert fake_dart.requests["fnlttSinglAcnt.json"] == 1
+
+    assert api(where={"sj_div": {"~": 1}}, **body).status_code == 400
+    assert api(fields="missing", **body).status_code == 400
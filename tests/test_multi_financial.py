@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+import dart_client
+import fake_dart as fake
+import multi_financial
+import response_cache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "cache", response_cache.ResponseCache(64 * 1024 * 1024, 10000))
+    return response_cache.cache
+
+
+def _codes(count):
+    return [company["corp_code"] for company in fake.companies()[:count]]
+
+
+def test_parse_corp_codes():
+    assert multi_financial.parse_corp_codes(" 00126380, 00164779,,00126380 ") == ["00126380", "00164779"]
+
+
+def test_fetch_in_chunks(fake_dart, cache, monkeypatch):
+    monkeypatch.setattr(multi_financial, "MULTI_FINANCIAL_CHUNK_SIZE", 40)
+    codes = _codes(100)
+    payload = asyncio.run(multi_financial.fetch(dart_client.get_client(), codes, "2023", "11011"))
+    assert payload["status"] == "success", payload.get("failed_chunks")
+    assert fake_dart.requests["fnlttMultiAcnt.json"] == 3
+    assert set(payload["data"]["corp_code"]) == set(codes)
+
+
+def test_cached_corps_are_not_fetched_or_counted(fake_dart, cache):
+    client = dart_client.get_client()
+    codes = _codes(30)
+    asyncio.run(multi_financial.fetch(client, codes[:20], "2023", "11011"))
+    payload = asyncio.run(multi_financial.fetch(client, codes, "2023", "11011"))
+    # 두 번째 조회는 캐시에 없던 10개 회사만 요청
+    assert fake_dart.requests["fnlttMultiAcnt.json"] == 2
+    assert set(payload["data"]["corp_code"]) == set(codes)
+    # 회사 단위 캐시 조회는 적중률 통계에 넣지 않음
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_account_filter(fake_dart, cache):
+    payload = asyncio.run(multi_financial.fetch(dart_client.get_client(), _codes(5), "2023", "11011", "매출액"))
+    data = payload["data"]
+    assert set(data["account_nm"]) == {"매출액"}
+    assert len(data) >= 5
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+import dart_client
+import rate_limiter
+import upstream
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    # 테스트마다 빈 한도 파일 사용 (스레드별 연결도 새로 연다)
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_PATH", str(tmp_path / "rate_limit.sqlite"))
+    monkeypatch.setattr(rate_limiter, "_local", rate_limiter.threading.local())
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_ENABLED", True)
+    return tmp_path
+
+
+def test_burst_then_rate_limited(ledger, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "DART_RATE_BURST", 3)
+    monkeypatch.setattr(rate_limiter, "DART_RATE_PER_MINUTE", 60)
+    for _ in range(3):
+        assert rate_limiter.try_acquire("interactive")[0]
+    ok, wait, reason = rate_limiter.try_acquire("interactive")
+    assert not ok and reason == "rate"
+    assert 0 < wait <= 1.0
+    assert rate_limiter.stats()["daily_used"] == 3
+
+
+def test_lower_priority_keeps_reserve(ledger, monkeypatch):
+    # bulk 등급은 버스트의 50%를 상위 등급 몫으로 남긴다
+    monkeypatch.setattr(rate_limiter, "DART_RATE_BURST", 10)
+    monkeypatch.setattr(rate_limiter, "DART_RATE_PER_MINUTE", 0.001)
+    granted = 0
+    while rate_limiter.try_acquire("bulk")[0]:
+        granted += 1
+    assert granted == 5
+    assert rate_limiter.try_acquire("interactive")[0]
+
+
+def test_daily_quota_share(ledger, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "DART_DAILY_QUOTA", 10)
+    for _ in range(8):
+        assert rate_limiter.try_acquire("bulk")[0]
+    ok, wait, reason = rate_limiter.try_acquire("bulk")
+    assert not ok and reason == "quota"
+    assert wait > 0
+    # 상위 등급은 남은 한도를 계속 사용
+    assert rate_limiter.try_acquire("interactive")[0]
+    with pytest.raises(rate_limiter.RateLimited):
+        asyncio.run(rate_limiter.acquire("multi_financial"))
+
+
+def test_acquire_waits_for_tokens(ledger, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "DART_RATE_BURST", 1)
+    monkeypatch.setattr(rate_limiter, "DART_RATE_PER_MINUTE", 600)
+    asyncio.run(rate_limiter.acquire("company"))
+    asyncio.run(rate_limiter.acquire("company", max_wait=1.0))
+    with pytest.raises(rate_limiter.RateLimited):
+        asyncio.run(rate_limiter.acquire("company", max_wait=0.0))
+
+
+def test_charges_every_http_request(ledger, fake_dart):
+    # 목록 조회 1회가 여러 페이지를 요청하면 페이지 수만큼 차감된다
+    client = dart_client.get_client()
+    frame = asyncio.run(upstream.call("disclosure_date", client.list, start="2024-01-01", end="2024-01-31"))
+    pages = fake_dart.requests["list.json"]
+    assert pages > 1
+    assert len(frame) > 100
+    assert rate_limiter.stats()["daily_used"] == pages
+
+
+def test_charge_outside_upstream_is_free(ledger, fake_dart):
+    # upstream.call 밖에서 보낸 요청(시작 시 다운로드 등)은 차감하지 않음
+    dart_client.get_client().company("00126380")
+    assert fake_dart.requests["company.json"] == 1
+    assert rate_limiter.stats()["daily_used"] == 0
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+import response_cache
+from response_cache import DAY, MINUTE
+
+
+def test_key_ignores_presentation_fields():
+    base = {"query_type": "report_content", "corp_code": "00126380", "bsns_year": "2023", "reprt_code": "11011"}
+    key = response_cache.cache_key(base)
+    assert response_cache.cache_key({**base, "auth_key": "a", "orient": "columnar", "fields": "account_nm",
+                                     "limit": 10, "timeout": 3, "cache_control": "no-cache"}) == key
+    assert response_cache.cache_key({**base, "bsns_year": " 2023 "}) == key
+    assert response_cache.cache_key({**base, "bsns_year": "2022"}) != key
+
+
+def test_key_ignores_company_when_corp_code_given():
+    base = {"query_type": "company", "corp_code": "00126380"}
+    assert response_cache.cache_key({**base, "company": "삼성전자"}) == response_cache.cache_key({**base, "company": "005930"})
+    # 고유번호가 없으면 기업명이 키에 포함됨
+    assert (response_cache.cache_key({"query_type": "company", "company": "삼성전자"})
+            != response_cache.cache_key({"query_type": "company", "company": "SK하이닉스"}))
+    # 접수번호 기준 조회는 기업명과 무관
+    document = {"query_type": "document", "rcept_no": "20240315000001"}
+    assert response_cache.cache_key({**document, "company": "a"}) == response_cache.cache_key({**document, "company": "b"})
+
+
+def test_ttl_by_query_type():
+    assert response_cache.ttl_for("document", {}) == 30 * DAY
+    assert response_cache.ttl_for("disclosure", {}) == 10 * MINUTE
+    assert response_cache.ttl_for("company_code", {}) == 0
+    assert response_cache.ttl_for("disclosure_date", {"date": "2020-01-02"}) == DAY
+    assert response_cache.ttl_for("disclosure_date", {"date": time.strftime("%Y%m%d")}) == response_cache.TODAY_TTL
+    assert response_cache._parse_ttls("dividend=60, disclosure=5,bad") == {"dividend": 60, "disclosure": 5}
+
+
+def test_expiry_stale_and_eviction():
+    cache = response_cache.ResponseCache(max_bytes=100, max_entries=3)
+    cache.set("a", "A", 60, 10)
+    assert cache.get("a")[0] == "A"
+    cache.entries["a"][1] = time.time() - 1  # 만료
+    assert cache.get("a") is None
+    assert cache.get_stale("a", 60)[0] == "A"
+    assert (cache.hits, cache.misses, cache.stale_hits) == (1, 1, 1)
+
+    for key in "bcd":
+        cache.set(key, key, 60, 10)
+    assert "a" not in cache.entries  # 항목 수 상한으로 가장 오래된 항목 제거
+    cache.get("b")
+    cache.set("e", "e", 60, 81)  # 크기 상한: 최근에 읽은 b는 남고 c, d 제거
+    assert list(cache.entries) == ["b", "e"]
+    assert cache.size == 91
+    cache.set("big", "x", 60, 101)  # 상한보다 큰 항목은 저장하지 않음
+    cache.set("zero", "x", 0, 1)
+    assert list(cache.entries) == ["b", "e"]
+
+
+def test_company_request_is_cached(api, fake_dart):
+    first = api(query_type="company")
+    assert first.status_code == 200, first.text
+    assert first.headers["X-Cache"] == "MISS"
+    assert first.json()["data"]["corp_code"] == "00126380"
+    # 기업명·종목코드·고유번호 모두 같은 캐시 항목 사용
+    for company in ("삼성전자", "005930", "00126380"):
+        response = api(query_type="company", company=company)
+        assert response.headers["X-Cache"] == "HIT"
+        assert response.content == first.content
+    assert fake_dart.requests["company.json"] == 1
+
+    refreshed = api(query_type="company", headers={"Cache-Control": "no-cache"})
+    assert refreshed.headers["X-Cache"] == "MISS"
+    assert fake_dart.requests["company.json"] == 2
+    assert api(query_type="company", cache_control="no-store").headers["X-Cache"] == "BYPASS"
+    assert fake_dart.requests["company.json"] == 3
@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+import serializer
+
+
+def _frame():
+    return pd.DataFrame({
+        "rcept_no": ["20240315000001", "20240316000002", "20240317000003"],
+        "rcept_dt": pd.to_datetime(["2024-03-15", "2024-03-16", None]),
+        "amount": [1.5, np.nan, 3.0],
+        "count": np.array([1, 2, 3], dtype=np.int64),
+        "name": ["삼성전자", None, "벤치기업"],
+    })
+
+
+def test_records_match_legacy_rules():
+    # 날짜는 YYYY-MM-DD, 결측값은 "", 한글은 그대로
+    rows = json.loads(serializer.encode_frame(_frame()))
+    assert rows[0] == {"rcept_no": "20240315000001", "rcept_dt": "2024-03-15", "amount": 1.5, "count": 1, "name": "삼성전자"}
+    assert rows[1]["amount"] == "" and rows[1]["name"] == ""
+    assert rows[2]["rcept_dt"] == ""
+    assert "삼성전자".encode("utf-8") in serializer.encode_frame(_frame())
+
+
+def test_columnar_has_same_values():
+    frame = _frame()
+    columnar = json.loads(serializer.encode_frame(frame, "columnar"))
+    records = json.loads(serializer.encode_frame(frame))
+    assert columnar["columns"] == list(frame.columns)
+    assert [dict(zip(columnar["columns"], row)) for row in zip(*columnar["values"])] == records
+
+
+def test_empty_frames():
+    assert serializer.encode_frame(pd.DataFrame()) == b"[]"
+    assert json.loads(serializer.encode_frame(pd.DataFrame(), "columnar")) == {"columns": [], "values": []}
+
+
+def test_render_payload():
+    payload = {"status": "success", "data": _frame(), "total": np.int64(3), "failed_chunks": [{"corp_codes": ["1"]}]}
+    body = json.loads(serializer.render(payload))
+    assert body["status"] == "success" and body["total"] == 3
+    assert len(body["data"]) == 3
+    assert json.loads(serializer.render({"data": {"corp_code": "00126380"}})) == {"data": {"corp_code": "00126380"}}
+
+
+def test_ndjson_chunks_match_records():
+    frame = pd.concat([_frame()] * 5, ignore_index=True)
+    lines = b"".join(serializer.iter_ndjson({"status": "success", "data": frame}, chunk_rows=4)).splitlines()
+    assert [json.loads(line) for line in lines[:-1]] == json.loads(serializer.encode_frame(frame))
+    assert json.loads(lines[-1]) == {"_meta": {"status": "success"}}
+
+
+def test_api_orients_and_stream(api):
+    body = {"query_type": "disclosure", "start_date": "2024-01-01", "end_date": "2024-03-31"}
+    records = api(**body)
+    assert records.status_code == 200, records.text
+    rows = records.json()["data"]
+    assert rows and "rcept_no" in rows[0]
+
+    columnar = api(orient="columnar", **body).json()["data"]
+    assert [dict(zip(columnar["columns"], row)) for row in zip(*columnar["values"])] == rows
+    assert api(orient="xml", **body).status_code == 400
+
+    streamed = api(stream=True, **body)
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    lines = streamed.content.splitlines()
+    assert [json.loads(line) for line in lines[:-1]] == rows
+    assert json.loads(lines[-1])["_meta"]["status"] == "success"
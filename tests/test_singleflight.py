@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import admission
+import singleflight
+
+
+@pytest.fixture
+def locks(tmp_path, monkeypatch):
+    monkeypatch.setattr(singleflight, "SINGLEFLIGHT_LOCK_DIR", str(tmp_path / "locks"))
+    return tmp_path
+
+
+def test_identical_calls_share_one_fetch():
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*(singleflight.do("key", factory) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert [coalesced for _, coalesced in results].count(False) == 1
+    assert {value for value, _ in results} == {"result"}
+    assert "key" not in singleflight._flights
+
+
+def test_shared_fetch_cancelled_when_all_waiters_leave():
+
+    async def run():
+        cancelled = asyncio.Event()
+
+        async def factory():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.ensure_future(singleflight.do("slow", factory)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled.is_set()  # 남은 요청이 있으면 계속 조회
+        waiters[1].cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+    asyncio.run(run())
+
+
+def test_lease_waits_for_other_holder(locks):
+    async def run():
+        order = []
+
+        async def holder():
+            async with singleflight.lease("document:1") as waited:
+                order.append(("holder", waited))
+                await asyncio.sleep(0.2)
+
+        async def follower():
+            await asyncio.sleep(0.05)
+            async with singleflight.lease("document:1") as waited:
+                order.append(("follower", waited))
+
+        await asyncio.gather(holder(), follower())
+        return order
+
+    assert asyncio.run(run()) == [("holder", False), ("follower", True)]
+
+
+def test_lease_wait_is_capped_by_deadline(locks):
+    async def run():
+        async with singleflight.lease("document:2"):
+            admission.begin("document", 0.2)
+            started = time.monotonic()
+            with pytest.raises(admission.DeadlineExceeded):
+                async with singleflight.lease("document:2"):
+                    pass
+            return time.monotonic() - started
+
+    assert asyncio.run(run()) < 1.0
+
+
+def test_concurrent_requests_coalesce(api, fake_dart, monkeypatch):
+    import main
+    monkeypatch.setattr(fake_dart, "latency", 0.2)
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            body = {"auth_key": "test-auth", "company": "삼성전자", "query_type": "company_info"}
+            return await asyncio.gather(*(client.post("/api/dart", json=body) for _ in range(5)))
+
+    responses = asyncio.run(run())
+    assert all(response.status_code == 200 for response in responses)
+    assert sorted(response.headers["X-Cache"] for response in responses) == ["COALESCED"] * 4 + ["MISS"]
+    assert fake_dart.requests["company.json"] == 1
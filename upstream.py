@@ -0,0 +1,242 @@
+import os
+import time
+import random
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any
+
+import admission
+import circuit_breaker
+import metrics
+import rate_limiter
+
+# OpenDartReader 호출(동기 requests I/O + pandas 처리)을 실행할 전용 스레드 풀 설정
+UPSTREAM_MAX_WORKERS = int(os.environ.get("UPSTREAM_MAX_WORKERS", "16"))
+UPSTREAM_DEFAULT_CONCURRENCY = int(os.environ.get("UPSTREAM_DEFAULT_CONCURRENCY", "8"))
+
+# 일시적 오류 재시도 설정 (지수 백오프 + 전체 지터)
+UPSTREAM_RETRIES = int(os.environ.get("UPSTREAM_RETRIES", "2"))
+UPSTREAM_RETRY_BASE_DELAY = float(os.environ.get("UPSTREAM_RETRY_BASE_DELAY", "0.5"))
+UPSTREAM_RETRY_MAX_DELAY = float(os.environ.get("UPSTREAM_RETRY_MAX_DELAY", "8"))
+
+# 쿼리 타입별 동시 실행 상한 (무거운 원문/XBRL 조회는 적게, 가벼운 조회는 많게)
+DEFAULT_CONCURRENCY_LIMITS = {
+    "document": 2,
+    "retrieve": 2,
+    "full_financial": 2,
+    "multi_financial": 2,
+    "section_financial": 4,
+    "disclosure_date": 4,
+    "disclosure_date_ex": 4,
+    "company_code": 16,
+    "company": 12,
+    "document_index": 2,
+    "attachment": 4,
+    "corp_codes": 1,  # 기업 고유번호 전체 다운로드 (워커당 1건)
+}
+
+
+def _parse_limits(value: str) -> Dict[str, int]:
+    # "document=2,retrieve=1" 형식의 환경변수 파싱
+    limits = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        key, limit = item.split("=", 1)
+        limits[key.strip()] = int(limit)
+    return limits
+
+
+CONCURRENCY_LIMITS = {**DEFAULT_CONCURRENCY_LIMITS, **_parse_limits(os.environ.get("UPSTREAM_CONCURRENCY", ""))}
+
+# DART API를 호출하지 않는 로컬 작업 (호출 한도 차감 제외)
+LOCAL_QUERY_TYPES = {"warmup", "artifact_store", "rate_limiter", "document_index", "disclosure_store", "warehouse", "frame_query", "compression", "metrics"}
+
+_executor = ThreadPoolExecutor(max_workers=UPSTREAM_MAX_WORKERS, thread_name_prefix="dart-upstream")
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def concurrency_limit(query_type: str) -> int:
+    return CONCURRENCY_LIMITS.get(query_type, UPSTREAM_DEFAULT_CONCURRENCY)
+
+
+def _semaphore(query_type: str) -> asyncio.Semaphore:
+    if query_type not in _semaphores:
+        _semaphores[query_type] = asyncio.Semaphore(concurrency_limit(query_type))
+    return _semaphores[query_type]
+
+
+def _stat(query_type: str) -> Dict[str, float]:
+    if query_type not in _stats:
+        _stats[query_type] = {"waiting": 0, "running": 0, "calls": 0, "rate_limited": 0, "retries": 0, "failures": 0, "wait_total": 0.0, "wait_max": 0.0,
+                              "service_avg": 0.0}
+    return _stats[query_type]
+
+
+def estimated_wait(query_type: str) -> float:
+    # 지금 호출하면 동시성 슬롯을 얻기까지 기다릴 예상 시간 (앞선 대기 수 / 상한 × 평균 실행 시간)
+    stat = _stat(query_type)
+    limit = concurrency_limit(query_type)
+    ahead = stat["waiting"] + stat["running"] - limit + 1
+    return ahead / limit * stat["service_avg"] if ahead > 0 else 0.0
+
+
+async def call(query_type: str, func: Callable, *args, **kwargs) -> Any:
+    # DART 호출: 엔드포인트 계열 차단기 확인 → 워커 간 호출 한도 → 실행
+    # 일시적 오류는 지수 백오프(지터 포함)로 재시도하고, 끝내 실패하면 UpstreamUnavailable 발생
+    if query_type in LOCAL_QUERY_TYPES:
+        return await _execute(query_type, func, *args, **kwargs)
+
+    # 과부하 차단: 기한이 지났으면 바로 실패, 요청의 첫 DART 호출이면 대기열이 긴 경우 대기열에 넣지 않고 거절
+    if admission.expired():
+        raise admission.exceeded()
+    admission.admit(query_type, int(_stat(query_type)["waiting"]), estimated_wait(query_type))
+
+    # 호출 결과별 지표 (요청 처리 중이면 요청별 DART 호출 수·upstream 단계 시간에도 합산)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        result = await _call(query_type, func, *args, **kwargs)
+        outcome = "success"
+        return result
+    except admission.DeadlineExceeded:
+        outcome = "deadline"
+        raise
+    except circuit_breaker.UpstreamUnavailable:
+        outcome = "unavailable"
+        raise
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    finally:
+        metrics.record_upstream(query_type, time.perf_counter() - started, outcome)
+
+
+async def _call(query_type: str, func: Callable, *args, **kwargs) -> Any:
+    stat = _stat(query_type)
+    breaker = circuit_breaker.for_query_type(query_type)
+    attempt = 0
+    while True:
+        breaker.allow()
+        try:
+            result = await _execute(query_type, func, *args, **kwargs)
+        except circuit_breaker.UpstreamUnavailable:
+            raise
+        except Exception as e:
+            if not circuit_breaker.is_transient(e):
+                # 잘못된 요청·조회 결과 없음 등은 DART가 정상 응답한 것이므로 그대로 전달
+                breaker.record_success()
+                raise
+            if admission.expired():
+                # 기한에 맞춰 줄인 HTTP 제한 시간으로 실패한 경우는 DART 장애로 기록하지 않음
+                raise admission.exceeded() from e
+            breaker.record_failure()
+            stat["failures"] += 1
+            if attempt >= UPSTREAM_RETRIES:
+                raise circuit_breaker.UpstreamUnavailable(
+                    f"DART 서버 응답 오류: {str(e)}", UPSTREAM_RETRY_MAX_DELAY) from e
+            delay = random.uniform(0, min(UPSTREAM_RETRY_MAX_DELAY, UPSTREAM_RETRY_BASE_DELAY * 2 ** attempt))
+            if admission.remaining() is not None and delay >= admission.remaining():
+                raise admission.exceeded() from e
+            attempt += 1
+            stat["retries"] += 1
+            await asyncio.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+async def _execute(query_type: str, func: Callable, *args, **kwargs) -> Any:
+    # 블로킹 함수를 워커 간 호출 한도와 쿼리 타입별 동시성 상한 안에서 스레드 풀로 실행
+    # 호출 한도 대기는 동시성 슬롯을 잡기 전에 하여 다른 쿼리 타입을 막지 않는다
+    # 요청 처리 기한이 있으면 호출 한도·슬롯 대기와 실행 모두 남은 기한까지만 기다린다
+    # (로컬 작업은 DART 조회를 마친 뒤의 저장·압축 등이므로 기한을 적용하지 않음)
+    stat = _stat(query_type)
+    timeout = None if query_type in LOCAL_QUERY_TYPES else admission.remaining()
+    stat["waiting"] += 1
+    queued_at = time.perf_counter()
+    try:
+        if query_type not in LOCAL_QUERY_TYPES:
+            try:
+                max_wait = rate_limiter.PRIORITY_CLASSES[rate_limiter.priority_for(query_type)]["max_wait"]
+                await rate_limiter.acquire(query_type, admission.within_deadline(max_wait))
+            except rate_limiter.RateLimited:
+                stat["rate_limited"] += 1
+                raise
+        try:
+            await asyncio.wait_for(_semaphore(query_type).acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise admission.exceeded()
+    finally:
+        stat["waiting"] -= 1
+
+    wait = time.perf_counter() - queued_at
+    stat["calls"] += 1
+    stat["wait_total"] += wait
+    stat["wait_max"] = max(stat["wait_max"], wait)
+    stat["running"] += 1
+    started = time.perf_counter()
+
+    def release(finished=None):
+        # 실행 시간 이동 평균(예상 대기 시간 계산용) 갱신 후 슬롯 반환
+        if finished is not None and not finished.cancelled():
+            finished.exception()  # 기다리는 쪽이 없어진 호출의 예외는 여기서 확인 처리
+        elapsed = time.perf_counter() - started
+        stat["service_avg"] = elapsed if not stat["service_avg"] else 0.8 * stat["service_avg"] + 0.2 * elapsed
+        stat["running"] -= 1
+        _semaphore(query_type).release()
+
+    # 처리 기한(ContextVar)을 스레드에서도 읽을 수 있도록 현재 컨텍스트에서 실행 (DART HTTP 제한 시간에 사용)
+    # 복사한 컨텍스트에는 미리 차감한 토큰을 기록해 두고, 두 번째 HTTP 요청부터 요청마다 호출 한도를 차감한다
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    if query_type not in LOCAL_QUERY_TYPES:
+        context.run(rate_limiter.begin_call, query_type)
+    try:
+        future = loop.run_in_executor(_executor, functools.partial(context.run, func, *args, **kwargs))
+    except BaseException:
+        release()
+        raise
+    try:
+        # 기한 초과·요청 취소 시에도 스레드의 호출은 중단할 수 없으므로, 슬롯은 호출이 실제로 끝날 때 반환
+        done, _ = await asyncio.wait({future}, timeout=None if timeout is None else admission.remaining())
+        if not done:
+            raise admission.exceeded()
+        return future.result()
+    finally:
+        if future.done():
+            release()
+        else:
+            future.add_done_callback(release)
+
+
+def stats() -> Dict[str, Any]:
+    # 큐 대기 수, 실행 중 수, 평균/최대 대기 시간 (워커 단위)
+    query_types = {}
+    for query_type, stat in _stats.items():
+        query_types[query_type] = {
+            "limit": concurrency_limit(query_type),
+            "waiting": int(stat["waiting"]),
+            "running": int(stat["running"]),
+            "calls": int(stat["calls"]),
+            "rate_limited": int(stat["rate_limited"]),
+            "retries": int(stat["retries"]),
+            "failures": int(stat["failures"]),
+            "wait_avg_ms": round(stat["wait_total"] / stat["calls"] * 1000, 2) if stat["calls"] else 0.0,
+            "wait_max_ms": round(stat["wait_max"] * 1000, 2),
+        }
+    return {
+        "pid": os.getpid(),
+        "max_workers": UPSTREAM_MAX_WORKERS,
+        "waiting": sum(int(s["waiting"]) for s in _stats.values()),
+        "running": sum(int(s["running"]) for s in _stats.values()),
+        "query_types": query_types,
+        "circuits": circuit_breaker.stats(),
+    }
+
+
+def shutdown() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
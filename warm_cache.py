@@ -0,0 +1,66 @@
+import sys
+import json
+import asyncio
+import argparse
+from fastapi import HTTPException
+
+import artifact_store
+import dart_client
+import main
+import upstream
+
+# 디스크 저장소 사전 적재 도구
+# 사용법: python warm_cache.py requests.jsonl [--concurrency 4]
+# 입력 파일은 한 줄에 하나씩 /api/dart 요청 본문(JSON)을 담는다 (auth_key 불필요)
+#   {"company": "삼성전자", "query_type": "full_financial", "bsns_year": "2023", "reprt_code": "11011"}
+#   {"query_type": "document", "rcept_no": "20240312000736"}
+
+
+def _load_bodies(path: str):
+    bodies = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                bodies.append(json.loads(line))
+    return bodies
+
+
+async def warm(bodies, concurrency: int):
+    await upstream.call("corp_codes", dart_client.init_client)
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {"STORE": 0, "MISS": 0, "HIT": 0, "skipped": 0, "failed": 0}
+
+    async def warm_one(body):
+        request = main.DartRequest(**{"company": "", "auth_key": "", **body})
+        if not artifact_store.is_storable(request.query_type):
+            counts["skipped"] += 1
+            print(f"건너뜀 (저장 대상 아님): {request.query_type}")
+            return
+        async with semaphore:
+            try:
+                _, cache_status, _ = await main.cached_fetch(request)
+                counts[cache_status] = counts.get(cache_status, 0) + 1
+            except HTTPException as e:
+                counts["failed"] += 1
+                print(f"실패: {body} - {e.detail}")
+            except Exception as e:
+                counts["failed"] += 1
+                print(f"실패: {body} - {str(e)}")
+
+    await asyncio.gather(*(warm_one(body) for body in bodies))
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DART 디스크 저장소 사전 적재")
+    parser.add_argument("path", help="요청 본문 JSONL 파일")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    args = parser.parse_args()
+
+    counts = asyncio.run(warm(_load_bodies(args.path), args.concurrency))
+    print(f"완료: 신규 저장 {counts['MISS']}건, 기존 {counts['STORE'] + counts['HIT']}건, "
+          f"건너뜀 {counts['skipped']}건, 실패 {counts['failed']}건")
+    print(json.dumps(artifact_store.stats(), ensure_ascii=False, indent=2))
+    upstream.shutdown()
+    sys.exit(1 if counts["failed"] else 0)
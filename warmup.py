@@ -0,0 +1,83 @@
+import os
+import time
+import asyncio
+import importlib
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+import dart_client
+import upstream
+
+# 워커 시작 워밍업 설정
+# 워밍업은 워커가 요청을 받기 시작한 뒤 백그라운드에서 실행되고, 끝나기 전까지 /readyz는 503을 반환
+WARMUP_MODULES = ("OpenDartReader", "OpenDartReader.dart_list", "requests")  # 첫 요청 전에 미리 import할 모듈
+WARMUP_PREFETCH_COMPANIES = [name.strip() for name in os.environ.get("WARMUP_PREFETCH_COMPANIES", "").split(",") if name.strip()]
+WARMUP_PREFETCH_QUERY_TYPES = [name.strip() for name in os.environ.get("WARMUP_PREFETCH_QUERY_TYPES", "company").split(",") if name.strip()]
+WARMUP_PREFETCH_TIMEOUT = float(os.environ.get("WARMUP_PREFETCH_TIMEOUT", "30"))  # 미리 조회 전체 제한 시간 (초)
+
+# 워커(프로세스) 단위 워밍업 상태
+_started_at = time.time()
+_steps: Dict[str, Dict[str, Any]] = {}  # 단계 이름 → {"seconds", "ok", "error"}
+_finished_at: Optional[float] = None
+
+
+def _import_modules() -> None:
+    for name in WARMUP_MODULES:
+        importlib.import_module(name)
+
+
+def _touch_index() -> None:
+    # 메모리 매핑한 기업 고유번호 테이블의 검색 경로를 한 번 실행해 필요한 페이지를 미리 읽음
+    dart_client.get_index().search("삼성전자")
+
+
+async def _step(name: str, func: Callable[[], Awaitable[Any]]) -> bool:
+    started = time.perf_counter()
+    try:
+        await func()
+        _steps[name] = {"seconds": round(time.perf_counter() - started, 3), "ok": True, "error": None}
+        return True
+    except Exception as e:
+        _steps[name] = {"seconds": round(time.perf_counter() - started, 3), "ok": False, "error": str(e)}
+        print(f"경고: 워밍업 단계 실패 ({name}): {str(e)}")
+        return False
+
+
+async def _prefetch(fetch: Callable[[str, str], Awaitable[Any]]) -> None:
+    # 자주 조회되는 기업의 응답을 미리 캐시 (실패한 항목은 건너뜀)
+    failed = []
+    for company in WARMUP_PREFETCH_COMPANIES:
+        for query_type in WARMUP_PREFETCH_QUERY_TYPES:
+            try:
+                await fetch(company, query_type)
+            except Exception as e:
+                failed.append(f"{company}/{query_type}: {getattr(e, 'detail', None) or str(e)}")
+    if failed:
+        raise RuntimeError(f"{len(failed)}건 실패 ({failed[0]} 등)")
+
+
+async def run(fetch: Optional[Callable[[str, str], Awaitable[Any]]] = None) -> None:
+    # import → DART 클라이언트·기업 고유번호 테이블 → 인덱스 → (선택) 자주 조회되는 기업 미리 조회
+    global _finished_at
+    await _step("imports", lambda: upstream.call("warmup", _import_modules))
+    if await _step("client", lambda: upstream.call("corp_codes", dart_client.init_client)):
+        await _step("index", lambda: upstream.call("warmup", _touch_index))
+        if fetch is not None and WARMUP_PREFETCH_COMPANIES:
+            await _step("prefetch", lambda: asyncio.wait_for(_prefetch(fetch), WARMUP_PREFETCH_TIMEOUT))
+    _finished_at = time.time()
+    steps = ", ".join(f"{name} {step['seconds']:.2f}초" + ("" if step["ok"] else " 실패") for name, step in _steps.items())
+    print(f"워밍업 완료 (pid {os.getpid()}): {_finished_at - _started_at:.2f}초 ({steps})")
+
+
+def is_ready() -> bool:
+    # 워밍업이 끝났고 DART 클라이언트가 준비된 경우 (클라이언트 초기화 실패 시 이후 재시도로 준비되면 ready)
+    return _finished_at is not None and dart_client.is_ready()
+
+
+def status() -> Dict[str, Any]:
+    return {
+        "ready": is_ready(),
+        "pid": os.getpid(),
+        "finished": _finished_at is not None,
+        "seconds": round((_finished_at or time.time()) - _started_at, 3),
+        "steps": _steps,
+    }